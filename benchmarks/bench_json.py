@@ -0,0 +1,71 @@
+"""
+Compare decoding a large getStatsData page with `requests.Response.json()`
+and with `estatapi._json.loads` on the raw bytes.
+
+    python benchmarks/bench_json.py [rows]
+"""
+
+import json
+import sys
+import timeit
+
+import requests
+
+from estatapi import _json
+
+
+def make_page(rows: int) -> bytes:
+    values = [
+        {
+            "@tab": "020",
+            "@cat01": f"{i % 100:03d}",
+            "@area": f"{i % 47 + 1:02d}000",
+            "@time": f"{2000 + i % 20}000000",
+            "@unit": "人",
+            "$": str(i * 7),
+        }
+        for i in range(rows)
+    ]
+    page = {
+        "GET_STATS_DATA": {
+            "RESULT": {"STATUS": 0},
+            "STATISTICAL_DATA": {"DATA_INF": {"VALUE": values}},
+        }
+    }
+    return json.dumps(page, ensure_ascii=False).encode("utf-8")
+
+
+def make_response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json;charset=utf-8"
+    response.encoding = "utf-8"
+    return response
+
+
+def main(rows: int = 500_000, number: int = 3):
+    content = make_page(rows)
+    print(f"page: {rows:,} rows, {len(content) / 1e6:.1f} MB")
+
+    candidates = {
+        "Response.json()": lambda: make_response(content).json(),
+        "stdlib (bytes)": lambda: (_json.set_decoder("json"), _json.loads(content)),
+    }
+    try:
+        _json.set_decoder("orjson")
+        candidates["orjson (bytes)"] = lambda: (
+            _json.set_decoder("orjson"),
+            _json.loads(content),
+        )
+    except ImportError:
+        print("orjson is not installed")
+
+    for name, run in candidates.items():
+        seconds = min(timeit.repeat(run, number=1, repeat=number))
+        print(f"{name:>20}: {seconds:.3f} s ({len(content) / seconds / 1e6:.0f} MB/s)")
+    _json.set_decoder()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
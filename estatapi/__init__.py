@@ -1,3 +1,68 @@
-from estatapi._appid import get_appid, set_appid
-from estatapi._functions import get_meta_info, get_stats_data, get_stats_list
-from estatapi._pandas import stats_data_to_pandas, stats_list_to_pandas, to_pandas
+from estatapi._appid import (
+    AppIdPool,
+    get_appid,
+    get_appid_pool,
+    set_appid,
+    set_appid_pool,
+)
+from estatapi._batch import stats_data_to_pandas_batch
+from estatapi._catalog import (
+    DownloadResult,
+    download_catalog_files,
+    iter_catalog_resources,
+)
+from estatapi._crawl import CatalogStore, crawl_stats_list
+from estatapi._cube import Cube, to_cube
+from estatapi._download import download_stats_data
+from estatapi._functions import (
+    get_data_catalog,
+    get_meta_info,
+    get_stats_data,
+    get_stats_list,
+    ref_dataset,
+)
+from estatapi._instrument import Collector, Event, add_hook, remove_hook
+from estatapi._join import get_joined_stats_data, join_stats_data
+from estatapi._json import get_decoder, set_decoder
+from estatapi._lookup import LookupIndex, lookup_index, normalize_label
+from estatapi._metadata import invalidate_metadata, set_metadata_cache
+from estatapi._pagination import iter_stats_data, merge_stats_data_pages
+from estatapi._pandas import (
+    flatten_table_inf,
+    stats_data_to_pandas,
+    stats_list_to_pandas,
+    to_pandas,
+)
+from estatapi._partition import (
+    Partition,
+    merge_partitions,
+    partition_stats_data,
+    run_partition,
+)
+from estatapi._pipeline import (
+    PipelineStageStats,
+    StatsDataPipeline,
+    pipeline_stats_data,
+)
+from estatapi._plan import StatsDataPlan, explain_stats_data, plan_stats_data
+from estatapi._polars import scan_stats_data, to_polars
+from estatapi._query import StatsDataQuery, query
+from estatapi._retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    RetryTransport,
+    classify_response,
+)
+from estatapi._snapshot import Snapshot, load_snapshot, save_snapshot
+from estatapi._spill import ChunkedStatsData, fetch_stats_data
+from estatapi._store import TableStore
+from estatapi._time import parse_time_codes
+from estatapi._transport import (
+    HedgedTransport,
+    RecordTransport,
+    ReplayTransport,
+    Transport,
+    get_transport,
+    set_transport,
+)
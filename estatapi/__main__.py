@@ -0,0 +1,5 @@
+import sys
+
+from estatapi._cli import main
+
+sys.exit(main())
@@ -1,4 +1,18 @@
+import re
+import threading
+import time
+from typing import Iterable, Literal
+
 _APPID = None
+_POOL = None
+
+# RESULT.STATUS values reported for an invalid or over-quota application ID
+QUARANTINE_STATUSES = frozenset({100, 101, 102, 103})
+
+# HTTP status codes reported for an invalid or over-quota application ID
+_QUARANTINE_HTTP_STATUSES = frozenset({401, 403, 429})
+
+_STATUS_PATTERN = re.compile(rb'"STATUS"\s*:\s*"?(\d+)')
 
 
 def set_appid(appid: str | None = None):
@@ -14,3 +28,146 @@ def _check_appid():
     """Check if APP ID is not None."""
     if _APPID is None:
         raise ValueError("APP ID is not set.")
+
+
+def _result_status(content: bytes) -> int | None:
+    """Peek RESULT.STATUS which comes first in the response, without parsing it."""
+    match = _STATUS_PATTERN.search(content, 0, 512)
+    return int(match.group(1)) if match else None
+
+
+class _Key:
+    def __init__(self, appid: str):
+        self.appid = appid
+        self.in_flight = 0
+        self.next_time = 0.0
+        self.quarantined_until = 0.0
+
+
+class AppIdPool:
+    """
+    複数のアプリケーションIDを使い分けるプール。
+
+    リクエストはアプリケーションIDごとの上限（毎秒のリクエスト数）を守りながら、
+    順番に（`round_robin`）または実行中のリクエストが最も少ないID（`least_loaded`）に振り分けられます。
+    APIが認証エラーや利用上限のエラーを返したIDは、`quarantine` 秒の間使われなくなります。
+
+    Parameters
+    ----------
+    `appids` : iterable of str
+        アプリケーションID。
+
+    `rate_limit` : float, optional
+        アプリケーションIDごとの毎秒のリクエスト数の上限。省略時は制限しません。
+
+    `strategy` : Literal['round_robin', 'least_loaded'], default 'round_robin'
+        振り分け方。
+
+    `quarantine` : float, default 600.0
+        エラーを返したアプリケーションIDを使わない秒数。
+
+    `quarantine_statuses` : iterable of int, optional
+        アプリケーションIDを使わなくする `RESULT.STATUS` の値。
+    """
+
+    def __init__(
+        self,
+        appids: Iterable[str],
+        rate_limit: float | None = None,
+        strategy: Literal["round_robin", "least_loaded"] = "round_robin",
+        quarantine: float = 600.0,
+        quarantine_statuses: Iterable[int] = QUARANTINE_STATUSES,
+    ):
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self._keys = {appid: _Key(appid) for appid in appids}
+        if not self._keys:
+            raise ValueError("appids is empty.")
+        self.rate_limit = rate_limit
+        self.strategy = strategy
+        self.quarantine_seconds = quarantine
+        self.quarantine_statuses = frozenset(quarantine_statuses)
+        self._lock = threading.Lock()
+        self._order = list(self._keys)
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def available(self) -> list[str]:
+        """使用可能な（隔離されていない）アプリケーションID。"""
+        now = time.monotonic()
+        with self._lock:
+            return [k.appid for k in self._keys.values() if k.quarantined_until <= now]
+
+    def _choose(self, now: float) -> _Key:
+        keys = [self._keys[appid] for appid in self._order]
+        if self.strategy == "round_robin":
+            keys = keys[self._cursor :] + keys[: self._cursor]
+        keys = [k for k in keys if k.quarantined_until <= now]
+        if not keys:
+            raise ValueError("All application IDs are quarantined.")
+
+        if self.strategy == "least_loaded":
+            return min(keys, key=lambda k: (k.in_flight, k.next_time))
+        # the next key in turn, unless another one can be used earlier
+        return min(keys, key=lambda k: max(k.next_time - now, 0.0))
+
+    def acquire(self) -> str:
+        """リクエストに使うアプリケーションIDを選びます。上限に達している場合は待機します。"""
+        with self._lock:
+            now = time.monotonic()
+            key = self._choose(now)
+            if self.strategy == "round_robin":
+                self._cursor = (self._order.index(key.appid) + 1) % len(self._order)
+            wait = max(key.next_time - now, 0.0)
+            if self.rate_limit:
+                key.next_time = max(key.next_time, now) + 1 / self.rate_limit
+            key.in_flight += 1
+        if wait:
+            time.sleep(wait)
+        return key.appid
+
+    def release(
+        self,
+        appid: str,
+        status_code: int | None = None,
+        content: bytes | None = None,
+    ) -> bool:
+        """
+        リクエストの完了を記録します。
+
+        応答が認証エラーまたは利用上限のエラーの場合はアプリケーションIDを隔離し、`True` を返します。
+        """
+        quarantine = status_code in _QUARANTINE_HTTP_STATUSES or (
+            content is not None and _result_status(content) in self.quarantine_statuses
+        )
+        with self._lock:
+            key = self._keys[appid]
+            key.in_flight -= 1
+            if quarantine:
+                key.quarantined_until = time.monotonic() + self.quarantine_seconds
+        return quarantine
+
+    def quarantine(self, appid: str, seconds: float | None = None):
+        """アプリケーションIDを隔離します。"""
+        seconds = self.quarantine_seconds if seconds is None else seconds
+        with self._lock:
+            self._keys[appid].quarantined_until = time.monotonic() + seconds
+
+
+def set_appid_pool(pool: AppIdPool | Iterable[str] | None = None, **kwargs):
+    """
+    リクエストに使うアプリケーションIDのプールを設定します。
+
+    アプリケーションIDのリストを渡すと、`kwargs` を使って `AppIdPool` を作成します。
+    `None` を渡すと、`set_appid` で設定したアプリケーションIDを使うように戻ります。
+    """
+    global _POOL
+    if pool is not None and not isinstance(pool, AppIdPool):
+        pool = AppIdPool(pool, **kwargs)
+    _POOL = pool
+
+
+def get_appid_pool() -> AppIdPool | None:
+    return _POOL
@@ -0,0 +1,110 @@
+import concurrent.futures
+import functools
+from typing import Iterable, Literal
+
+import pandas as pd
+import requests
+
+from estatapi import _json
+from estatapi._pandas import stats_data_to_pandas
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _to_payload(item: bytes | str | dict | requests.Response) -> bytes | str | dict:
+    """Pass raw bytes to workers so that decoding also runs in parallel."""
+    if isinstance(item, requests.Response):
+        return item.content
+    return item
+
+
+def _convert(
+    payload: bytes | str | dict,
+    add_level: bool,
+    transfer: Literal["arrow", "pickle"],
+) -> bytes | pd.DataFrame:
+    """Decode a payload and convert it to a DataFrame. Runs in worker processes."""
+    json_data = payload if isinstance(payload, dict) else _json.loads(payload)
+    df = stats_data_to_pandas(json_data, add_level=add_level)
+
+    if transfer == "pickle":
+        return df
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _from_result(result: bytes | pd.DataFrame) -> pd.DataFrame:
+    if isinstance(result, pd.DataFrame):
+        return result
+
+    import pyarrow as pa
+
+    with pa.ipc.open_stream(result) as reader:
+        table = reader.read_all()
+    return table.to_pandas()
+
+
+def stats_data_to_pandas_batch(
+    items: Iterable[bytes | str | dict | requests.Response],
+    add_level: bool = True,
+    max_workers: int | None = None,
+    transfer: Literal["auto", "arrow", "pickle"] = "auto",
+) -> list[pd.DataFrame]:
+    """
+    複数の統計データをプロセスプールで並列にpandasデータフレームに変換します。
+
+    JSONのデコードと `stats_data_to_pandas` による変換をワーカープロセスで行います。
+    結果は入力と同じ順序で返されます。
+
+    Parameters
+    ----------
+    `items` : iterable of bytes, str, dict or requests.Response
+        `get_stats_data` のレスポンス、その本文、またはデコード済みのJSON。
+        デコードも並列に行うため、レスポンスか本文を渡すことを推奨します。
+
+    `add_level` : bool, default True
+        階層レベルの列を追加するか否か。
+
+    `max_workers` : int, optional
+        ワーカープロセス数。省略時はCPU数です。1の場合は現在のプロセスで変換します。
+
+    `transfer` : Literal['auto', 'arrow', 'pickle'], default 'auto'
+        ワーカーから結果を受け渡す形式。
+        - 'arrow': Arrow IPC形式（pyarrowが必要）
+        - 'pickle': データフレームをpickleする
+        - 'auto': pyarrowがインストールされていれば 'arrow'
+
+    Returns
+    -------
+    dfs : list of pandas.DataFrame
+    """
+    if transfer == "auto":
+        transfer = "arrow" if _has_pyarrow() else "pickle"
+    elif transfer == "arrow" and not _has_pyarrow():
+        raise ImportError("pyarrow is required for transfer='arrow'.")
+
+    payloads = [_to_payload(item) for item in items]
+
+    if max_workers == 1:
+        return [
+            stats_data_to_pandas(
+                p if isinstance(p, dict) else _json.loads(p), add_level=add_level
+            )
+            for p in payloads
+        ]
+
+    convert = functools.partial(_convert, add_level=add_level, transfer=transfer)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [_from_result(result) for result in executor.map(convert, payloads)]
@@ -0,0 +1,207 @@
+import concurrent.futures
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from typing import Iterable, Iterator, Literal
+
+import requests
+
+from estatapi import _util
+
+_MANIFEST = ".estatapi-manifest.json"
+
+_EXTENSIONS = {
+    "XLS": "xls",
+    "XLSX": "xlsx",
+    "XLS_REP": "xls",
+    "CSV": "csv",
+    "PDF": "pdf",
+    "XML": "xml",
+}
+
+
+def iter_catalog_resources(data_catalog_json: dict) -> Iterator[dict]:
+    """
+    データカタログ情報取得のJSONから、リソース（ファイル）の情報を順に返します。
+
+    各リソースには、所属するデータカタログのIDが `CATALOG_ID` として追加されます。
+    """
+    list_inf = data_catalog_json["GET_DATA_CATALOG"].get("DATA_CATALOG_LIST_INF", {})
+    catalogs = list_inf.get("DATA_CATALOG_INF", [])
+    if isinstance(catalogs, dict):
+        catalogs = [catalogs]
+
+    for catalog in catalogs:
+        resources = catalog.get("RESOURCES", {}).get("RESOURCE", [])
+        if isinstance(resources, dict):
+            resources = [resources]
+        for resource in resources:
+            yield {**resource, "CATALOG_ID": catalog.get("@id")}
+
+
+def _file_name(resource: dict) -> str:
+    data_format = str(resource.get("FORMAT", "")).upper()
+    extension = _EXTENSIONS.get(data_format, data_format.lower() or "dat")
+    return f"{resource['@id']}.{extension}"
+
+
+@dataclasses.dataclass
+class DownloadResult:
+    resource_id: str
+    path: str
+    status: Literal["downloaded", "skipped", "failed"]
+    bytes: int = 0
+    error: Exception | None = None
+
+
+class _Manifest:
+    """Size, checksum and last modified date of downloaded files."""
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, _MANIFEST)
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, resource_id: str) -> dict | None:
+        with self._lock:
+            return self.entries.get(resource_id)
+
+    def put(self, resource_id: str, entry: dict):
+        with self._lock:
+            self.entries[resource_id] = entry
+            _util._write_atomic(
+                self.path, json.dumps(self.entries, ensure_ascii=False).encode()
+            )
+
+
+def _sha256(path: str, chunk_size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_downloaded(
+    resource: dict,
+    path: str,
+    entry: dict | None,
+    session: requests.Session,
+    verify: str,
+    chunk_size: int,
+) -> bool:
+    if not os.path.exists(path):
+        return False
+    size = os.path.getsize(path)
+
+    if entry is not None:
+        if entry.get("last_modified") != resource.get("LAST_MODIFIED_DATE"):
+            return False
+        if entry["size"] != size:
+            return False
+        return verify == "size" or entry["sha256"] == _sha256(path, chunk_size)
+
+    # downloaded without the manifest: compare the size with the server
+    response = session.head(resource["URL"], allow_redirects=True)
+    content_length = response.headers.get("Content-Length")
+    return content_length is not None and int(content_length) == size
+
+
+def _download(
+    resource: dict,
+    path: str,
+    session: requests.Session,
+    chunk_size: int,
+) -> tuple[int, str]:
+    """Stream a file to disk. Returns the size and the checksum."""
+    digest = hashlib.sha256()
+    size = 0
+    with session.get(resource["URL"], stream=True) as response:
+        response.raise_for_status()
+        with _util._atomic_path(path, suffix=".part") as tmp_path:
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def download_catalog_files(
+    resources: dict | Iterable[dict],
+    directory: str,
+    max_workers: int = 4,
+    verify: Literal["size", "sha256"] = "size",
+    chunk_size: int = 1 << 20,
+    session: requests.Session | None = None,
+) -> list[DownloadResult]:
+    """
+    データカタログのリソース（統計表ファイル）を並列にダウンロードします。
+
+    ファイルは分割して受信しながらディスクに書き込まれます。
+    ダウンロード済みのファイルは、サイズ（またはチェックサム）と更新日が記録と一致する場合に
+    スキップされます。記録がない既存のファイルは、サーバが返すサイズと比較します。
+
+    Parameters
+    ----------
+    `resources` : dict or iterable of dict
+        `get_data_catalog` で取得したJSON、または `iter_catalog_resources` が返すリソース。
+
+    `directory` : str
+        保存先のディレクトリ。
+
+    `max_workers` : int, default 4
+        同時にダウンロードするファイルの数。
+
+    `verify` : Literal['size', 'sha256'], default 'size'
+        ダウンロード済みのファイルの確認方法。
+
+    `chunk_size` : int, default 1MiB
+        ディスクに書き込む単位。
+
+    `session` : requests.Session, optional
+        ダウンロードに使うセッション。
+
+    Returns
+    -------
+    results : list of DownloadResult
+        リソースごとの結果。失敗したリソースは `status='failed'` となり、`error` に例外が入ります。
+    """
+    if isinstance(resources, dict):
+        resources = iter_catalog_resources(resources)
+    resources = [r for r in resources if r.get("URL")]
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = _Manifest(directory)
+    session = requests.Session() if session is None else session
+
+    def run(resource: dict) -> DownloadResult:
+        resource_id = resource["@id"]
+        path = os.path.join(directory, _file_name(resource))
+        try:
+            entry = manifest.get(resource_id)
+            if _is_downloaded(resource, path, entry, session, verify, chunk_size):
+                return DownloadResult(resource_id, path, "skipped")
+
+            size, sha256 = _download(resource, path, session, chunk_size)
+            manifest.put(
+                resource_id,
+                {
+                    "url": resource["URL"],
+                    "file": os.path.basename(path),
+                    "size": size,
+                    "sha256": sha256,
+                    "last_modified": resource.get("LAST_MODIFIED_DATE"),
+                },
+            )
+            return DownloadResult(resource_id, path, "downloaded", bytes=size)
+        except Exception as e:
+            return DownloadResult(resource_id, path, "failed", error=e)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, resources))
@@ -0,0 +1,267 @@
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from estatapi import (
+    _appid,
+    _download,
+    _instrument,
+    _metadata,
+    _pagination,
+    _store,
+    _util,
+)
+from estatapi._pandas import stats_data_to_pandas
+
+# exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1  # some of the jobs failed
+EXIT_USAGE = 2  # invalid arguments or manifest (same as argparse)
+
+_FORMATS = ("arrow", "csv", "parquet")
+
+
+@dataclasses.dataclass
+class _Job:
+    name: str
+    params: dict
+
+
+def _check_name(name: str) -> str:
+    """The name is the file name of the output: it must stay in the directory."""
+    if not name or ".." in name or any(sep in name for sep in ("/", "\\")):
+        raise ValueError(f"Invalid job name: {name!r}")
+    return name
+
+
+def _load_manifest(path: str) -> list[_Job]:
+    """
+    Read jobs from a JSON list or JSON lines. Each job is a statsDataId
+    or an object of get_stats_data arguments with an optional "name".
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        entries = json.loads(text)
+    except json.JSONDecodeError:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if not isinstance(entries, list):
+        entries = [entries]
+
+    jobs = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"statsDataId": entry}
+        if not isinstance(entry, dict):
+            raise ValueError(f"Invalid manifest entry: {entry!r}")
+        params = dict(entry)
+        name = params.pop("name", None)
+        if name is None:
+            name = params.get("statsDataId") or params.get("dataSetId")
+            if name is None:
+                raise ValueError(f"Manifest entry has no statsDataId: {entry!r}")
+            if len(params) > 1:
+                name += "-" + _pagination._fingerprint(params)[:8]
+        jobs.append(_Job(name=_check_name(str(name)), params=params))
+
+    names = [job.name for job in jobs]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Duplicated names in the manifest: {duplicated}")
+    return jobs
+
+
+_METADATA_LOCKS: dict[tuple, threading.Lock] = {}
+_METADATA_LOCKS_LOCK = threading.Lock()
+
+
+def _get_metadata(statsDataId: str, lang: str) -> dict:
+    """Fetch the metadata of a table once, even for the jobs running at once."""
+    with _METADATA_LOCKS_LOCK:
+        lock = _METADATA_LOCKS.setdefault((statsDataId, lang), threading.Lock())
+    with lock:
+        return _metadata.get_metadata(statsDataId, lang=lang)
+
+
+def _fetch(job: _Job, args: argparse.Namespace) -> pd.DataFrame:
+    params = dict(job.params)
+    if args.limit is not None:
+        params.setdefault("limit", args.limit)
+
+    if args.store is not None and "statsDataId" in params:
+        snapshot = _store.TableStore(args.store).open(**params)
+        return snapshot.to_df()
+
+    metadata = None
+    if args.metadata_cache is not None and "statsDataId" in params:
+        # the metadata is fetched once per table through the shared cache
+        metadata = _get_metadata(params["statsDataId"], params.get("lang", "J"))
+        params["metaGetFlg"] = "N"
+    if args.checkpoint is not None:
+        json_data = _download.download_stats_data(args.checkpoint, **params)
+    else:
+        json_data = _pagination.merge_stats_data_pages(
+            _pagination.iter_stats_data(reuse_metadata=True, **params)
+        )
+    if metadata is not None:
+        stats_data = _pagination._statistical_data(json_data)
+        stats_data["CLASS_INF"] = {"CLASS_OBJ": metadata["CLASS_OBJ"]}
+    return stats_data_to_pandas(json_data)
+
+
+def _write(df: pd.DataFrame, path: str, output_format: str):
+    with _util._atomic_path(path) as tmp_path:
+        if output_format == "csv":
+            df.to_csv(tmp_path, index=False)
+        elif output_format == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.feather
+
+            pyarrow.feather.write_feather(
+                pa.Table.from_pandas(df, preserve_index=False), tmp_path
+            )
+
+
+class _Progress:
+    """Per-job lines and the summary written to stderr."""
+
+    def __init__(self, total: int, quiet: bool):
+        self.total = total
+        self.quiet = quiet
+        self.done = 0
+        self.failed = 0
+        self.rows = 0
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _print(self, message: str):
+        if not self.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    def report(self, job: _Job, rows: int | None, seconds: float, error=None):
+        with self._lock:
+            self.done += 1
+            prefix = f"[{self.done}/{self.total}] {job.name}"
+            if error is not None:
+                self.failed += 1
+                self._print(f"{prefix}: failed: {error}")
+                return
+            self.rows += rows
+            self._print(f"{prefix}: {rows:,} rows in {seconds:.1f} s")
+
+    def summary(self, collector: _instrument.Collector):
+        elapsed = time.perf_counter() - self.start
+        request = collector.stages.get("request")
+        requests = request.count if request else 0
+        received = request.bytes if request else 0
+        self._print(
+            f"{self.done - self.failed}/{self.total} succeeded, "
+            f"{self.rows:,} rows, {requests:,} requests, "
+            f"{received / 1e6:.1f} MB in {elapsed:.1f} s "
+            f"({self.rows / elapsed if elapsed else 0:,.0f} rows/s, "
+            f"{received / 1e6 / elapsed if elapsed else 0:.1f} MB/s)"
+        )
+
+
+def _extract(args: argparse.Namespace) -> int:
+    appids = args.appid or (
+        [os.environ["ESTAT_APPID"]] if os.environ.get("ESTAT_APPID") else []
+    )
+    if not appids:
+        print("APP ID is not set: use --appid or ESTAT_APPID.", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        jobs = _load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Invalid manifest: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if len(appids) > 1 or args.rate_limit is not None:
+        _appid.set_appid_pool(appids, rate_limit=args.rate_limit)
+    else:
+        _appid.set_appid(appids[0])
+    if args.metadata_cache is not None:
+        _metadata.set_metadata_cache(args.metadata_cache)
+
+    os.makedirs(args.output, exist_ok=True)
+    progress = _Progress(len(jobs), quiet=args.quiet)
+
+    def run(job: _Job):
+        start = time.perf_counter()
+        try:
+            df = _fetch(job, args)
+            path = os.path.join(args.output, f"{job.name}.{args.format}")
+            _write(df, path, args.format)
+        except Exception as e:
+            progress.report(job, None, time.perf_counter() - start, error=e)
+        else:
+            progress.report(job, len(df), time.perf_counter() - start)
+
+    try:
+        with _instrument.Collector() as collector:
+            with concurrent.futures.ThreadPoolExecutor(args.jobs) as executor:
+                list(executor.map(run, jobs))
+        progress.summary(collector)
+    finally:
+        _appid.set_appid_pool()
+        _metadata.set_metadata_cache()
+
+    return EXIT_FAILED if progress.failed else EXIT_OK
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="estatapi", description="e-Stat API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract = subparsers.add_parser(
+        "extract",
+        help="fetch the tables listed in a manifest and write them to files",
+        description=(
+            "Fetch the tables listed in a manifest (JSON list or JSON lines of "
+            "statsDataIds or get_stats_data arguments with an optional name) "
+            "and write them to files. Exit status: 0 if all jobs succeeded, "
+            f"{EXIT_FAILED} if some failed, {EXIT_USAGE} for invalid usage."
+        ),
+    )
+    extract.add_argument("manifest", help="path of the manifest")
+    extract.add_argument("-o", "--output", default=".", help="output directory")
+    extract.add_argument("-f", "--format", choices=_FORMATS, default="csv")
+    extract.add_argument(
+        "-j", "--jobs", type=int, default=4, help="number of tables fetched at once"
+    )
+    extract.add_argument(
+        "--appid",
+        action="append",
+        help="application ID, repeat to use a pool (default: $ESTAT_APPID)",
+    )
+    extract.add_argument(
+        "--rate-limit", type=float, help="requests per second per application ID"
+    )
+    extract.add_argument("--limit", type=int, help="rows per page")
+    cache = extract.add_mutually_exclusive_group()
+    cache.add_argument("--store", help="directory of the local table store")
+    cache.add_argument(
+        "--checkpoint", help="directory of checkpoints to resume downloads"
+    )
+    extract.add_argument(
+        "--metadata-cache",
+        help="path of the shared metadata cache: the metadata of each table is "
+        "fetched once and the pages are requested without it",
+    )
+    extract.add_argument("-q", "--quiet", action="store_true")
+    extract.set_defaults(func=_extract)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    return args.func(args)
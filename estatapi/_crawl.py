@@ -0,0 +1,207 @@
+import concurrent.futures
+import json
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from estatapi import _functions, _json, _util
+from estatapi._pandas import flatten_table_inf
+
+# 統計大分類
+STATS_FIELDS = [f"{i:02d}" for i in range(1, 17)] + ["99"]
+
+
+class CatalogStore:
+    """
+    統計表情報を保存するローカルのカタログ。
+
+    SQLiteのファイルに統計表情報と、クロールの進捗（取得済みの範囲）を保存します。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tables ("
+                "id TEXT PRIMARY KEY, partition TEXT, updated_date TEXT, json TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS partitions ("
+                "partition TEXT PRIMARY KEY, total INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS windows ("
+                "partition TEXT, start INTEGER, size INTEGER, done INTEGER, "
+                "PRIMARY KEY (partition, start))"
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tables").fetchone()[0]
+
+    def get(self, table_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT json FROM tables WHERE id = ?", (table_id,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def iter_tables(self) -> Iterator[dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT json FROM tables ORDER BY id").fetchall()
+        for (row,) in rows:
+            yield json.loads(row)
+
+    def to_df(self) -> pd.DataFrame:
+        return flatten_table_inf(self.iter_tables())
+
+    def _partition_total(self, partition: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total FROM partitions WHERE partition = ?", (partition,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def _add_partition(self, partition: str, total: int, window: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partitions VALUES (?, ?)", (partition, total)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO windows VALUES (?, ?, ?, 0)",
+                [(partition, start, window) for start in range(1, total + 1, window)],
+            )
+
+    def _pending_windows(self) -> list[tuple[str, int, int]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT partition, start, size FROM windows WHERE done = 0 "
+                "ORDER BY partition, start"
+            ).fetchall()
+
+    def _commit_window(self, partition: str, start: int, table_inf: list[dict]):
+        """Save the tables of a window and mark it as done in one transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tables VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        t["@id"],
+                        partition,
+                        t.get("UPDATED_DATE"),
+                        json.dumps(t, ensure_ascii=False),
+                    )
+                    for t in table_inf
+                ],
+            )
+            self._conn.execute(
+                "UPDATE windows SET done = 1 WHERE partition = ? AND start = ?",
+                (partition, start),
+            )
+
+
+def _datalist_inf(stats_list_json: dict) -> dict:
+    root = stats_list_json["GET_STATS_LIST"]
+    # STATUS 1: no data
+    if root.get("RESULT", {}).get("STATUS") == 1:
+        return root.get("DATALIST_INF", {})
+    return _util._check_status(root, "DATALIST_INF")
+
+
+def _table_inf(stats_list_json: dict) -> list[dict]:
+    table_inf = _datalist_inf(stats_list_json).get("TABLE_INF", [])
+    return [table_inf] if isinstance(table_inf, dict) else table_inf
+
+
+def crawl_stats_list(
+    path: str,
+    partitions: Iterable[dict] | None = None,
+    window: int = 10000,
+    max_workers: int = 4,
+    **kwargs,
+) -> CatalogStore:
+    """
+    統計表情報の一覧を並列に取得し、ローカルのカタログに保存します。
+
+    一覧を条件（既定では統計大分類）ごとのパーティションに分け、さらに取得開始位置の範囲に分割して
+    並列に取得します。取得済みの範囲はカタログに記録されるため、中断後に同じ `path` で
+    再実行すると、未取得の範囲だけを取得します。
+
+    Parameters
+    ----------
+    `path` : str
+        カタログ（SQLiteファイル）のパス。
+
+    `partitions` : iterable of dict, optional
+        パーティションごとの `get_stats_list` の絞り込み条件。
+        (例: [{'statsCode': '00200521'}, {'statsCode': '00200522'}])
+        省略時は統計大分類（`statsField`）ごとに分割します。
+
+    `window` : int, default 10000
+        1回のリクエストで取得する件数。
+
+    `max_workers` : int, default 4
+        同時に実行するリクエストの数。
+
+    `kwargs`
+        全てのリクエストに共通の `get_stats_list` の引数。
+        省略時は `explanationGetFlg='N'` で取得します。
+
+    Returns
+    -------
+    store : CatalogStore
+    """
+    if partitions is None:
+        partitions = [{"statsField": field} for field in STATS_FIELDS]
+    partitions = {json.dumps(p, sort_keys=True): p for p in partitions}
+    kwargs.setdefault("explanationGetFlg", "N")
+
+    store = CatalogStore(path)
+
+    def count(key: str):
+        response = _functions.get_stats_list(**partitions[key], **kwargs, limit=1)
+        total = int(_datalist_inf(_json.response_json(response)).get("NUMBER", 0))
+        store._add_partition(key, total, window)
+
+    def fetch(key: str, start: int, size: int):
+        response = _functions.get_stats_list(
+            **partitions[key], **kwargs, startPosition=start, limit=size
+        )
+        store._commit_window(key, start, _table_inf(_json.response_json(response)))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(count, key)
+            for key in partitions
+            if store._partition_total(key) is None
+        ]
+        concurrent.futures.wait(futures)
+        errors = [f.exception() for f in futures if f.exception() is not None]
+
+        futures = [
+            executor.submit(fetch, key, start, size)
+            for key, start, size in store._pending_windows()
+            if key in partitions
+        ]
+        concurrent.futures.wait(futures)
+        errors += [f.exception() for f in futures if f.exception() is not None]
+
+    if errors:
+        store.close()
+        raise errors[0]
+
+    return store
@@ -0,0 +1,258 @@
+import dataclasses
+import math
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from estatapi._metadata import normalize_class_objs
+
+
+@dataclasses.dataclass
+class Axis:
+    """A dimension of the cube: the codes and the names of its items in order."""
+
+    id: str
+    name: str
+    codes: pd.Index
+    labels: pd.Index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def position(self, value: str) -> int:
+        """Position of an item given by its code or its name."""
+        for index in (self.codes, self.labels):
+            positions = np.flatnonzero(index == value)
+            if len(positions):
+                return int(positions[0])
+        raise ValueError(f"{value} is neither a code nor a name of {self.id}.")
+
+    def take(self, positions: list[int]) -> "Axis":
+        return Axis(self.id, self.name, self.codes[positions], self.labels[positions])
+
+
+class Cube:
+    """
+    統計データのN次元配列（キューブ）。
+
+    次元ごとの項目はメタ情報（CLASS_OBJ）の並び順で軸に対応し、
+    値の無いセルは `NaN` です。
+    密度が低い場合は、値のあるセルの位置と値だけを持つ疎な形式（COO）になります。
+
+    `sel` による切り出しや `sum` による集計は配列演算として行われます。
+    """
+
+    def __init__(
+        self,
+        axes: list[Axis],
+        data: np.ndarray | None = None,
+        indices: np.ndarray | None = None,
+        values: np.ndarray | None = None,
+    ):
+        self.axes = axes
+        self._data = data
+        self._indices = indices
+        self._values = values
+
+    @property
+    def dims(self) -> list[str]:
+        return [axis.id for axis in self.axes]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(len(axis) for axis in self.axes)
+
+    @property
+    def is_sparse(self) -> bool:
+        return self._data is None
+
+    @property
+    def nnz(self) -> int:
+        """値のあるセルの数。"""
+        if self.is_sparse:
+            return len(self._values)
+        return int(np.count_nonzero(~np.isnan(self._data)))
+
+    @property
+    def density(self) -> float:
+        size = math.prod(self.shape)
+        return self.nnz / size if size else 0.0
+
+    def __repr__(self) -> str:
+        dims = ", ".join(f"{axis.id}: {len(axis)}" for axis in self.axes)
+        kind = "sparse" if self.is_sparse else "dense"
+        return f"Cube({dims}; {kind}, nnz={self.nnz})"
+
+    def _axis_number(self, dim: str) -> int:
+        dim = dim.lstrip("@")
+        for i, axis in enumerate(self.axes):
+            if dim in (axis.id, axis.name):
+                return i
+        raise ValueError(f"{dim} is not a dimension of the cube.")
+
+    def to_numpy(self) -> np.ndarray:
+        """密なN次元配列を返します。"""
+        if not self.is_sparse:
+            return self._data
+        data = np.full(self.shape, np.nan)
+        data[tuple(self._indices)] = self._values
+        return data
+
+    def to_dense(self) -> "Cube":
+        return self if not self.is_sparse else Cube(self.axes, data=self.to_numpy())
+
+    def to_sparse(self) -> "Cube":
+        if self.is_sparse:
+            return self
+        indices = np.array(np.nonzero(~np.isnan(self._data)), dtype=np.int64)
+        indices = indices.reshape(len(self.axes), -1)
+        return Cube(self.axes, indices=indices, values=self._data[tuple(indices)])
+
+    def sel(self, **selection: str | Iterable[str]) -> "Cube":
+        """
+        項目を名称またはコードで選択します。
+
+        一つの項目を指定した次元は取り除かれ、リストで指定した次元はその順に並びます。
+        (例: `cube.sel(area=["東京都", "大阪府"], time="2020年")`)
+        """
+        axes = list(self.axes)
+        data, indices, values = self._data, self._indices, self._values
+        dropped = []
+        for dim, value in selection.items():
+            i = self._axis_number(dim)
+            axis = self.axes[i]
+            if isinstance(value, str):
+                position = axis.position(value)
+                if data is not None:
+                    data = np.take(data, [position], axis=i)
+                else:
+                    keep = indices[i] == position
+                    indices, values = indices[:, keep], values[keep]
+                dropped.append(i)
+                continue
+
+            positions = [axis.position(v) for v in value]
+            axes[i] = axis.take(positions)
+            if data is not None:
+                data = np.take(data, positions, axis=i)
+            else:
+                mapping = np.full(len(axis), -1, dtype=np.int64)
+                mapping[positions] = np.arange(len(positions))
+                new = mapping[indices[i]]
+                keep = new >= 0
+                indices, values = indices[:, keep], values[keep]
+                indices[i] = new[keep]
+
+        keep_axes = [i for i in range(len(axes)) if i not in dropped]
+        if data is not None:
+            # selected items were kept as axes of length 1 until here
+            data = data.reshape([len(axes[i]) for i in keep_axes])
+        else:
+            indices = indices[keep_axes]
+        return Cube([axes[i] for i in keep_axes], data, indices, values)
+
+    def sum(self, dims: str | Iterable[str] | None = None) -> "Cube | float":
+        """
+        次元に沿って合計します。`dims` を省略すると全体の合計を返します。
+
+        値のあるセルが一つもない場合、合計は `NaN` になります。
+        """
+        if dims is None:
+            summed = list(range(len(self.axes)))
+        else:
+            dims = [dims] if isinstance(dims, str) else dims
+            summed = [self._axis_number(d) for d in dims]
+        keep = [i for i in range(len(self.axes)) if i not in summed]
+        axes = [self.axes[i] for i in keep]
+
+        if not self.is_sparse:
+            axis = tuple(summed)
+            result = np.nansum(self._data, axis=axis)
+            result = np.where(np.isnan(self._data).all(axis=axis), np.nan, result)
+            return float(result) if not keep else Cube(axes, data=result)
+
+        if not keep:
+            return float(self._values.sum()) if len(self._values) else np.nan
+        shape = tuple(len(a) for a in axes)
+        linear = np.ravel_multi_index(tuple(self._indices[keep]), shape)
+        unique, inverse = np.unique(linear, return_inverse=True)
+        values = np.bincount(inverse, weights=self._values)
+        indices = np.array(np.unravel_index(unique, shape), dtype=np.int64)
+        return Cube(axes, indices=indices.reshape(len(axes), -1), values=values)
+
+    def squeeze(self) -> "Cube":
+        """項目が一つしかない次元を取り除きます。"""
+        return self.sel(
+            **{axis.id: axis.codes[0] for axis in self.axes if len(axis) == 1}
+        )
+
+    def to_series(self, labels: bool = True) -> pd.Series:
+        """値のあるセルを、次元をマルチインデックスとするシリーズで返します。"""
+        cube = self.to_sparse()
+        index = pd.MultiIndex.from_arrays(
+            [
+                (axis.labels if labels else axis.codes)[positions]
+                for axis, positions in zip(cube.axes, cube._indices)
+            ],
+            names=[axis.name if labels else axis.id for axis in cube.axes],
+        )
+        return pd.Series(cube._values, index=index, name="値" if labels else "$")
+
+
+def to_cube(
+    stats_data_json: dict, sparse: bool | None = None, density: float = 0.1
+) -> Cube:
+    """
+    統計データ取得のJSONを、次元ごとの項目を軸とするN次元配列（`Cube`）に変換します。
+
+    値は数値に変換され、数値でない値（"-" や "***" など）は値の無いセルになります。
+
+    Parameters
+    ----------
+    `stats_data_json` : dict
+        メタ情報を含む統計データ取得のJSON。
+
+    `sparse` : bool, optional
+        疎な形式にするかどうか。省略時は、値のあるセルの割合が `density` 未満の場合に疎な形式にします。
+
+    `density` : float, default 0.1
+        `sparse` を省略した場合に、疎な形式にする密度の閾値。
+
+    Returns
+    -------
+    cube : Cube
+    """
+    stats_data = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    if "CLASS_INF" not in stats_data:
+        raise ValueError("to_cube requires the metadata (metaGetFlg='Y').")
+
+    axes = [
+        Axis(
+            id=obj["@id"],
+            name=obj.get("@name", obj["@id"]),
+            codes=pd.Index([c["@code"] for c in obj["CLASS"]]),
+            labels=pd.Index([c.get("@name", c["@code"]) for c in obj["CLASS"]]),
+        )
+        for obj in normalize_class_objs(stats_data["CLASS_INF"])
+    ]
+
+    records = stats_data.get("DATA_INF", {}).get("VALUE", [])
+    records = [records] if isinstance(records, dict) else records
+    indices = np.array(
+        [
+            axis.codes.get_indexer([r.get("@" + axis.id) for r in records])
+            for axis in axes
+        ],
+        dtype=np.int64,
+    ).reshape(len(axes), len(records))
+    values = pd.to_numeric(
+        pd.Series([r.get("$") for r in records], dtype=object), errors="coerce"
+    ).to_numpy(dtype=np.float64)
+
+    keep = ~np.isnan(values) & (indices >= 0).all(axis=0)
+    cube = Cube(axes, indices=indices[:, keep], values=values[keep])
+
+    if sparse is None:
+        sparse = cube.density < density
+    return cube if sparse else cube.to_dense()
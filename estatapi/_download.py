@@ -0,0 +1,121 @@
+import json
+import os
+import shutil
+
+from estatapi import _functions, _json, _pagination, _util
+
+
+def _updated_date(json_data: dict) -> str | None:
+    stats_data = _pagination._statistical_data(json_data)
+    return stats_data.get("TABLE_INF", {}).get("UPDATED_DATE")
+
+
+class _Checkpoint:
+    """
+    Pages already persisted for a query and the last committed NEXT_KEY.
+
+    Page files are written before the manifest which refers to them,
+    so the manifest never points to a partially written page.
+    """
+
+    def __init__(self, directory: str, fingerprint: str, params: dict):
+        self.directory = os.path.join(directory, fingerprint)
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.fingerprint = fingerprint
+        self.params = params
+        self.reset(remove=False)
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["fingerprint"] == fingerprint:
+                self.manifest = manifest
+
+    def reset(self, remove: bool = True):
+        if remove and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.manifest = {
+            "fingerprint": self.fingerprint,
+            "params": self.params,
+            "updated_date": None,
+            "pages": [],
+            "next_key": self.params.get("startPosition"),
+            "complete": False,
+        }
+
+    @property
+    def exists(self) -> bool:
+        return bool(self.manifest["pages"])
+
+    def commit_page(self, content: bytes, updated_date: str | None, next_key):
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = f"page-{len(self.manifest['pages']):06d}.json"
+        _util._write_atomic(os.path.join(self.directory, file_name), content)
+
+        self.manifest["updated_date"] = updated_date
+        self.manifest["pages"].append(
+            {"start": self.manifest["next_key"], "file": file_name}
+        )
+        self.manifest["next_key"] = next_key
+        self.manifest["complete"] = next_key is None
+        _util._write_atomic(
+            self.manifest_path,
+            json.dumps(self.manifest, ensure_ascii=False).encode("utf-8"),
+        )
+
+    def iter_pages(self):
+        for page in self.manifest["pages"]:
+            with open(os.path.join(self.directory, page["file"]), "rb") as f:
+                yield _json.loads(f.read())
+
+
+def download_stats_data(checkpoint_dir: str, **kwargs) -> dict:
+    """
+    統計データをページごとにチェックポイントを保存しながら取得します。
+
+    取得済みのページと最後に確定した<NEXT_KEY>をクエリごとに `checkpoint_dir` に保存します。
+    同じ引数で再実行すると、取得済みのページを飛ばして続きから取得します。
+    再開前には件数のみのリクエスト（`cntGetFlg='Y'`）で統計表の更新日（UPDATED_DATE）を確認し、
+    チェックポイントと異なる場合は保存済みのページを破棄して最初から取得し直します。
+
+    Parameters
+    ----------
+    `checkpoint_dir` : str
+        チェックポイントを保存するディレクトリ。
+
+    `kwargs`
+        `get_stats_data` の引数。
+
+    Returns
+    -------
+    json_data : dict
+        全てのページをまとめた統計データのJSON。
+    """
+    params = {k: v for k, v in kwargs.items() if v is not None}
+    checkpoint = _Checkpoint(
+        checkpoint_dir, _pagination._fingerprint(params), params=params
+    )
+
+    # make sure persisted pages are not stale
+    if checkpoint.exists:
+        _, updated_date = _pagination._count(**params)
+        if updated_date != checkpoint.manifest["updated_date"]:
+            checkpoint.reset()
+
+    while not checkpoint.manifest["complete"]:
+        request_params = {**params, "startPosition": checkpoint.manifest["next_key"]}
+        response = _functions.get_stats_data(**request_params)
+        _util._check_http_status(response)
+        json_data = _json.response_json(response)
+        updated_date = _updated_date(json_data)
+
+        # the table was updated while downloading
+        if checkpoint.exists and updated_date != checkpoint.manifest["updated_date"]:
+            checkpoint.reset()
+            continue
+
+        checkpoint.commit_page(
+            response.content, updated_date, _pagination._next_key(json_data)
+        )
+
+    return _pagination.merge_stats_data_pages(checkpoint.iter_pages())
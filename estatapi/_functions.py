@@ -4,7 +4,7 @@ from typing import Annotated, Literal
 import requests
 from pydantic import Field, ValidationError, validate_call
 
-from estatapi import _appid, _endpoint, _enum
+from estatapi import _appid, _endpoint, _enum, _instrument, _transport
 
 YearsStr = Field(
     default=None,
@@ -27,6 +27,44 @@ DateStr = Field(
 )
 
 
+def _get(api_type: _enum.ApiType, params: dict) -> requests.Response:
+    # check if APP ID is set
+    pool = _appid.get_appid_pool()
+    if pool is None:
+        with _instrument.stage("validate", api_type=api_type.value):
+            _appid._check_appid()
+
+    # build endpoint
+    endpoint = _endpoint.Endpoint(
+        api_type=api_type,
+        response_data_type=_enum.ResponseDataType.JSON,
+    ).build()
+
+    # get response
+    # with a pool, retry with another APP ID when the one used is quarantined
+    for _ in range(1 if pool is None else len(pool)):
+        params["appId"] = _appid.get_appid() if pool is None else pool.acquire()
+        try:
+            with _instrument.stage("request", api_type=api_type.value) as attrs:
+                response = _transport.get_transport().get(url=endpoint, params=params)
+                if _instrument._HOOKS:
+                    attrs["status_code"] = response.status_code
+                    attrs["bytes"] = len(response.content)
+        except BaseException:
+            if pool is not None:
+                pool.release(params["appId"])
+            raise
+        if pool is None:
+            break
+        quarantined = pool.release(
+            params["appId"], response.status_code, response.content
+        )
+        if not quarantined or not pool.available():
+            break
+
+    return response
+
+
 @validate_call
 def get_stats_list(
     surveyYears: str | None = YearsStr,
@@ -158,20 +196,7 @@ def get_stats_list(
         "updatedDate": updatedDate,
     }
 
-    # check if APP ID is set
-    _appid._check_appid()
-    params["appId"] = _appid.get_appid()
-
-    # build endpoint
-    endpoint = _endpoint.Endpoint(
-        api_type=_enum.ApiType.getStatsList,
-        response_data_type=_enum.ResponseDataType.JSON,
-    ).build()
-
-    # get response
-    response = requests.get(url=endpoint, params=params)
-
-    return response
+    return _get(api_type=_enum.ApiType.getStatsList, params=params)
 
 
 @validate_call
@@ -214,20 +239,7 @@ def get_meta_info(
         "lang": lang,
     }
 
-    # check if APP ID is set
-    _appid._check_appid()
-    params["appId"] = _appid.get_appid()
-
-    # build endpoint
-    endpoint = _endpoint.Endpoint(
-        api_type=_enum.ApiType.getMetaInfo,
-        response_data_type=_enum.ResponseDataType.JSON,
-    ).build()
-
-    # get response
-    response = requests.get(url=endpoint, params=params)
-
-    return response
+    return _get(api_type=_enum.ApiType.getMetaInfo, params=params)
 
 
 def _validate_dataSetId_statsDataId(dataSetId, statsDataId):
@@ -450,11 +462,12 @@ def get_stats_data(
     -------
     api_response : requests.Response
     """
-    # check if only one of dataSetId and statsDataId is specified
-    _validate_dataSetId_statsDataId(dataSetId, statsDataId)
+    with _instrument.stage("validate", api_type=_enum.ApiType.getStatsData.value):
+        # check if only one of dataSetId and statsDataId is specified
+        _validate_dataSetId_statsDataId(dataSetId, statsDataId)
 
-    # check if keys of kwargs are valid
-    _validate_kwargs(kwargs)
+        # check if keys of kwargs are valid
+        _validate_kwargs(kwargs)
 
     params = {
         "dataSetId": dataSetId,
@@ -486,17 +499,166 @@ def get_stats_data(
         **kwargs,
     }
 
-    # check if APP ID is set
-    _appid._check_appid()
-    params["appId"] = _appid.get_appid()
+    return _get(api_type=_enum.ApiType.getStatsData, params=params)
 
-    # build endpoint
-    endpoint = _endpoint.Endpoint(
-        api_type=_enum.ApiType.getStatsData,
-        response_data_type=_enum.ResponseDataType.JSON,
-    ).build()
 
-    # get response
-    response = requests.get(url=endpoint, params=params)
+@validate_call
+def get_data_catalog(
+    surveyYears: str | None = YearsStr,
+    openYears: str | None = YearsStr,
+    statsField: str | None = StatsField,
+    statsCode: str | None = StatsCode,
+    searchWord: str | None = None,
+    collectArea: Literal["1", "2", "3"] | None = None,
+    explanationGetFlg: Literal["Y", "N"] = "Y",
+    dataType: str
+    | None = Field(
+        default=None,
+        pattern=r"^(?:XLS|CSV|PDF|XML|XLS_REP|DB)(?:,(?:XLS|CSV|PDF|XML|XLS_REP|DB))*$",
+    ),
+    catalogId: str | None = None,
+    resourceId: str | None = None,
+    startPosition: int | None = Field(default=None, ge=1),
+    limit: int | None = Field(default=None, ge=1),
+    updatedDate: str | None = DateStr,
+    lang: Literal["J", "E"] = Field(default="J"),
+) -> requests.Response:
+    """
+    データカタログ情報取得
+    -------------
 
-    return response
+    統計表ファイル（Excel、CSV、PDF）や統計データベースの情報を取得します。
+
+    詳しくは以下のurlを参照
+    https://www.e-stat.go.jp/api/api-info/e-stat-manual3-0#api_2_7
+
+    Parameters
+    ----------
+    `surveyYears` : str, optional
+        調査年月。`get_stats_list` と同様です。
+
+    `openYears` : str, optional
+        公開年月。`get_stats_list` と同様です。
+
+    `statsField` : str, optional
+        統計分野。`get_stats_list` と同様です。
+
+    `statsCode` : str, optional
+        政府統計コード。`get_stats_list` と同様です。
+
+    `searchWord` : str, optional
+        検索キーワード。`get_stats_list` と同様です。
+
+    `collectArea` : str, optional
+        集計地域区分。
+        - '1': 全国
+        - '2': 都道府県
+        - '3': 市区町村
+
+    `explanationGetFlg` : Literal['Y', 'N'], default 'Y'
+        解説情報有無。
+        - Y: 取得する
+        - N: 取得しない
+
+    `dataType` : str, optional
+        検索データ形式。カンマ区切りで複数指定できます。
+        - 'XLS': Excel
+        - 'CSV': CSV
+        - 'PDF': PDF
+        - 'XML': XML
+        - 'XLS_REP': Excel（帳票形式）
+        - 'DB': 統計データベース
+
+    `catalogId` : str, optional
+        カタログID。特定のデータカタログを取得する場合に指定します。
+
+    `resourceId` : str, optional
+        カタログリソースID。特定のリソースを取得する場合に指定します。
+
+    `startPosition` : int, optional
+        データ取得開始位置。
+
+    `limit` : int , optional
+        データ取得件数。省略時は100件です。
+
+    `updatedDate` : str , optional
+        更新日付。`get_stats_list` と同様です。
+
+    `lang` : Literal['J', 'E'], default 'J'
+        取得するデータの言語。
+        - 'J': 日本語
+        - 'E': 英語
+
+    Returns
+    -------
+    api_response : requests.Response
+    """
+
+    params = {
+        "lang": lang,
+        "surveyYears": surveyYears,
+        "openYears": openYears,
+        "statsField": statsField,
+        "statsCode": statsCode,
+        "searchWord": searchWord,
+        "collectArea": collectArea,
+        "explanationGetFlg": explanationGetFlg,
+        "dataType": dataType,
+        "catalogId": catalogId,
+        "resourceId": resourceId,
+        "startPosition": startPosition,
+        "limit": limit,
+        "updatedDate": updatedDate,
+    }
+
+    return _get(api_type=_enum.ApiType.getDataCatalog, params=params)
+
+
+@validate_call
+def ref_dataset(
+    dataSetId: str | None = None,
+    collectArea: Literal["1", "2", "3"] | None = None,
+    explanationGetFlg: Literal["Y", "N"] = "Y",
+    lang: Literal["J", "E"] = Field(default="J"),
+) -> requests.Response:
+    """
+    データセット参照
+    -------------
+
+    登録されているデータセットの絞り込み条件等を参照します。
+    `dataSetId` を省略した場合は、登録されているデータセットの一覧を取得します。
+
+    Parameters
+    ----------
+    `dataSetId` : str, optional
+        データセットID。
+
+    `collectArea` : str, optional
+        集計地域区分。
+        - '1': 全国
+        - '2': 都道府県
+        - '3': 市区町村
+
+    `explanationGetFlg` : Literal['Y', 'N'], default 'Y'
+        解説情報有無。
+        - Y: 取得する
+        - N: 取得しない
+
+    `lang` : Literal['J', 'E'], default 'J'
+        取得するデータの言語。
+        - 'J': 日本語
+        - 'E': 英語
+
+    Returns
+    -------
+    api_response : requests.Response
+    """
+
+    params = {
+        "dataSetId": dataSetId,
+        "collectArea": collectArea,
+        "explanationGetFlg": explanationGetFlg,
+        "lang": lang,
+    }
+
+    return _get(api_type=_enum.ApiType.refDataset, params=params)
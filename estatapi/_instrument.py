@@ -0,0 +1,154 @@
+import collections
+import dataclasses
+import threading
+import time
+from typing import Callable
+
+# stages reported by this package
+# - "validate": validation of arguments in the request functions
+# - "request": network round trip of one API call
+# - "decode": decoding JSON
+# - "normalize": building the raw DataFrame from JSON records
+# - "relabel": mapping codes to names in `to_df`
+# - "cache": lookup of a cache (`hit` attribute tells the result)
+# - "spill": writing pages to a temporary file in `fetch_stats_data`
+# - "hedge": a duplicate request sent by `HedgedTransport` (`won` tells the winner)
+# - "retry": a retry of a transient error in `RetryTransport`
+# - "circuit": `CircuitBreaker` opened
+
+
+@dataclasses.dataclass
+class Event:
+    stage: str
+    duration: float
+    attrs: dict
+
+
+_HOOKS: list[Callable[[Event], None]] = []
+
+
+def add_hook(hook: Callable[[Event], None]):
+    """
+    計測イベントを受け取るコールバックを登録します。
+
+    コールバックは処理段階ごとに `Event` を引数として呼び出されます。
+    コールバックが登録されていない間は計測自体を行いません。
+    """
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+
+
+def remove_hook(hook: Callable[[Event], None]):
+    """`add_hook` で登録したコールバックを解除します。"""
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+def emit(stage: str, duration: float = 0.0, **attrs):
+    for hook in tuple(_HOOKS):
+        hook(Event(stage=stage, duration=duration, attrs=attrs))
+
+
+class _Stage:
+    """
+    Context manager measuring the wall time of a stage.
+    Attributes can be added to `attrs` inside the block.
+    """
+
+    __slots__ = ("stage", "attrs", "start")
+
+    def __init__(self, stage: str, attrs: dict):
+        self.stage = stage
+        self.attrs = attrs
+        self.start = None
+
+    def __enter__(self) -> dict:
+        if _HOOKS:
+            self.start = time.perf_counter()
+        return self.attrs
+
+    def __exit__(self, *exc_info):
+        if self.start is not None:
+            emit(self.stage, time.perf_counter() - self.start, **self.attrs)
+
+
+def stage(stage: str, **attrs) -> _Stage:
+    return _Stage(stage, attrs)
+
+
+@dataclasses.dataclass
+class StageStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    bytes: int = 0
+    rows: int = 0
+
+
+class Collector:
+    """
+    計測イベントを集計する組み込みのコールバック。
+
+    処理段階ごとの回数・合計時間・最大時間・受信バイト数・行数と、キャッシュのヒット数を集計します。
+    集計はイベントごとに定数時間で行われるため、常時有効にしておけます。
+
+    Parameters
+    ----------
+    `keep_requests` : int, default 0
+        直近のAPI呼び出しの記録を保持する件数。
+
+    Examples
+    --------
+    >>> with estatapi.Collector() as collector:
+    ...     response = estatapi.get_stats_data(statsDataId="0000030001")
+    ...     df = estatapi.stats_data_to_pandas(response.json())
+    >>> collector.summary()
+    """
+
+    def __init__(self, keep_requests: int = 0):
+        self._lock = threading.Lock()
+        self.stages: dict[str, StageStats] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.requests = collections.deque(maxlen=keep_requests)
+
+    def __call__(self, event: Event):
+        with self._lock:
+            stats = self.stages.get(event.stage)
+            if stats is None:
+                stats = self.stages[event.stage] = StageStats()
+            stats.count += 1
+            stats.total += event.duration
+            stats.max = max(stats.max, event.duration)
+            stats.bytes += event.attrs.get("bytes", 0)
+            stats.rows += event.attrs.get("rows", 0)
+
+            if event.stage == "cache":
+                if event.attrs.get("hit"):
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+            elif event.stage == "request" and self.requests.maxlen:
+                self.requests.append({"duration": event.duration, **event.attrs})
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {k: dataclasses.asdict(v) for k, v in self.stages.items()},
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.requests.clear()
+
+    def __enter__(self):
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        remove_hook(self)
@@ -0,0 +1,205 @@
+from typing import Iterable, Literal
+
+import numpy as np
+import pandas as pd
+
+from estatapi import _pagination
+from estatapi._pandas import StatisticalData
+
+
+def _as_statistical_data(table: StatisticalData | dict) -> StatisticalData:
+    if isinstance(table, StatisticalData):
+        return table
+    return StatisticalData(table["GET_STATS_DATA"]["STATISTICAL_DATA"])
+
+
+def _records(stats_data: StatisticalData) -> list[dict]:
+    records = stats_data.json_data["DATA_INF"]["VALUE"]
+    return [records] if isinstance(records, dict) else records
+
+
+def _table_name(stats_data: StatisticalData, i: int) -> str:
+    table_inf = stats_data.json_data.get("TABLE_INF", {})
+    return table_inf.get("@id", str(i))
+
+
+def _coded_frame(
+    records: list[dict], on: list[str], categories: dict[str, pd.Index]
+) -> tuple[np.ndarray, pd.DataFrame]:
+    """
+    Compute the integer key of the shared dimensions and
+    keep the other dimensions as categorical codes.
+    """
+    key = np.zeros(len(records), dtype=np.int64)
+    for col in on:
+        codes = categories[col].get_indexer([r.get(col) for r in records])
+        key = key * (len(categories[col]) + 1) + (codes + 1)
+
+    names = list(dict.fromkeys(k for r in records for k in r if k not in on))
+    data = {}
+    for col in names:
+        column = [r.get(col) for r in records]
+        data[col] = column if col == "$" else pd.Categorical(column)
+    return key, pd.DataFrame(data)
+
+
+def _relabel(categorical: pd.Categorical, mapper: dict) -> pd.Categorical:
+    """Map categories to labels. Different codes may have the same label."""
+    mapped = [mapper.get(c, c) for c in categorical.categories]
+    category_codes, labels = pd.factorize(pd.Series(mapped, dtype=object))
+    codes = np.asarray(categorical.codes)
+    codes = np.where(codes >= 0, category_codes[codes], -1)
+    return pd.Categorical.from_codes(codes, labels)
+
+
+def _decode_key(key: np.ndarray, on: list[str], categories: dict) -> dict:
+    codes = {}
+    for col in reversed(on):
+        n = len(categories[col]) + 1
+        codes[col] = pd.Categorical.from_codes(key % n - 1, categories[col])
+        key = key // n
+    return {col: codes[col] for col in on}
+
+
+def join_stats_data(
+    tables: Iterable[StatisticalData | dict],
+    on: Iterable[str] = ("area", "time"),
+    how: Literal["inner", "outer", "left"] = "inner",
+    names: Iterable[str] | None = None,
+    labels: bool = True,
+) -> pd.DataFrame:
+    """
+    複数の統計データを共通の事項（地域・時間軸など）のコードで結合します。
+
+    各統計データの共通事項のコードを整数のキーに変換してから結合し、
+    結合後に一度だけラベルを付けます。全ての統計データのキーが同じ並びの場合は、
+    結合を行わずに列を並べるだけの高速な経路を使います。
+
+    Parameters
+    ----------
+    `tables` : iterable of StatisticalData or dict
+        `StatisticalData` か、`get_stats_data` で取得したJSON。
+
+    `on` : iterable of str, default ('area', 'time')
+        結合に使う事項のID。
+
+    `how` : Literal['inner', 'outer', 'left'], default 'inner'
+        結合方法。
+
+    `names` : iterable of str, optional
+        列の第一階層に使う各統計データの名前。省略時は統計表IDです。
+
+    `labels` : bool, default True
+        コードを名称に置き換えるか否か。
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        行は共通事項のMultiIndex、列は (名前, 列名) のMultiIndex。
+    """
+    tables = [_as_statistical_data(t) for t in tables]
+    on = ["@" + col.lstrip("@") for col in on]
+    names = (
+        [_table_name(t, i) for i, t in enumerate(tables)]
+        if names is None
+        else list(names)
+    )
+    if len(names) != len(tables):
+        raise ValueError("The number of names must be the same as that of tables.")
+
+    records = [_records(t) for t in tables]
+
+    # shared code space of each dimension
+    categories = {}
+    for col in on:
+        codes = dict.fromkeys(r.get(col) for rs in records for r in rs)
+        codes.pop(None, None)
+        categories[col] = pd.Index(sorted(codes), dtype=object)
+
+    coded = [_coded_frame(rs, on, categories) for rs in records]
+    keys = [key for key, _ in coded]
+
+    # fast path: the same keys in the same order
+    if (
+        all(np.array_equal(keys[0], key) for key in keys[1:])
+        and pd.Index(keys[0]).is_unique
+    ):
+        key = keys[0]
+        frames = [frame for _, frame in coded]
+    else:
+        joined = None
+        for i, (key, frame) in enumerate(coded):
+            frame = pd.DataFrame({("__key__", ""): key}).join(
+                frame.set_axis(pd.MultiIndex.from_product([[i], frame.columns]), axis=1)
+            )
+            joined = (
+                frame
+                if joined is None
+                else joined.merge(frame, on=[("__key__", "")], how=how)
+            )
+        key = joined.pop(("__key__", "")).to_numpy()
+        frames = [joined[i] for i in range(len(coded))]
+
+    index_codes = _decode_key(key, on, categories)
+
+    if labels:
+        value_mappers = {}
+        column_mappers = {}
+        for t in tables:
+            if t._metainfo_exists():
+                value_mappers = {**t.get_value_mappers(), **value_mappers}
+                column_mappers = {**t.get_column_mapper(False), **column_mappers}
+        index_codes = {
+            column_mappers.get(col, col): (
+                _relabel(codes, value_mappers[col]) if col in value_mappers else codes
+            )
+            for col, codes in index_codes.items()
+        }
+
+        labelled = []
+        for t, frame in zip(tables, frames):
+            if not t._metainfo_exists():
+                labelled.append(frame)
+                continue
+            frame = frame.copy()
+            mappers = t.get_value_mappers()
+            for col in frame.columns:
+                if col in mappers and isinstance(frame[col].dtype, pd.CategoricalDtype):
+                    frame[col] = _relabel(frame[col].array, mappers[col])
+            labelled.append(frame.rename(columns=t.get_column_mapper(False)))
+        frames = labelled
+
+    index = pd.MultiIndex.from_arrays(
+        list(index_codes.values()), names=list(index_codes)
+    )
+    df = pd.concat(
+        [frame.reset_index(drop=True) for frame in frames], axis=1, keys=names
+    )
+    df.index = index
+    return df
+
+
+def get_joined_stats_data(
+    statsDataIds: Iterable[str],
+    on: Iterable[str] = ("area", "time"),
+    how: Literal["inner", "outer", "left"] = "inner",
+    labels: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    複数の統計表を取得し、共通の事項のコードで結合します。
+
+    `kwargs` は各統計表の `get_stats_data` に渡されます。
+    統計表が複数ページに分かれる場合は全てのページを取得します。
+    結合については `join_stats_data` を参照してください。
+    """
+    statsDataIds = list(statsDataIds)
+    tables = [
+        _pagination.merge_stats_data_pages(
+            _pagination.iter_stats_data(
+                reuse_metadata=True, statsDataId=statsDataId, **kwargs
+            )
+        )
+        for statsDataId in statsDataIds
+    ]
+    return join_stats_data(tables, on=on, how=how, names=statsDataIds, labels=labels)
@@ -0,0 +1,70 @@
+import json
+from typing import Any, Callable, Literal
+
+import requests
+
+from estatapi import _instrument
+
+Decoder = Callable[[bytes], Any]
+
+_DECODER: Decoder | None = None
+
+
+def _orjson_loads() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _stdlib_loads(content: bytes | str) -> Any:
+    # the API returns UTF-8: decoding it directly is faster than
+    # json.loads detecting the encoding of bytes
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        content = bytes(content).decode("utf-8")
+    return json.loads(content)
+
+
+def _default_decoder() -> Decoder:
+    """orjson when it is installed, otherwise the standard library."""
+    try:
+        return _orjson_loads()
+    except ImportError:
+        return _stdlib_loads
+
+
+def set_decoder(decoder: Decoder | Literal["orjson", "json"] | None = None):
+    """
+    レスポンスのJSONのデコーダを設定します。
+
+    Parameters
+    ----------
+    `decoder` : callable or Literal['orjson', 'json'], optional
+        バイト列を受け取ってデコードした結果を返す関数、または 'orjson' / 'json'。
+        省略時は、orjsonがインストールされていればorjsonを、そうでなければ標準ライブラリを使います。
+    """
+    global _DECODER
+    if decoder == "orjson":
+        try:
+            decoder = _orjson_loads()
+        except ImportError as e:
+            raise ImportError("orjson is required for decoder='orjson'.") from e
+    elif decoder == "json":
+        decoder = _stdlib_loads
+    _DECODER = decoder
+
+
+def get_decoder() -> Decoder:
+    global _DECODER
+    if _DECODER is None:
+        _DECODER = _default_decoder()
+    return _DECODER
+
+
+def loads(content: bytes | str) -> Any:
+    """Decode JSON from the raw bytes of a response (orjson needs no text copy)."""
+    with _instrument.stage("decode", bytes=len(content)):
+        return get_decoder()(content)
+
+
+def response_json(response: requests.Response) -> Any:
+    return loads(response.content)
@@ -0,0 +1,187 @@
+import bisect
+import threading
+import unicodedata
+from typing import Iterable, Literal
+
+from estatapi import _metadata
+
+Match = Literal["auto", "exact", "normalized", "prefix"]
+
+
+def normalize_label(label: str) -> str:
+    """
+    名称を照合用に正規化します。
+
+    NFKC正規化（全角英数字・記号を半角に、半角カナを全角に）を行い、空白を除いて小文字にします。
+    """
+    return "".join(unicodedata.normalize("NFKC", label).split()).casefold()
+
+
+def _level(class_: dict) -> int | None:
+    level = class_.get("@level")
+    return int(level) if level else None
+
+
+class _DimIndex:
+    """Label-to-code maps of one dimension. Codes are kept in the metadata order."""
+
+    def __init__(self, classes: list[dict]):
+        self.codes = [c["@code"] for c in classes]
+        self.positions = {code: i for i, code in enumerate(self.codes)}
+        self.levels = {c["@code"]: _level(c) for c in classes}
+        self.exact: dict[str, list[str]] = {}
+        self.normalized: dict[str, list[str]] = {}
+        for c in classes:
+            name = c.get("@name")
+            if name is None:
+                continue
+            self.exact.setdefault(name, []).append(c["@code"])
+            self.normalized.setdefault(normalize_label(name), []).append(c["@code"])
+        # sorted normalized labels for prefix searches
+        self.sorted_labels = sorted(self.normalized)
+
+    def prefix(self, label: str) -> list[str]:
+        key = normalize_label(label)
+        start = bisect.bisect_left(self.sorted_labels, key)
+        codes = []
+        for name in self.sorted_labels[start:]:
+            if not name.startswith(key):
+                break
+            codes.extend(self.normalized[name])
+        return sorted(codes, key=self.positions.__getitem__)
+
+
+class LookupIndex:
+    """
+    統計表のメタ情報（CLASS_OBJ）から作成した、名称からコードを引く索引。
+
+    名称の完全一致・正規化（全角/半角、空白）後の一致・前方一致でコードを検索でき、階層レベルで絞り込めます。
+    索引は作成時に一度だけ構築されるため、検索は辞書の参照または二分探索で行われます。
+    `lookup_index` で統計表IDから作成できます。
+
+    Parameters
+    ----------
+    `class_objs` : list of dict
+        メタ情報のCLASS_OBJ。
+
+    Examples
+    --------
+    >>> index = estatapi.lookup_index("0003433219")
+    >>> index.lookup("area", "東京都")
+    ['13000']
+    >>> index.lookup("time", "2020", match="prefix")
+    ['2020000000']
+    >>> index.lookup("cat01", "男", level=1)
+    """
+
+    def __init__(self, class_objs: list[dict]):
+        self._dims = {obj["@id"]: _DimIndex(obj["CLASS"]) for obj in class_objs}
+
+    @property
+    def dims(self) -> list[str]:
+        return list(self._dims)
+
+    def _dim(self, dim: str) -> _DimIndex:
+        dim = dim.lstrip("@")
+        if dim not in self._dims:
+            raise ValueError(f"{dim} is not a dimension of the table.")
+        return self._dims[dim]
+
+    def lookup(
+        self,
+        dim: str,
+        label: str,
+        match: Match = "auto",
+        level: int | Iterable[int] | None = None,
+    ) -> list[str]:
+        """
+        名称に一致するコードを、メタ情報の並び順で返します。
+
+        Parameters
+        ----------
+        `dim` : str
+            事項のID（'area', 'time', 'cat01' など）。
+
+        `label` : str
+            名称。`match='auto'` の場合はコードも指定できます。
+
+        `match` : Literal['auto', 'exact', 'normalized', 'prefix'], default 'auto'
+            - 'exact': 名称の完全一致
+            - 'normalized': `normalize_label` で正規化した名称の一致
+            - 'prefix': 正規化した名称の前方一致
+            - 'auto': コード、名称の完全一致、正規化した名称の一致の順に試す
+
+        `level` : int or iterable of int, optional
+            階層レベル。指定した場合はそのレベルのコードだけを返します。
+
+        Returns
+        -------
+        codes : list of str
+        """
+        index = self._dim(dim)
+        if match == "exact":
+            codes = index.exact.get(label, [])
+        elif match == "normalized":
+            codes = index.normalized.get(normalize_label(label), [])
+        elif match == "prefix":
+            codes = index.prefix(label)
+        elif match == "auto":
+            if label in index.positions:
+                codes = [label]
+            else:
+                codes = index.exact.get(label) or index.normalized.get(
+                    normalize_label(label), []
+                )
+        else:
+            raise ValueError(f"Unknown match: {match}")
+
+        if level is not None:
+            levels = {level} if isinstance(level, int) else set(level)
+            codes = [c for c in codes if index.levels[c] in levels]
+        return list(codes)
+
+    def resolve(self, dim: str, value: str, level: int | None = None) -> str:
+        """
+        コードまたは名称を一つのコードに解決します。
+
+        同じ名称の項目が複数ある場合は、メタ情報で最初の項目のコードを返します。
+        """
+        codes = self.lookup(dim, value, level=level)
+        if not codes:
+            raise ValueError(f"{value} is neither a code nor a name of {dim}.")
+        return codes[0]
+
+
+_INDEXES: dict[tuple, tuple[dict, LookupIndex]] = {}
+_LOCK = threading.Lock()
+
+
+def lookup_index(statsDataId: str, lang: str = "J") -> LookupIndex:
+    """
+    統計表のメタ情報から、名称からコードを引く索引を作成します。
+
+    メタ情報と索引はプロセス内でキャッシュされ、メタ情報のキャッシュが更新された場合は作り直されます。
+
+    Parameters
+    ----------
+    `statsDataId` : str
+        統計表ID。
+
+    `lang` : str, default 'J'
+        言語。
+
+    Returns
+    -------
+    index : LookupIndex
+    """
+    metadata = _metadata.get_metadata(statsDataId, lang=lang)
+    key = (statsDataId, lang)
+    with _LOCK:
+        cached = _INDEXES.get(key)
+    # the metadata cache returns the same object until it is invalidated
+    if cached is not None and cached[0] is metadata:
+        return cached[1]
+    index = LookupIndex(metadata["CLASS_OBJ"])
+    with _LOCK:
+        _INDEXES[key] = (metadata, index)
+    return index
@@ -0,0 +1,206 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+from estatapi import _functions, _instrument, _json, _util
+
+
+def normalize_class_objs(class_inf: dict) -> list[dict]:
+    """Normalize CLASS_OBJ so that it is a list and each CLASS is a list."""
+    class_objs = class_inf["CLASS_OBJ"]
+    if isinstance(class_objs, dict):
+        class_objs = [class_objs]
+    return [
+        {
+            **obj,
+            "CLASS": obj["CLASS"] if isinstance(obj["CLASS"], list) else [obj["CLASS"]],
+        }
+        for obj in class_objs
+    ]
+
+
+_CACHE: dict[tuple, dict] = {}
+_LOCK = threading.Lock()
+
+
+class _SharedCache:
+    """
+    Metadata shared by processes through a SQLite file.
+
+    WAL mode lets processes read while another one writes,
+    and the busy timeout makes concurrent writers wait for each other.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.seen_generation = None
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "stats_data_id TEXT, lang TEXT, explanation TEXT, "
+                "updated_date TEXT, fetched_at REAL, json TEXT, "
+                "PRIMARY KEY (stats_data_id, lang, explanation))"
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT json FROM metadata "
+                "WHERE stats_data_id = ? AND lang = ? AND explanation = ?",
+                key,
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key: tuple, metadata: dict):
+        updated_date = metadata["TABLE_INF"].get("UPDATED_DATE")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    *key,
+                    updated_date,
+                    time.time(),
+                    json.dumps(metadata, ensure_ascii=False),
+                ),
+            )
+
+    def generation(self) -> int:
+        """Incremented whenever entries are invalidated by any process."""
+        with self._lock:
+            return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def invalidate(self, updated_dates: dict[str, str | None]) -> int:
+        """Delete entries whose UPDATED_DATE differs. Returns the number of deleted rows."""
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM metadata WHERE stats_data_id = ? "
+                "AND updated_date IS NOT ?",
+                [(k, v) for k, v in updated_dates.items()],
+            )
+            count = cursor.rowcount
+            if count:
+                # tell the other processes to drop their in-process caches
+                generation = self._conn.execute("PRAGMA user_version").fetchone()[0]
+                self._conn.execute(f"PRAGMA user_version = {generation + 1}")
+            return count
+
+
+_SHARED: _SharedCache | None = None
+
+
+def set_metadata_cache(path: str | None = None, timeout: float = 30.0):
+    """
+    メタ情報をプロセス間で共有するキャッシュ（SQLiteのファイル）を設定します。
+
+    設定すると、`get_metadata` を使う処理（クエリビルダーやpolarsなど）は、
+    いずれかのプロセスが取得したメタ情報を共有し、同じ統計表のメタ情報を取得し直しません。
+    `None` を渡すと共有をやめます。
+
+    Parameters
+    ----------
+    `path` : str, optional
+        キャッシュのファイルのパス。
+
+    `timeout` : float, default 30.0
+        他のプロセスが書き込み中の場合に待つ秒数。
+    """
+    global _SHARED
+    if _SHARED is not None:
+        _SHARED.close()
+    _SHARED = None if path is None else _SharedCache(path, timeout=timeout)
+
+
+def get_metadata(
+    statsDataId: str, lang: str = "J", explanationGetFlg: str = "N"
+) -> dict:
+    """
+    Return the parsed metadata of a table, fetching it only once per process
+    (or once per host with `set_metadata_cache`).
+
+    The returned dict has "CLASS_OBJ" (normalized) and "TABLE_INF".
+    """
+    key = (statsDataId, lang, explanationGetFlg)
+    if _SHARED is not None:
+        generation = _SHARED.generation()
+        if generation != _SHARED.seen_generation:
+            clear_metadata_cache()
+            _SHARED.seen_generation = generation
+    with _LOCK:
+        metadata = _CACHE.get(key)
+    if metadata is None and _SHARED is not None:
+        metadata = _SHARED.get(key)
+        if metadata is not None:
+            with _LOCK:
+                _CACHE[key] = metadata
+    _instrument.emit("cache", hit=metadata is not None, name="metadata")
+    if metadata is not None:
+        return metadata
+
+    response = _functions.get_meta_info(
+        statsDataId=statsDataId, explanationGetFlg=explanationGetFlg, lang=lang
+    )
+    root = _json.response_json(response)["GET_META_INFO"]
+    metadata_inf = _util._check_status(root, "METADATA_INF")
+    metadata = {
+        "CLASS_OBJ": normalize_class_objs(metadata_inf["CLASS_INF"]),
+        "TABLE_INF": metadata_inf.get("TABLE_INF", {}),
+    }
+    with _LOCK:
+        _CACHE[key] = metadata
+    if _SHARED is not None:
+        _SHARED.put(key, metadata)
+    return metadata
+
+
+def _iter_tables(tables: dict | Iterable[dict]) -> Iterable[dict]:
+    """TABLE_INF records from listing responses or from the records themselves."""
+    for item in [tables] if isinstance(tables, dict) else tables:
+        if "GET_STATS_LIST" not in item:
+            yield item
+            continue
+        table_inf = item["GET_STATS_LIST"].get("DATALIST_INF", {}).get("TABLE_INF", [])
+        yield from [table_inf] if isinstance(table_inf, dict) else table_inf
+
+
+def invalidate_metadata(tables: dict | Iterable[dict]) -> int:
+    """
+    統計表の更新日（UPDATED_DATE）が変わった統計表のメタ情報を、キャッシュから削除します。
+
+    Parameters
+    ----------
+    `tables` : dict or iterable of dict
+        `get_stats_list` で取得したJSON（のイテレータ）、または統計表情報（TABLE_INF）のレコード。
+        `CatalogStore.iter_tables` の結果も渡せます。
+
+    Returns
+    -------
+    count : int
+        削除したメタ情報の数。
+    """
+    updated_dates = {
+        table["@id"]: table.get("UPDATED_DATE") for table in _iter_tables(tables)
+    }
+    count = 0
+    with _LOCK:
+        for key in list(_CACHE):
+            if key[0] in updated_dates and (
+                _CACHE[key]["TABLE_INF"].get("UPDATED_DATE") != updated_dates[key[0]]
+            ):
+                del _CACHE[key]
+                count += 1
+    if _SHARED is not None:
+        count = max(count, _SHARED.invalidate(updated_dates))
+    return count
+
+
+def clear_metadata_cache():
+    with _LOCK:
+        _CACHE.clear()
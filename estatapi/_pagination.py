@@ -0,0 +1,201 @@
+import copy
+import hashlib
+import json
+import re
+from typing import Iterable, Iterator
+
+import requests
+
+from estatapi import _appid, _functions, _json, _util
+
+
+def _statistical_data(json_data: dict) -> dict:
+    """Return STATISTICAL_DATA of a getStatsData response or raise the API error."""
+    if not isinstance(json_data, dict) or "GET_STATS_DATA" not in json_data:
+        raise ValueError("The response is not a response of getStatsData.")
+    return _util._check_status(json_data["GET_STATS_DATA"], "STATISTICAL_DATA")
+
+
+def _next_key(json_data: dict) -> int | None:
+    next_key = _statistical_data(json_data).get("RESULT_INF", {}).get("NEXT_KEY")
+    return None if next_key is None else int(next_key)
+
+
+def _count(**kwargs) -> tuple[int, str | None]:
+    """
+    Send a count-only request (cntGetFlg=Y) for the query of `kwargs`.
+    Return TOTAL_NUMBER and UPDATED_DATE of the table.
+    """
+    params = {
+        k: v
+        for k, v in kwargs.items()
+        if v is not None
+        and k not in ("startPosition", "limit", "cntGetFlg", "metaGetFlg")
+    }
+    response = _functions.get_stats_data(cntGetFlg="Y", metaGetFlg="N", **params)
+    _util._check_http_status(response)
+    stats_data = _statistical_data(_json.response_json(response))
+    total = int(stats_data.get("RESULT_INF", {}).get("TOTAL_NUMBER", 0))
+    return total, stats_data.get("TABLE_INF", {}).get("UPDATED_DATE")
+
+
+_RESULT_INF_PATTERN = re.compile(rb'"RESULT_INF"\s*:\s*\{')
+_NEXT_KEY_PATTERN = re.compile(rb'"NEXT_KEY"\s*:\s*"?(\d+)')
+
+
+def _peek_next_key(content: bytes) -> int | None:
+    """
+    Find NEXT_KEY in the raw response without decoding it.
+    RESULT_INF is a flat object which comes before the large sections.
+    """
+    match = _RESULT_INF_PATTERN.search(content)
+    if match is None:
+        return None
+    end = content.find(b"}", match.end())
+    next_key = _NEXT_KEY_PATTERN.search(content, match.end(), end)
+    return None if next_key is None else int(next_key.group(1))
+
+
+# the API returns up to 100,000 rows per request
+_MAX_LIMIT = 100000
+
+# RESULT.STATUS 0-2 are successes (1: no data, 2: a partial result)
+_MAX_SUCCESS_STATUS = 2
+
+
+def _carry_class_inf(stats_data: dict, class_inf: dict | None) -> dict | None:
+    """
+    Copy CLASS_INF of the first page into the pages requested with metaGetFlg=N.
+    Return CLASS_INF to carry to the next page.
+    """
+    if "CLASS_INF" in stats_data:
+        return stats_data["CLASS_INF"]
+    if class_inf is not None:
+        stats_data["CLASS_INF"] = class_inf
+    return class_inf
+
+
+def _iter_pages(
+    decode: bool = True,
+    reuse_metadata: bool = False,
+    end_position: int | None = None,
+    **kwargs,
+) -> Iterator[tuple[requests.Response, dict | None]]:
+    """
+    Request the pages following NEXT_KEY and yield each response with its JSON.
+
+    Without `decode`, the JSON is None and NEXT_KEY is read from the raw bytes,
+    so that the next page can be requested before the page is decoded.
+    Either way, HTTP and API errors are raised before the page is yielded.
+    With `reuse_metadata`, the pages after the first are requested with
+    metaGetFlg=N unless it is given. `end_position` is the last row to fetch.
+    """
+    params = dict(kwargs)
+    position = params.pop("startPosition", None)
+    limit = params.pop("limit", None)
+
+    while True:
+        if end_position is not None:
+            remaining = end_position - (position or 1) + 1
+            if remaining <= 0:
+                return
+            limit = min(limit or _MAX_LIMIT, remaining)
+        response = _functions.get_stats_data(
+            startPosition=position, limit=limit, **params
+        )
+        _util._check_http_status(response)
+        if decode:
+            json_data = _json.response_json(response)
+            yield response, json_data
+            position = _next_key(json_data)
+        else:
+            status = _appid._result_status(response.content)
+            if status is None or status > _MAX_SUCCESS_STATUS:
+                # an error response is small: decode it to raise the API error
+                _statistical_data(_json.response_json(response))
+            yield response, None
+            position = _peek_next_key(response.content)
+        if position is None:
+            return
+
+        if reuse_metadata and "metaGetFlg" not in kwargs:
+            params["metaGetFlg"] = "N"
+
+
+def iter_stats_data(
+    reuse_metadata: bool = False, end_position: int | None = None, **kwargs
+) -> Iterator[dict]:
+    """
+    統計データを<NEXT_KEY>に従ってページごとに取得します。
+
+    引数は `get_stats_data` と同じです。`startPosition` を指定した場合はその位置から取得します。
+    各ページはデコード済みのJSONとして順に返されます。
+
+    Parameters
+    ----------
+    `reuse_metadata` : bool, default False
+        2ページ目以降を `metaGetFlg='N'` で取得し、1ページ目のメタ情報（CLASS_INF）を各ページにコピーするか否か。
+
+    `end_position` : int, optional
+        取得する最後の行の位置。省略時は最後まで取得します。
+
+    `kwargs`
+        `get_stats_data` の引数。
+    """
+    class_inf = None
+    for _, json_data in _iter_pages(
+        reuse_metadata=reuse_metadata, end_position=end_position, **kwargs
+    ):
+        if reuse_metadata:
+            class_inf = _carry_class_inf(_statistical_data(json_data), class_inf)
+        yield json_data
+
+
+def _fingerprint(params: dict) -> str:
+    """Identify a query. appId and empty parameters are excluded."""
+    items = {k: v for k, v in params.items() if v is not None and k != "appId"}
+    text = json.dumps(items, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def merge_stats_data_pages(pages: Iterable[dict]) -> dict:
+    """
+    ページごとに取得した統計データを一つのJSONにまとめます。
+
+    最初のページを基に、全てのページの値（VALUE）を順に連結します。
+    まとめたJSONは `stats_data_to_pandas` などでそのまま扱えます。
+    """
+    merged = None
+    values = []
+    last_result_inf = {}
+
+    for page in pages:
+        stats_data = _statistical_data(page)
+        if merged is None:
+            merged = copy.copy(page)
+            merged["GET_STATS_DATA"] = {
+                **page["GET_STATS_DATA"],
+                "STATISTICAL_DATA": dict(stats_data),
+            }
+        elif "CLASS_INF" in stats_data:
+            merged["GET_STATS_DATA"]["STATISTICAL_DATA"].setdefault(
+                "CLASS_INF", stats_data["CLASS_INF"]
+            )
+        page_values = stats_data.get("DATA_INF", {}).get("VALUE", [])
+        values.extend([page_values] if isinstance(page_values, dict) else page_values)
+        last_result_inf = stats_data.get("RESULT_INF", {})
+
+    if merged is None:
+        raise ValueError("No pages to merge.")
+
+    stats_data = merged["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    result_inf = {
+        k: v for k, v in stats_data.get("RESULT_INF", {}).items() if k != "NEXT_KEY"
+    }
+    if "TO_NUMBER" in last_result_inf:
+        result_inf["TO_NUMBER"] = last_result_inf["TO_NUMBER"]
+    stats_data["RESULT_INF"] = result_inf
+    if "DATA_INF" in stats_data or values:
+        stats_data["DATA_INF"] = {**stats_data.get("DATA_INF", {}), "VALUE": values}
+
+    return merged
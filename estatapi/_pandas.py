@@ -1,7 +1,12 @@
 import dataclasses
+import itertools
+from typing import Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
+from estatapi import _instrument
+
 
 def _get_value_mappers(class_obj):
     value_mappers = {}
@@ -43,7 +48,9 @@ class StatisticalData:
         return metainfo_exists
 
     def get_raw_df(self):
-        df_value = pd.json_normalize(self.json_data["DATA_INF"]["VALUE"])
+        with _instrument.stage("normalize") as attrs:
+            df_value = pd.json_normalize(self.json_data["DATA_INF"]["VALUE"])
+            attrs["rows"] = len(df_value)
         return df_value
 
     def get_column_mapper(self, add_level: bool = True):
@@ -69,25 +76,26 @@ class StatisticalData:
         if not self._metainfo_exists():
             return df
 
-        columns = []
-
-        for col_name in df.columns:
-            columns.append(col_name)
-            if add_level and (
-                (level_mapper := self.get_level_mappers().get(col_name)) is not None
-            ):
-                columns.append(col_name + "_level")
-                # mapping levels
-                df[col_name + "_level"] = df[col_name].map(level_mapper)
-            if (value_mapper := self.get_value_mappers().get(col_name)) is not None:
-                # mapping values
-                df[col_name] = df[col_name].map(value_mapper)
-
-        # reordering columns
-        df = df.reindex(columns=columns)
-
-        # renaming columns
-        df = df.rename(columns=self.get_column_mapper())
+        with _instrument.stage("relabel", rows=len(df)):
+            columns = []
+
+            for col_name in df.columns:
+                columns.append(col_name)
+                if add_level and (
+                    (level_mapper := self.get_level_mappers().get(col_name)) is not None
+                ):
+                    columns.append(col_name + "_level")
+                    # mapping levels
+                    df[col_name + "_level"] = df[col_name].map(level_mapper)
+                if (value_mapper := self.get_value_mappers().get(col_name)) is not None:
+                    # mapping values
+                    df[col_name] = df[col_name].map(value_mapper)
+
+            # reordering columns
+            df = df.reindex(columns=columns)
+
+            # renaming columns
+            df = df.rename(columns=self.get_column_mapper())
         return df
 
 
@@ -96,9 +104,211 @@ def stats_data_to_pandas(stats_data_json: dict, add_level: bool = True) -> pd.Da
     return stats_data.to_df(add_level=add_level)
 
 
-def stats_list_to_pandas(stats_list_json: dict) -> pd.DataFrame:
-    table_inf = stats_list_json["GET_STATS_LIST"]["DATALIST_INF"]["TABLE_INF"]
-    df = pd.json_normalize(table_inf)
+# TABLE_INF of getStatsList
+# - fields holding either a string or {"@attr": ..., "$": ...}, with their attributes
+_TABLE_INF_TEXT_FIELDS = {
+    "STAT_NAME": ["@code"],
+    "GOV_ORG": ["@code"],
+    "TITLE": ["@no"],
+    "MAIN_CATEGORY": ["@code"],
+    "SUB_CATEGORY": ["@code"],
+}
+# - fields holding an object of strings
+_TABLE_INF_STRUCT_FIELDS = {
+    "STATISTICS_NAME_SPEC": [
+        "TABULATION_CATEGORY",
+        *(f"TABULATION_SUB_CATEGORY{i}" for i in range(1, 6)),
+    ],
+    "DESCRIPTION": [
+        "TABULATION_CATEGORY_EXPLANATION",
+        *(f"TABULATION_SUB_CATEGORY_EXPLANATION{i}" for i in range(1, 6)),
+    ],
+    "TITLE_SPEC": [
+        "TABLE_CATEGORY",
+        "TABLE_NAME",
+        "TABLE_EXPLANATION",
+        *(f"TABLE_SUB_CATEGORY{i}" for i in range(1, 4)),
+    ],
+}
+_TABLE_INF_INT_COLUMNS = ["SMALL_AREA", "OVERALL_TOTAL_NUMBER"]
+_TABLE_INF_FIELDS = [
+    "@id",
+    "STAT_NAME",
+    "GOV_ORG",
+    "STATISTICS_NAME",
+    "TITLE",
+    "CYCLE",
+    "SURVEY_DATE",
+    "OPEN_DATE",
+    "SMALL_AREA",
+    "COLLECT_AREA",
+    "MAIN_CATEGORY",
+    "SUB_CATEGORY",
+    "OVERALL_TOTAL_NUMBER",
+    "UPDATED_DATE",
+    "STATISTICS_NAME_SPEC",
+    "DESCRIPTION",
+    "TITLE_SPEC",
+]
+
+
+def _table_inf_columns() -> list[str]:
+    columns = []
+    for field in _TABLE_INF_FIELDS:
+        if field in _TABLE_INF_TEXT_FIELDS:
+            columns += [f"{field}.{attr}" for attr in _TABLE_INF_TEXT_FIELDS[field]]
+            columns.append(f"{field}.$")
+        elif field in _TABLE_INF_STRUCT_FIELDS:
+            columns += [f"{field}.{key}" for key in _TABLE_INF_STRUCT_FIELDS[field]]
+        else:
+            columns.append(field)
+    return columns
+
+
+_TABLE_INF_COLUMNS = _table_inf_columns()
+_TABLE_INF_NESTED_FIELDS = {**_TABLE_INF_TEXT_FIELDS, **_TABLE_INF_STRUCT_FIELDS}
+
+
+def _str(value) -> str | None:
+    return value if value is None or type(value) is str else str(value)
+
+
+def _position(positions: dict[str, int], row: list, column: str) -> int:
+    """Position of a column in `row`. Columns not in the schema are appended."""
+    i = positions.get(column)
+    if i is None:
+        i = positions[column] = len(positions)
+    if i >= len(row):
+        row.extend([None] * (i + 1 - len(row)))
+    return i
+
+
+def _flatten_unknown(prefix: str, value, row: list, positions: dict[str, int]):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten_unknown(f"{prefix}.{key}", item, row, positions)
+    else:
+        row[_position(positions, row, prefix)] = value
+
+
+# position of the columns of nested fields: {field: {key: position}}
+_TABLE_INF_NESTED_POSITIONS = {
+    field: {
+        column[len(field) + 1 :]: i
+        for i, column in enumerate(_TABLE_INF_COLUMNS)
+        if column.startswith(field + ".")
+    }
+    for field in _TABLE_INF_NESTED_FIELDS
+}
+
+
+def _flatten_table_inf(table: dict, row: list, positions: dict[str, int]):
+    """Flatten a TABLE_INF record into `row`, whose items are in the order of `positions`."""
+    for field, value in table.items():
+        nested = _TABLE_INF_NESTED_POSITIONS.get(field)
+        if nested is not None:
+            if type(value) is dict:
+                for key, item in value.items():
+                    i = nested.get(key)
+                    if i is None:
+                        i = _position(positions, row, f"{field}.{key}")
+                    row[i] = item if item is None or type(item) is str else str(item)
+            elif field in _TABLE_INF_TEXT_FIELDS:
+                row[nested["$"]] = _str(value)
+            elif value not in (None, ""):
+                row[_position(positions, row, field)] = _str(value)
+        elif field in _TABLE_INF_INT_COLUMNS:
+            row[positions[field]] = value
+        elif field in positions:
+            row[positions[field]] = _str(value)
+        else:
+            _flatten_unknown(field, value, row, positions)
+
+
+def _datalist_inf(stats_list_json: dict) -> dict:
+    return stats_list_json["GET_STATS_LIST"].get("DATALIST_INF", {})
+
+
+def _iter_records(stats_list_json: dict, key: str) -> Iterator[dict]:
+    records = _datalist_inf(stats_list_json).get(key, [])
+    return iter([records] if isinstance(records, dict) else records)
+
+
+# columns of LIST_INF, the statistics returned with statsNameList=Y
+_LIST_INF_COLUMNS = [
+    "@id",
+    "STAT_NAME.@code",
+    "STAT_NAME.$",
+    "GOV_ORG.@code",
+    "GOV_ORG.$",
+]
+
+
+def _flatten_list_inf(records: Iterable[dict]) -> pd.DataFrame:
+    df = pd.json_normalize(list(records))
+    extra = [c for c in df.columns if c not in _LIST_INF_COLUMNS]
+    return df.reindex(columns=_LIST_INF_COLUMNS + extra)
+
+
+def flatten_table_inf(tables: Iterable[dict]) -> pd.DataFrame:
+    """
+    統計表情報（TABLE_INF）のレコードを、決まった列を持つデータフレームに変換します。
+
+    名称とコードを持つ項目（例: `TITLE`）は、文字列の場合も `TITLE.$` 列になります。
+    `SMALL_AREA` と `OVERALL_TOTAL_NUMBER` は整数（`Int64`）、その他の列は文字列です。
+    スキーマにない項目は末尾の列になります。
+    レコードは一度だけ順に読まれるため、ページごとに取得したレコードのイテレータも渡せます。
+    """
+    positions = {column: i for i, column in enumerate(_TABLE_INF_COLUMNS)}
+    n_columns = len(positions)
+    rows = []
+    for table in tables:
+        row = [None] * n_columns
+        _flatten_table_inf(table, row, positions)
+        rows.append(row)
+
+    # rows before a column not in the schema appeared are shorter
+    n_columns = len(positions)
+    for row in rows:
+        if len(row) < n_columns:
+            row.extend([None] * (n_columns - len(row)))
+
+    array = np.empty((len(rows), n_columns), dtype=object)
+    if rows:
+        array[:] = rows
+    df = pd.DataFrame(array, columns=list(positions))
+    for column in _TABLE_INF_INT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    return df
+
+
+def stats_list_to_pandas(stats_list_json: dict | Iterable[dict]) -> pd.DataFrame:
+    """
+    統計表情報取得のJSONをpandasデータフレームに変換します。
+
+    ページごとに取得したJSONのイテレータを渡すと、順に読みながら一つのデータフレームにまとめます。
+    列については `flatten_table_inf` を参照してください。
+    `statsNameList='Y'` で取得した統計調査の一覧（LIST_INF）は、
+    `@id`, `STAT_NAME.@code`, `STAT_NAME.$`, `GOV_ORG.@code`, `GOV_ORG.$` の列になります。
+    """
+    pages = iter(
+        [stats_list_json] if isinstance(stats_list_json, dict) else stats_list_json
+    )
+    first = next(pages, None)
+    if first is None:
+        return flatten_table_inf([])
+    pages = itertools.chain([first], pages)
+
+    with _instrument.stage("normalize") as attrs:
+        if "LIST_INF" in _datalist_inf(first):
+            df = _flatten_list_inf(
+                record for page in pages for record in _iter_records(page, "LIST_INF")
+            )
+        else:
+            df = flatten_table_inf(
+                table for page in pages for table in _iter_records(page, "TABLE_INF")
+            )
+        attrs["rows"] = len(df)
     return df
 
 
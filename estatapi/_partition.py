@@ -0,0 +1,251 @@
+import dataclasses
+import json
+import math
+from typing import Iterable, Literal
+
+from estatapi import _json, _metadata, _pagination, _util
+from estatapi._query import _param_name
+
+
+@dataclasses.dataclass
+class Partition:
+    """
+    分割された統計データ取得の一部分。
+
+    `to_dict` / `from_dict` でJSONに変換でき、どのワーカーでも `run_partition` で実行できます。
+    """
+
+    plan: str
+    index: int
+    count: int
+    kind: Literal["position", "code"]
+    params: dict
+    rows: int
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Partition":
+        return cls(**data)
+
+
+def _total_number(params: dict) -> int:
+    total, _ = _pagination._count(**params)
+    return max(total - (params.get("startPosition") or 1) + 1, 0)
+
+
+def _split(n: int, partitions: int) -> list[tuple[int, int]]:
+    """Split range(n) into contiguous (start, stop) chunks of almost equal size."""
+    partitions = max(min(partitions, n), 1)
+    bounds = [n * i // partitions for i in range(partitions + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def partition_stats_data(
+    partitions: int | None = None,
+    rows: int | None = None,
+    by: str = "position",
+    **kwargs,
+) -> list[Partition]:
+    """
+    統計データ取得を、独立に実行できる複数の部分に分割します。
+
+    件数のみのリクエスト（`cntGetFlg='Y'`）で件数を確認し、
+    取得開始位置の範囲（`by='position'`）か、ある事項のコードの範囲（例: `by='area'` の場合は `cdAreaFrom` / `cdAreaTo`）で分割します。
+    各部分は `Partition.to_dict` でJSONにして他のマシンに渡し、`run_partition` で実行できます。
+    結果は `merge_partitions` で一つにまとめます。
+
+    Parameters
+    ----------
+    `partitions` : int, optional
+        分割数。
+
+    `rows` : int, optional
+        1つの部分の件数の目安。`partitions` の代わりに指定します。
+
+    `by` : str, default 'position'
+        'position' または分割に使う事項のID（'area', 'time', 'cat01' など）。
+        事項で分割する場合、件数は各部分のコードの数に比例すると見積もります。
+
+    `kwargs`
+        `get_stats_data` の引数。
+
+    Returns
+    -------
+    partitions : list of Partition
+    """
+    if (partitions is None) == (rows is None):
+        raise ValueError("Only one of partitions and rows must be specified.")
+
+    params = {k: v for k, v in kwargs.items() if v is not None}
+    plan = _pagination._fingerprint({**params, "by": by})
+    total = _total_number(params)
+    if partitions is None:
+        partitions = max(math.ceil(total / rows), 1)
+
+    if by == "position":
+        first = params.pop("startPosition", None) or 1
+        chunks = _split(total, partitions)
+        result = []
+        for index, (start, stop) in enumerate(chunks):
+            partition_params = {
+                **params,
+                "startPosition": first + start,
+                "limit": stop - start,
+            }
+            # the metadata is the same in every partition
+            if index > 0:
+                partition_params["metaGetFlg"] = "N"
+            result.append(
+                Partition(plan, index, len(chunks), by, partition_params, stop - start)
+            )
+        return result
+
+    dim = by.lstrip("@")
+    name = _param_name(dim)
+    filters = ("lv" + name, "cd" + name, "cd" + name + "From", "cd" + name + "To")
+    if any(k in params for k in filters):
+        raise ValueError(f"{dim} is already filtered and cannot be partitioned.")
+    if "statsDataId" not in params:
+        raise ValueError("statsDataId is required to partition by codes.")
+
+    metadata = _metadata.get_metadata(
+        params["statsDataId"], lang=params.get("lang", "J")
+    )
+    classes = [obj["CLASS"] for obj in metadata["CLASS_OBJ"] if obj["@id"] == dim]
+    if not classes:
+        raise ValueError(f"{dim} is not a dimension of {params['statsDataId']}.")
+    codes = sorted({c["@code"] for c in classes[0]})
+
+    chunks = _split(len(codes), partitions)
+    return [
+        Partition(
+            plan,
+            index,
+            len(chunks),
+            "code",
+            {
+                **params,
+                "cd" + name + "From": codes[start],
+                "cd" + name + "To": codes[stop - 1],
+            },
+            round(total * (stop - start) / len(codes)),
+        )
+        for index, (start, stop) in enumerate(chunks)
+    ]
+
+
+def run_partition(partition: Partition | dict, path: str | None = None) -> dict:
+    """
+    分割された統計データ取得の一部分を実行します。
+
+    Parameters
+    ----------
+    `partition` : Partition or dict
+        `partition_stats_data` が返す部分、またはそれを `to_dict` で変換したもの。
+
+    `path` : str, optional
+        結果をJSONとして保存するパス。
+
+    Returns
+    -------
+    json_data : dict
+        部分の統計データのJSON。`merge_partitions` のために、部分の情報が `PARTITION` として追加されます。
+    """
+    if isinstance(partition, dict):
+        partition = Partition.from_dict(partition)
+
+    params = dict(partition.params)
+    end_position = None
+    if partition.kind == "position":
+        end_position = params["startPosition"] + params.pop("limit") - 1
+    pages = list(
+        _pagination.iter_stats_data(
+            reuse_metadata=True, end_position=end_position, **params
+        )
+    )
+    if not pages:
+        # no rows to fetch: keep the table information
+        params.pop("startPosition")
+        pages = list(_pagination.iter_stats_data(end_position=1, **params))
+        for page in pages:
+            _pagination._statistical_data(page).pop("DATA_INF", None)
+
+    output = _pagination.merge_stats_data_pages(pages)
+    output["PARTITION"] = partition.to_dict()
+    if path is not None:
+        _util._write_atomic(path, json.dumps(output, ensure_ascii=False).encode())
+    return output
+
+
+def _merge_class_inf(class_infs: list[dict]) -> dict:
+    """Union of the classes of each CLASS_OBJ, in the order of appearance."""
+    objs = {}
+    for class_inf in class_infs:
+        for obj in _metadata.normalize_class_objs(class_inf):
+            merged = objs.setdefault(obj["@id"], {**obj, "CLASS": []})
+            known = {c["@code"] for c in merged["CLASS"]}
+            merged["CLASS"].extend(c for c in obj["CLASS"] if c["@code"] not in known)
+    return {"CLASS_OBJ": list(objs.values())}
+
+
+def merge_partitions(outputs: Iterable[dict | str]) -> dict:
+    """
+    `run_partition` の結果を一つの統計データのJSONにまとめます。
+
+    結果は渡された順序によらず部分の順に連結されます。
+    部分の欠けや重複、統計表の更新日（UPDATED_DATE）の違いがある場合はエラーになります。
+
+    Parameters
+    ----------
+    `outputs` : iterable of dict or str
+        `run_partition` の結果、またはそれを保存したファイルのパス。
+
+    Returns
+    -------
+    json_data : dict
+    """
+    loaded = []
+    for output in outputs:
+        if isinstance(output, str):
+            with open(output, "rb") as f:
+                output = _json.loads(f.read())
+        loaded.append(output)
+    if not loaded:
+        raise ValueError("No partitions to merge.")
+
+    partitions = [Partition.from_dict(output["PARTITION"]) for output in loaded]
+    plans = {p.plan for p in partitions}
+    if len(plans) > 1:
+        raise ValueError("Partitions of different plans cannot be merged.")
+    indices = sorted(p.index for p in partitions)
+    if indices != list(range(partitions[0].count)):
+        missing = sorted(set(range(partitions[0].count)) - set(indices))
+        raise ValueError(f"Partitions are missing or duplicated: missing={missing}")
+
+    ordered = sorted(loaded, key=lambda output: output["PARTITION"]["index"])
+    stats_data = [_pagination._statistical_data(output) for output in ordered]
+    updated_dates = {s.get("TABLE_INF", {}).get("UPDATED_DATE") for s in stats_data}
+    if len(updated_dates) > 1:
+        raise ValueError(
+            f"The table was updated while running the partitions: {sorted(updated_dates)}"
+        )
+
+    pages = [
+        {k: v for k, v in output.items() if k != "PARTITION"} for output in ordered
+    ]
+    merged = _pagination.merge_stats_data_pages(pages)
+
+    merged_stats_data = merged["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    class_infs = [s["CLASS_INF"] for s in stats_data if "CLASS_INF" in s]
+    if class_infs:
+        merged_stats_data["CLASS_INF"] = _merge_class_inf(class_infs)
+    n = len(merged_stats_data.get("DATA_INF", {}).get("VALUE", []))
+    merged_stats_data["RESULT_INF"] = {
+        **merged_stats_data.get("RESULT_INF", {}),
+        "TOTAL_NUMBER": n,
+        "FROM_NUMBER": 1 if n else 0,
+        "TO_NUMBER": n,
+    }
+    return merged
@@ -0,0 +1,250 @@
+import dataclasses
+import queue
+import threading
+import time
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from estatapi import _json, _pagination
+from estatapi._pandas import stats_data_to_pandas
+
+# interval to check whether the pipeline was closed while waiting on a queue
+_POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+@dataclasses.dataclass
+class _Failure:
+    exception: BaseException
+
+
+@dataclasses.dataclass
+class PipelineStageStats:
+    """
+    パイプラインの段階ごとの処理量。
+
+    `busy` は処理にかかった時間、`blocked` は次の段階のキューが空くのを待った時間（秒）です。
+    """
+
+    items: int = 0
+    busy: float = 0.0
+    blocked: float = 0.0
+    bytes: int = 0
+    rows: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.busy if self.busy else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.busy if self.busy else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.busy if self.busy else 0.0
+
+
+class StatsDataPipeline:
+    """
+    統計データをページごとに取得・デコード・変換するパイプライン。
+
+    取得、JSONのデコード、DataFrameへの変換はそれぞれ別のスレッドで実行されるため、
+    ページNをデコード・変換している間にページN+1を取得できます。
+    段階の間は大きさ `queue_size` のキューで繋がれており、後の段階が遅い場合は前の段階が待機します。
+    イテレートすると、ページごとのDataFrameが順に返されます。
+
+    `pipeline_stats_data` で作成します。
+    """
+
+    STAGES = ("fetch", "decode", "convert")
+
+    def __init__(self, add_level: bool = True, queue_size: int = 2, **kwargs):
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive.")
+        self.add_level = add_level
+        self.queue_size = queue_size
+        self.params = kwargs
+        self.stats = {stage: PipelineStageStats() for stage in self.STAGES}
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._started = False
+
+    def _put(self, q: queue.Queue, item, stats: PipelineStageStats) -> bool:
+        """Put an item, waiting while the queue is full. False if closed."""
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    q.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        finally:
+            stats.blocked += time.perf_counter() - start
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _fetch(self, output: queue.Queue):
+        stats = self.stats["fetch"]
+        # the next page is requested without waiting for the decoding
+        pages = _pagination._iter_pages(
+            decode=False, reuse_metadata=True, **self.params
+        )
+        try:
+            start = time.perf_counter()
+            for response, _ in pages:
+                content = response.content
+                stats.busy += time.perf_counter() - start
+                stats.items += 1
+                stats.bytes += len(content)
+                if not self._put(output, content, stats):
+                    return
+                start = time.perf_counter()
+        except Exception as e:
+            self._put(output, _Failure(e), stats)
+            return
+        self._put(output, _DONE, stats)
+
+    def _transform(
+        self,
+        stage: str,
+        func: Callable,
+        input: queue.Queue,
+        output: queue.Queue,
+    ):
+        stats = self.stats[stage]
+        while True:
+            item = self._get(input)
+            if item is _DONE or isinstance(item, _Failure):
+                self._put(output, item, stats)
+                return
+            start = time.perf_counter()
+            try:
+                result = func(item)
+            except Exception as e:
+                self._put(output, _Failure(e), stats)
+                return
+            finally:
+                stats.busy += time.perf_counter() - start
+            stats.items += 1
+            if not self._put(output, result, stats):
+                return
+
+    def _decoder(self) -> Callable[[bytes], dict]:
+        class_inf = None
+
+        def decode(content: bytes) -> dict:
+            nonlocal class_inf
+            page = _json.loads(content)
+            self.stats["decode"].bytes += len(content)
+            class_inf = _pagination._carry_class_inf(
+                _pagination._statistical_data(page), class_inf
+            )
+            return page
+
+        return decode
+
+    def _convert(self, page: dict) -> pd.DataFrame:
+        df = stats_data_to_pandas(page, add_level=self.add_level)
+        self.stats["convert"].rows += len(df)
+        return df
+
+    def _start(self) -> queue.Queue:
+        if self._started:
+            raise RuntimeError("The pipeline can be iterated only once.")
+        self._started = True
+        fetched, decoded, converted = (
+            queue.Queue(self.queue_size) for _ in range(len(self.STAGES))
+        )
+        targets = [
+            (self._fetch, (fetched,)),
+            (self._transform, ("decode", self._decoder(), fetched, decoded)),
+            (self._transform, ("convert", self._convert, decoded, converted)),
+        ]
+        for stage, (target, args) in zip(self.STAGES, targets):
+            thread = threading.Thread(
+                target=target, args=args, name=f"estatapi-{stage}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return converted
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        converted = self._start()
+        try:
+            while True:
+                item = self._get(converted)
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.exception
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """パイプラインを停止し、スレッドの終了を待ちます。"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def to_pandas(self) -> pd.DataFrame:
+        """全てのページを取得し、一つのDataFrameにまとめます。"""
+        return pd.concat(list(self), ignore_index=True)
+
+    def summary(self) -> dict:
+        """段階ごとの処理量とスループット（件/秒、バイト/秒、行/秒）。"""
+        return {
+            stage: {
+                **dataclasses.asdict(stats),
+                "items_per_second": stats.items_per_second,
+                "bytes_per_second": stats.bytes_per_second,
+                "rows_per_second": stats.rows_per_second,
+            }
+            for stage, stats in self.stats.items()
+        }
+
+
+def pipeline_stats_data(
+    add_level: bool = True, queue_size: int = 2, **kwargs
+) -> StatsDataPipeline:
+    """
+    統計データを、取得・デコード・変換を並行に行うパイプラインで取得します。
+
+    ページN+1の取得と、ページNのデコード・DataFrameへの変換が同時に行われます。
+    段階間のキューの大きさは `queue_size` に制限され、変換が追いつかない場合は取得が待機するため、
+    メモリ上に保持されるページ数は一定に抑えられます。
+    段階ごとのスループットは `StatsDataPipeline.summary` で確認できます。
+
+    Parameters
+    ----------
+    `add_level` : bool, default True
+        `stats_data_to_pandas` の `add_level`。
+
+    `queue_size` : int, default 2
+        段階間のキューに保持するページ数の上限。
+
+    `kwargs`
+        `get_stats_data` の引数。2ページ目以降は `metaGetFlg='N'` で取得し、1ページ目のメタ情報を使います。
+
+    Returns
+    -------
+    pipeline : StatsDataPipeline
+
+    Examples
+    --------
+    >>> pipeline = estatapi.pipeline_stats_data(statsDataId="0003433219", limit=10000)
+    >>> df = pipeline.to_pandas()
+    >>> pipeline.summary()
+    """
+    return StatsDataPipeline(add_level=add_level, queue_size=queue_size, **kwargs)
@@ -0,0 +1,140 @@
+import dataclasses
+import json
+import math
+import time
+
+from estatapi import _metadata, _pagination
+
+# the API returns up to 100,000 rows when limit is omitted
+DEFAULT_LIMIT = 100000
+
+# used when the metadata is not available (e.g. dataSetId)
+_DEFAULT_BYTES_PER_ROW = 120
+
+
+def _bytes_per_row(class_objs: list[dict]) -> float:
+    """
+    Estimate the size of one VALUE record from the codes in the metadata.
+    e.g. {"@tab":"020","@cat01":"000","@area":"00000","@unit":"人","$":"117060396"},
+    """
+    size = 2 + 12  # braces, comma and the value
+    for obj in class_objs:
+        classes = obj["CLASS"]
+        code_length = sum(len(c["@code"]) for c in classes) / len(classes)
+        size += len(obj["@id"]) + code_length + 7
+    units = [c["@unit"] for obj in class_objs for c in obj["CLASS"] if "@unit" in c]
+    if units:
+        size += sum(len(u.encode("utf-8")) for u in units) / len(units) + 11
+    return size
+
+
+@dataclasses.dataclass
+class StatsDataPlan:
+    """
+    統計データ取得の見積もり。
+
+    `dataclasses.replace` で `limit` や `concurrency` を変えると、
+    リクエストをやり直さずに見積もりを再計算できます。
+    """
+
+    rows: int
+    limit: int
+    concurrency: int
+    bytes_per_row: float
+    meta_bytes: int
+    latency: float
+    bandwidth: float
+
+    @property
+    def pages(self) -> int:
+        return math.ceil(self.rows / self.limit)
+
+    @property
+    def estimated_bytes(self) -> int:
+        return int(self.rows * self.bytes_per_row + self.pages * self.meta_bytes)
+
+    @property
+    def estimated_seconds(self) -> float:
+        if self.pages == 0:
+            return 0.0
+        page_seconds = self.latency + self.estimated_bytes / self.pages / self.bandwidth
+        return math.ceil(self.pages / self.concurrency) * page_seconds
+
+    def explain(self) -> str:
+        return "\n".join(
+            [
+                f"rows: {self.rows:,}",
+                f"pages: {self.pages:,} (limit={self.limit:,})",
+                f"estimated bytes: {self.estimated_bytes:,}"
+                f" ({self.bytes_per_row:.0f} bytes/row"
+                f" + {self.meta_bytes:,} bytes of metadata/page)",
+                f"estimated time: {self.estimated_seconds:.1f} s"
+                f" (concurrency={self.concurrency},"
+                f" latency={self.latency:.2f} s,"
+                f" bandwidth={self.bandwidth / 1e6:.1f} MB/s)",
+            ]
+        )
+
+
+def plan_stats_data(
+    limit: int | None = None,
+    concurrency: int = 1,
+    bandwidth: float = 5e6,
+    **kwargs,
+) -> StatsDataPlan:
+    """
+    統計データ取得の件数・ページ数・データ量・所要時間を見積もります。
+
+    統計データは取得せず、件数のみのリクエスト（`cntGetFlg='Y'`）と
+    キャッシュされたメタ情報だけを使います。
+
+    Parameters
+    ----------
+    `limit` : int, optional
+        1ページの件数。省略時はAPIの既定値（10万件）です。
+
+    `concurrency` : int, default 1
+        同時に取得するページ数。
+
+    `bandwidth` : float, default 5e6
+        想定する通信速度（バイト/秒）。
+
+    `kwargs`
+        `get_stats_data` の引数。
+
+    Returns
+    -------
+    plan : StatsDataPlan
+    """
+    start = time.perf_counter()
+    total, _ = _pagination._count(**kwargs)
+    latency = time.perf_counter() - start
+
+    rows = max(total - (kwargs.get("startPosition") or 1) + 1, 0)
+
+    bytes_per_row = _DEFAULT_BYTES_PER_ROW
+    meta_bytes = 0
+    if kwargs.get("statsDataId") is not None:
+        metadata = _metadata.get_metadata(
+            kwargs["statsDataId"], lang=kwargs.get("lang", "J")
+        )
+        bytes_per_row = _bytes_per_row(metadata["CLASS_OBJ"])
+        if kwargs.get("metaGetFlg", "Y") == "Y":
+            meta_bytes = len(
+                json.dumps(metadata["CLASS_OBJ"], ensure_ascii=False).encode("utf-8")
+            )
+
+    return StatsDataPlan(
+        rows=rows,
+        limit=DEFAULT_LIMIT if limit is None else limit,
+        concurrency=concurrency,
+        bytes_per_row=bytes_per_row,
+        meta_bytes=meta_bytes,
+        latency=latency,
+        bandwidth=bandwidth,
+    )
+
+
+def explain_stats_data(**kwargs) -> str:
+    """`plan_stats_data` の見積もりを文字列で返します。引数は `plan_stats_data` と同じです。"""
+    return plan_stats_data(**kwargs).explain()
@@ -0,0 +1,282 @@
+import json
+import re
+from typing import Iterator
+
+from estatapi import _metadata, _pagination, _query
+from estatapi._lookup import _level
+from estatapi._pandas import StatisticalData
+
+
+def _import_polars():
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError("polars is required for this function.") from e
+    return pl
+
+
+def _schema(class_objs: list[dict]) -> dict:
+    pl = _import_polars()
+    schema = {}
+    for obj in class_objs:
+        schema[obj["@id"]] = pl.String
+        schema[obj["@id"] + "_name"] = pl.String
+        schema[obj["@id"] + "_level"] = pl.Int64
+    schema["unit"] = pl.String
+    schema["value"] = pl.Float64
+    return schema
+
+
+def _classes_df(obj: dict):
+    """Codes, names and levels of one dimension."""
+    pl = _import_polars()
+    dim = obj["@id"]
+    return pl.DataFrame(
+        {
+            dim: [c["@code"] for c in obj["CLASS"]],
+            dim + "_name": [c.get("@name") for c in obj["CLASS"]],
+            dim + "_level": [c.get("@level") for c in obj["CLASS"]],
+        },
+        schema={dim: pl.String, dim + "_name": pl.String, dim + "_level": pl.String},
+    ).with_columns(pl.col(dim + "_level").cast(pl.Int64, strict=False))
+
+
+def _conjuncts(predicate) -> list:
+    """
+    Split a predicate into the terms combined with AND.
+
+    The serialized form of expressions is internal to polars:
+    if it cannot be read, no term is pushed down.
+    """
+    try:
+        node = json.loads(predicate.meta.serialize(format="json"))
+        is_and = node.get("BinaryExpr", {}).get("op") == "And"
+        operands = predicate.meta.pop() if is_and else None
+    except Exception:
+        return []
+    if is_and:
+        return [t for e in operands for t in _conjuncts(e)]
+    return [predicate]
+
+
+# cdArea, cdCat01From, lvTime, ...
+_DIM_PARAM_PATTERN = re.compile(r"^(cd|lv)([A-Z]\w*?)(From|To)?$")
+
+
+def _dim_params(kwargs: dict) -> dict[str, dict[str, str]]:
+    """Group the `cd*` / `lv*` arguments of the caller by dimension."""
+    grouped = {}
+    for key, value in kwargs.items():
+        match = _DIM_PARAM_PATTERN.match(key)
+        if match is not None and value is not None:
+            name = match.group(2)
+            grouped.setdefault(name[0].lower() + name[1:], {})[key] = str(value)
+    return grouped
+
+
+def _allowed_codes(classes: list[dict], params: dict[str, str]) -> set[str]:
+    """Codes of a dimension selected by `cd*` / `lv*` parameters."""
+    allowed = {c["@code"] for c in classes}
+    for key, value in params.items():
+        if key.startswith("lv"):
+            # '2', '1-3', '-3' or '2-'
+            low, sep, high = value.partition("-")
+            low = int(low) if low else 1
+            high = (int(high) if high else None) if sep else low
+            allowed &= {
+                c["@code"]
+                for c in classes
+                if _level(c) is not None
+                and low <= _level(c)
+                and (high is None or _level(c) <= high)
+            }
+        elif key.endswith("From"):
+            allowed = {c for c in allowed if c >= value}
+        elif key.endswith("To"):
+            allowed = {c for c in allowed if c <= value}
+        else:
+            allowed &= set(value.split(","))
+    return allowed
+
+
+def _pushdown_params(predicate, class_objs: list[dict], kwargs=None) -> dict | None:
+    """
+    Narrow the arguments of `get_stats_data` by the terms of the predicate.
+
+    The terms on a single dimension are compiled to `cd*` / `lv*` parameters:
+    the codes satisfying them are found by filtering the codes of the dimension
+    in the metadata, intersected with the codes the caller's own `cd*` / `lv*`
+    arguments select, which are replaced. The returned parameters may select
+    a superset of the rows; the predicate is applied to the pages anyway.
+    Returns None if no row can satisfy the predicate.
+    """
+    params = dict(kwargs or {})
+    if predicate is None:
+        return params
+
+    caller = _dim_params(params)
+    for obj in class_objs:
+        dim = obj["@id"]
+        columns = {dim, dim + "_name", dim + "_level"}
+        terms = [
+            t
+            for t in _conjuncts(predicate)
+            if set(t.meta.root_names()) and set(t.meta.root_names()) <= columns
+        ]
+        if not terms:
+            continue
+
+        selected = set(_classes_df(obj).filter(*terms)[dim].to_list())
+        if dim in caller:
+            selected &= _allowed_codes(obj["CLASS"], caller[dim])
+            for key in caller[dim]:
+                del params[key]
+        if not selected:
+            return None
+        dim_params, _ = _query._compile_dim(dim, obj["CLASS"], selected)
+        params.update(dim_params)
+
+    return params
+
+
+def _page_to_polars(values: list[dict], class_objs: list[dict], with_columns=None):
+    pl = _import_polars()
+    dims = [obj["@id"] for obj in class_objs]
+
+    df = pl.DataFrame(
+        {
+            **{dim: [v.get("@" + dim) for v in values] for dim in dims},
+            "unit": [v.get("@unit") for v in values],
+            "value": [v.get("$") for v in values],
+        },
+        schema={
+            **{dim: pl.String for dim in dims},
+            "unit": pl.String,
+            "value": pl.String,
+        },
+    ).with_columns(pl.col("value").cast(pl.Float64, strict=False))
+
+    for obj in class_objs:
+        dim = obj["@id"]
+        needed = [
+            c
+            for c in (dim + "_name", dim + "_level")
+            if with_columns is None or c in with_columns
+        ]
+        if needed:
+            df = df.join(
+                _classes_df(obj).select(dim, *needed),
+                on=dim,
+                how="left",
+                maintain_order="left",
+            )
+
+    return df.select([c for c in _schema(class_objs) if c in df.columns])
+
+
+def to_polars(stats_data: StatisticalData | dict):
+    """
+    統計データをpolarsデータフレームに変換します。
+
+    各事項はコード・名称（`<事項ID>_name`）・階層レベル（`<事項ID>_level`）の列になり、
+    値は浮動小数点数（特殊文字はnull）になります。
+
+    Parameters
+    ----------
+    `stats_data` : StatisticalData or dict
+        `StatisticalData` か、`get_stats_data` で取得したJSON。
+    """
+    if isinstance(stats_data, dict):
+        stats_data = StatisticalData(stats_data["GET_STATS_DATA"]["STATISTICAL_DATA"])
+    values = stats_data.json_data["DATA_INF"]["VALUE"]
+    if isinstance(values, dict):
+        values = [values]
+    class_objs = _metadata.normalize_class_objs(stats_data.json_data["CLASS_INF"])
+    return _page_to_polars(values, class_objs)
+
+
+def scan_stats_data(statsDataId: str, lang: str = "J", **kwargs):
+    """
+    統計表をpolarsのLazyFrameとして扱います。
+
+    統計データはクエリの実行時にページごとに取得されます。
+    フィルタ条件のうち一つの事項だけを参照する条件は、メタ情報のコードと照合して
+    `cd*` / `lv*` パラメータに変換され、サーバ側での絞り込みに使われます。
+    `kwargs` に同じ事項の `cd*` / `lv*` を指定した場合は、両方の条件を満たすコードに絞り込みます。
+    列の選択に含まれない名称・階層レベルの列は作成されません。
+
+    Parameters
+    ----------
+    `statsDataId` : str
+        統計表ID。
+
+    `lang` : Literal['J', 'E'], default 'J'
+        取得するデータの言語。
+
+    `kwargs`
+        `get_stats_data` に渡すその他の引数（`limit` など）。
+
+    Examples
+    --------
+    >>> lf = estatapi.scan_stats_data("0003433219", limit=50000)
+    >>> lf.filter(pl.col("area_name") == "東京都").group_by("time").agg(pl.col("value").sum()).collect()
+    """
+    pl = _import_polars()
+    from polars.io.plugins import register_io_source
+
+    # the metadata comes from getMetaInfo, and the frames have no explanations
+    # or annotations: these flags do not change the result
+    kwargs = {
+        k: v
+        for k, v in kwargs.items()
+        if k not in ("metaGetFlg", "explanationGetFlg", "annotationGetFlg")
+    }
+    class_objs = _metadata.get_metadata(statsDataId, lang=lang)["CLASS_OBJ"]
+    schema = _schema(class_objs)
+
+    def source(
+        with_columns: list[str] | None,
+        predicate,
+        n_rows: int | None,
+        batch_size: int | None,
+    ) -> Iterator:
+        params = _pushdown_params(predicate, class_objs, kwargs)
+        if params is None:
+            return
+
+        needed_columns = None
+        if with_columns is not None:
+            needed_columns = set(with_columns)
+            if predicate is not None:
+                needed_columns |= set(predicate.meta.root_names())
+
+        pages = _pagination.iter_stats_data(
+            statsDataId=statsDataId,
+            lang=lang,
+            metaGetFlg="N",
+            explanationGetFlg="N",
+            annotationGetFlg="N",
+            **params,
+        )
+        for page in pages:
+            data_inf = _pagination._statistical_data(page).get("DATA_INF")
+            if data_inf is None:
+                return
+            values = data_inf["VALUE"]
+            df = _page_to_polars(
+                [values] if isinstance(values, dict) else values,
+                class_objs,
+                with_columns=needed_columns,
+            )
+            if predicate is not None:
+                df = df.filter(predicate)
+            if with_columns is not None:
+                df = df.select(with_columns)
+            if n_rows is not None:
+                df = df.head(n_rows)
+                n_rows -= len(df)
+            yield df
+            if n_rows is not None and n_rows <= 0:
+                return
+
+    return register_io_source(source, schema=pl.Schema(schema))
@@ -0,0 +1,230 @@
+import operator
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from estatapi import _lookup, _metadata, _pagination
+from estatapi._lookup import _level
+from estatapi._pandas import stats_data_to_pandas
+
+_LEVEL_OPERATORS = {
+    "eq": operator.eq,
+    "le": operator.le,
+    "lt": operator.lt,
+    "ge": operator.ge,
+    "gt": operator.gt,
+}
+
+
+def _param_name(dim: str) -> str:
+    """'cat01' -> 'Cat01'"""
+    return dim[0].upper() + dim[1:]
+
+
+def _compile_dim(dim: str, classes: list[dict], selected: set[str]) -> tuple:
+    """
+    Compile the selected codes of a dimension into the narrowest parameters.
+
+    Returns the parameters and whether the rows must be filtered afterwards.
+    """
+    codes = [c["@code"] for c in classes]
+    if len(selected) == len(codes):
+        return {}, False
+
+    name = _param_name(dim)
+    ordered = [c for c in codes if c in selected]
+
+    # exactly a range of levels
+    levels = {_level(c) for c in classes if c["@code"] in selected}
+    if None not in levels:
+        low, high = min(levels), max(levels)
+        in_levels = {
+            c["@code"]
+            for c in classes
+            if _level(c) is not None and low <= _level(c) <= high
+        }
+        if in_levels == selected:
+            return {"lv" + name: str(low) if low == high else f"{low}-{high}"}, False
+
+    if len(ordered) == 1:
+        return {"cd" + name: ordered[0]}, False
+
+    # exactly a range of codes
+    low, high = min(ordered), max(ordered)
+    if {c for c in codes if low <= c <= high} == selected:
+        return {"cd" + name + "From": low, "cd" + name + "To": high}, False
+
+    if len(ordered) <= 100:
+        return {"cd" + name: ",".join(ordered)}, False
+
+    # the API accepts up to 100 codes: narrow by range and filter afterwards
+    return {"cd" + name + "From": low, "cd" + name + "To": high}, True
+
+
+class StatsDataQuery:
+    """
+    統計データ取得の絞り込み条件を組み立てるクエリビルダー。
+
+    条件は名称またはコードで指定でき、メタ情報と照合してコードに解決されたうえで、
+    できるだけ少ない行を返す `cd*` / `lv*` パラメータに変換されます。
+    メタ情報はプロセス内でキャッシュされます。
+
+    Examples
+    --------
+    >>> query = (
+    ...     estatapi.query("0003433219")
+    ...     .isin("area", ["東京都", "大阪府"])
+    ...     .between("time", "2015年", "2020年")
+    ...     .level("cat01", le=2)
+    ... )
+    >>> query.params()
+    >>> df = query.to_pandas()
+    """
+
+    def __init__(self, statsDataId: str, lang: str = "J"):
+        self.statsDataId = statsDataId
+        self.lang = lang
+        self._selected: dict[str, set[str]] = {}
+
+    def _classes(self, dim: str) -> list[dict]:
+        dim = dim.lstrip("@")
+        metadata = _metadata.get_metadata(self.statsDataId, lang=self.lang)
+        for obj in metadata["CLASS_OBJ"]:
+            if obj["@id"] == dim:
+                return obj["CLASS"]
+        raise ValueError(f"{dim} is not a dimension of {self.statsDataId}.")
+
+    def _codes(self, dim: str, value: str) -> list[str]:
+        """Resolve a code or a name to the codes of every matching class."""
+        self._classes(dim)
+        index = _lookup.lookup_index(self.statsDataId, lang=self.lang)
+        codes = index.lookup(dim, value)
+        if not codes:
+            raise ValueError(f"{value} is neither a code nor a name of {dim}.")
+        return codes
+
+    def _resolve(self, dim: str, value: str) -> str:
+        """Resolve a code or a name to the first matching code."""
+        return self._codes(dim, value)[0]
+
+    def _narrow(self, dim: str, codes: Iterable[str]) -> "StatsDataQuery":
+        dim = dim.lstrip("@")
+        codes = set(codes)
+        self._selected[dim] = self._selected.get(dim, codes) & codes
+        return self
+
+    def isin(self, dim: str, values: Iterable[str]) -> "StatsDataQuery":
+        """
+        名称またはコードのいずれかに一致する項目に絞り込みます。
+
+        同じ名称の項目が複数ある場合（「その他」など）は、その全てを含めます。
+        """
+        return self._narrow(dim, [c for v in values for c in self._codes(dim, v)])
+
+    def eq(self, dim: str, value: str) -> "StatsDataQuery":
+        """名称またはコードに一致する項目に絞り込みます。"""
+        return self.isin(dim, [value])
+
+    def between(
+        self, dim: str, start: str | None = None, end: str | None = None
+    ) -> "StatsDataQuery":
+        """メタ情報の並び順で `start` から `end` まで（両端を含む）の項目に絞り込みます。"""
+        codes = [c["@code"] for c in self._classes(dim)]
+        i = 0 if start is None else codes.index(self._resolve(dim, start))
+        j = len(codes) - 1 if end is None else codes.index(self._resolve(dim, end))
+        return self._narrow(dim, codes[i : j + 1])
+
+    def level(self, dim: str, **conditions: int) -> "StatsDataQuery":
+        """
+        階層レベルで絞り込みます。
+
+        条件は `eq`, `le`, `lt`, `ge`, `gt` のキーワードで指定します。(例: `level("cat01", le=2)`)
+        """
+        unknown = set(conditions) - set(_LEVEL_OPERATORS)
+        if unknown:
+            raise ValueError(f"Unknown conditions: {sorted(unknown)}")
+
+        codes = [
+            c["@code"]
+            for c in self._classes(dim)
+            if _level(c) is not None
+            and all(
+                _LEVEL_OPERATORS[op](_level(c), value)
+                for op, value in conditions.items()
+            )
+        ]
+        return self._narrow(dim, codes)
+
+    def _compile(self) -> tuple[dict, dict]:
+        params = {}
+        post_filters = {}
+        for dim, selected in self._selected.items():
+            if not selected:
+                raise ValueError(f"No item of {dim} satisfies the conditions.")
+            dim_params, post_filter = _compile_dim(dim, self._classes(dim), selected)
+            params.update(dim_params)
+            if post_filter:
+                post_filters["@" + dim] = selected
+        return params, post_filters
+
+    def params(self) -> dict:
+        """`get_stats_data` に渡すパラメータを返します。"""
+        params, _ = self._compile()
+        return {"statsDataId": self.statsDataId, "lang": self.lang, **params}
+
+    def iter_pages(self, **kwargs) -> Iterator[dict]:
+        """
+        条件に合う統計データをページごとに取得します。
+
+        `kwargs` は `get_stats_data` に渡されます。
+        パラメータだけで絞り込めない条件は、各ページの値に適用されます。
+        """
+        params, post_filters = self._compile()
+        pages = _pagination.iter_stats_data(
+            statsDataId=self.statsDataId, lang=self.lang, **params, **kwargs
+        )
+        for page in pages:
+            if post_filters:
+                page = _filter_page(page, post_filters)
+            yield page
+
+    def fetch(self, **kwargs) -> dict:
+        """条件に合う統計データを全て取得し、一つのJSONにまとめて返します。"""
+        return _pagination.merge_stats_data_pages(self.iter_pages(**kwargs))
+
+    def to_pandas(self, add_level: bool = True, **kwargs) -> pd.DataFrame:
+        """条件に合う統計データを全て取得し、pandasデータフレームに変換します。"""
+        return stats_data_to_pandas(self.fetch(**kwargs), add_level=add_level)
+
+
+def _filter_page(page: dict, post_filters: dict[str, set[str]]) -> dict:
+    stats_data = _pagination._statistical_data(page)
+    if "DATA_INF" not in stats_data:
+        return page
+    values = stats_data["DATA_INF"]["VALUE"]
+    if isinstance(values, dict):
+        values = [values]
+    values = [
+        v
+        for v in values
+        if all(v.get(dim) in codes for dim, codes in post_filters.items())
+    ]
+    return {
+        **page,
+        "GET_STATS_DATA": {
+            **page["GET_STATS_DATA"],
+            "STATISTICAL_DATA": {
+                **stats_data,
+                "DATA_INF": {**stats_data["DATA_INF"], "VALUE": values},
+            },
+        },
+    }
+
+
+def query(statsDataId: str, lang: str = "J") -> StatsDataQuery:
+    """
+    統計データ取得のクエリビルダーを作成します。
+
+    詳しくは `StatsDataQuery` を参照してください。
+    """
+    return StatsDataQuery(statsDataId, lang=lang)
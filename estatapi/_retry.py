@@ -0,0 +1,227 @@
+import dataclasses
+import random
+import threading
+import time
+from typing import Callable, Literal
+
+import requests
+
+from estatapi import _instrument
+from estatapi._appid import _result_status
+from estatapi._transport import RequestsTransport, Transport
+
+# HTTP status codes of errors which may succeed when retried
+TRANSIENT_HTTP_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# RESULT.STATUS of e-Stat
+# - 0-2: success (2 is a partial result)
+# - 100-899: errors of the request, such as an invalid parameter or application ID
+# - 900-: errors of the API system, which may succeed when retried
+_MAX_SUCCESS_STATUS = 2
+_MIN_SYSTEM_ERROR_STATUS = 900
+
+ErrorKind = Literal["success", "transient", "permanent"]
+
+
+def classify_response(response: requests.Response) -> ErrorKind:
+    """
+    レスポンスを成功・一時的なエラー・恒久的なエラーに分類します。
+
+    HTTPのステータスコードと、本文の `RESULT.STATUS` の両方で判定します。
+    e-Stat APIはエラーでもHTTP 200を返すため、本文の `RESULT.STATUS` が100以上であればエラーとし、
+    900以上（システムエラー）は一時的なエラーとします。
+    """
+    if response.status_code in TRANSIENT_HTTP_STATUSES:
+        return "transient"
+    if response.status_code >= 400:
+        return "permanent"
+    status = _result_status(response.content)
+    if status is None or status <= _MAX_SUCCESS_STATUS:
+        return "success"
+    if status >= _MIN_SYSTEM_ERROR_STATUS:
+        return "transient"
+    return "permanent"
+
+
+def classify_exception(exception: BaseException) -> ErrorKind:
+    """接続エラーとタイムアウトは一時的なエラー、その他は恒久的なエラーとします。"""
+    if isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+        return "transient"
+    return "permanent"
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """
+    一時的なエラーの再試行の方針。
+
+    `n` 回目の再試行までの待ち時間は、0から `min(max_backoff, backoff * 2 ** n)` までの一様乱数です。
+    (full jitter) `Retry-After` ヘッダーがある場合はその秒数以上待ちます。
+    """
+
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+
+    def delay(self, attempt: int, response: requests.Response | None = None) -> float:
+        """`attempt` 回目（0から）の再試行までの待ち時間（秒）。"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        retry_after = None if response is None else response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.max_backoff))
+        return delay
+
+
+class CircuitOpenError(RuntimeError):
+    """サーキットブレーカーが開いているため、リクエストを送信しなかったことを表すエラー。"""
+
+
+class CircuitBreaker:
+    """
+    APIの障害時にリクエストを送信せずに失敗させるサーキットブレーカー。
+
+    一時的なエラーが `failure_threshold` 回続くと開き（'open'）、`reset_timeout` 秒の間は
+    全てのリクエストを `CircuitOpenError` で失敗させます。その後は1つのリクエストだけを試しに送信し
+    （'half_open'）、成功すれば閉じ（'closed'）、失敗すれば再び開きます。
+    複数のトランスポートで同じインスタンスを共有できます。
+
+    Parameters
+    ----------
+    `failure_threshold` : int, default 5
+        ブレーカーを開くまでの、連続した一時的なエラーの回数。
+
+    `reset_timeout` : float, default 30.0
+        ブレーカーを開いてから試しに送信するまでの時間（秒）。
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be positive.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> Literal["closed", "open", "half_open"]:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> Literal["closed", "open", "half_open"]:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """リクエストを送信してよいか。'half_open' では1つのリクエストだけを許可します。"""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    _instrument.emit("circuit", state="open")
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        """Give up the probe without a result, such as for a permanent error."""
+        with self._lock:
+            self._probing = False
+
+
+class RetryTransport(Transport):
+    """
+    一時的なエラーを再試行し、障害時はサーキットブレーカーで即座に失敗させるトランスポート。
+
+    HTTPのステータスコードと本文の `RESULT.STATUS` からエラーを分類し（`classify_response`）、
+    一時的なエラーは `policy` に従って指数的に増える待ち時間（ジッター付き）で再試行します。
+    恒久的なエラーは再試行せず、そのままレスポンスを返します。
+    再試行しても一時的なエラーが続く場合は最後のレスポンスを返すか、例外を送出します。
+
+    Parameters
+    ----------
+    `transport` : Transport, optional
+        実際にリクエストを送信するトランスポート。省略時は `requests` を使用します。
+
+    `policy` : RetryPolicy, optional
+        再試行の方針。省略時は `RetryPolicy()` です。
+
+    `breaker` : CircuitBreaker, optional
+        サーキットブレーカー。省略時は `CircuitBreaker()` です。
+
+    Examples
+    --------
+    >>> breaker = estatapi.CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    >>> estatapi.set_transport(
+    ...     estatapi.RetryTransport(policy=estatapi.RetryPolicy(max_retries=5), breaker=breaker)
+    ... )
+    """
+
+    def __init__(
+        self,
+        transport: Transport | None = None,
+        policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.transport = RequestsTransport() if transport is None else transport
+        self.policy = RetryPolicy() if policy is None else policy
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self._sleep = sleep
+
+    def get(self, url: str, params: dict) -> requests.Response:
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    "e-Stat API is unhealthy: "
+                    f"{self.breaker.failures} consecutive transient errors."
+                )
+            response = None
+            try:
+                response = self.transport.get(url=url, params=params)
+            except Exception as e:
+                kind = classify_exception(e)
+                error = e
+            else:
+                kind = classify_response(response)
+                error = None
+
+            if kind != "transient":
+                # a permanent error does not tell the health of the API
+                if kind == "success":
+                    self.breaker.record_success()
+                else:
+                    self.breaker.release()
+                if error is not None:
+                    raise error
+                return response
+
+            self.breaker.record_failure()
+            if attempt >= self.policy.max_retries or self.breaker.state == "open":
+                if error is not None:
+                    raise error
+                return response
+            delay = self.policy.delay(attempt, response)
+            _instrument.emit("retry", attempt=attempt + 1, delay=delay, url=url)
+            self._sleep(delay)
+            attempt += 1
@@ -0,0 +1,294 @@
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+from estatapi._pandas import StatisticalData
+
+# file layout
+# - magic (8 bytes) + version (uint32) + header length (uint64)
+# - header (JSON, UTF-8)
+# - arrays, each aligned to `_ALIGNMENT` bytes
+_MAGIC = b"ESTATSNP"
+_VERSION = 1
+_PREAMBLE = struct.Struct("<8sIQ")
+_ALIGNMENT = 64
+
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    """Smallest signed integer dtype holding codes (-1 means missing)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return np.dtype(dtype).newbyteorder("<")
+    return np.dtype("<i8")
+
+
+def _format_values(values: np.ndarray) -> np.ndarray:
+    """Format floats as e-Stat does: integral values without a decimal point."""
+    out = values.astype(str).astype(object)
+    integral = np.isfinite(values) & (np.floor(values) == values)
+    integral &= np.abs(values) < 2**53
+    out[integral] = values[integral].astype(np.int64).astype(str)
+    return out
+
+
+def _encode_codes(column: list) -> tuple[np.ndarray, list]:
+    codes, categories = pd.factorize(pd.Series(column, dtype=object))
+    return codes.astype(_code_dtype(len(categories))), categories.tolist()
+
+
+def _encode_values(column: list) -> tuple[np.ndarray, np.ndarray, list, dict]:
+    """
+    Encode value strings as floats.
+
+    Returns the floats, the mask (0: number, k > 0: `special[k - 1]`, -1: missing),
+    the special characters and the strings which are not restored by formatting.
+    """
+    strings = pd.Series(column, dtype=object)
+    values = pd.to_numeric(strings, errors="coerce").to_numpy(dtype=np.float64)
+    numeric = ~np.isnan(values)
+
+    mask = np.zeros(len(strings), dtype=np.int8)
+    special_codes, special = pd.factorize(strings[~numeric])
+    mask[~numeric] = np.where(special_codes < 0, -1, special_codes + 1)
+    if len(special) >= np.iinfo(np.int8).max:
+        raise ValueError("Too many kinds of special characters.")
+
+    formatted = _format_values(values[numeric])
+    original = strings[numeric].to_numpy()
+    positions = np.flatnonzero(numeric)[formatted != original]
+    exceptions = {str(i): column[i] for i in positions}
+
+    return values, mask, special.tolist(), exceptions
+
+
+def save_snapshot(stats_data: StatisticalData | dict, path: str):
+    """
+    統計データをバイナリ形式のスナップショットとして保存します。
+
+    各事項のコードは辞書と小さな整数の配列として、値は浮動小数点数の配列と特殊文字のマスクとして、
+    メタ情報は一度だけ保存されます。保存したスナップショットは `load_snapshot` で読み込めます。
+
+    Parameters
+    ----------
+    `stats_data` : StatisticalData or dict
+        `StatisticalData` か、`get_stats_data` で取得したJSON。
+
+    `path` : str
+        保存先。該当するデータがない場合は、0行のスナップショットを保存します。
+    """
+    if isinstance(stats_data, dict):
+        stats_data = StatisticalData(stats_data["GET_STATS_DATA"]["STATISTICAL_DATA"])
+
+    json_data = stats_data.json_data
+    # a response without matching rows has no DATA_INF
+    data_inf = json_data.get("DATA_INF", {})
+    records = data_inf.get("VALUE", [])
+    if isinstance(records, dict):
+        records = [records]
+
+    meta = {k: v for k, v in json_data.items() if k != "DATA_INF"}
+    meta["DATA_INF"] = {k: v for k, v in data_inf.items() if k != "VALUE"}
+
+    # column names in the order of appearance
+    names = list(dict.fromkeys(k for record in records for k in record))
+
+    columns = []
+    arrays = []
+    for name in names:
+        column = [record.get(name) for record in records]
+        if name == "$":
+            values, mask, special, exceptions = _encode_values(column)
+            columns.append(
+                {
+                    "name": name,
+                    "kind": "values",
+                    "special": special,
+                    "exceptions": exceptions,
+                }
+            )
+            arrays.append((values.astype("<f8"), mask))
+        else:
+            codes, categories = _encode_codes(column)
+            columns.append({"name": name, "kind": "codes", "categories": categories})
+            arrays.append((codes,))
+
+    # compute offsets of arrays relative to the start of the data section
+    offset = 0
+    for column, column_arrays in zip(columns, arrays):
+        column["arrays"] = []
+        for array in column_arrays:
+            offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+            column["arrays"].append({"dtype": array.dtype.str, "offset": offset})
+            offset += array.nbytes
+
+    header = json.dumps(
+        {"nrows": len(records), "meta": meta, "columns": columns},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    data_start = -(-(_PREAMBLE.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(header)))
+        f.write(header)
+        for column, column_arrays in zip(columns, arrays):
+            for info, array in zip(column["arrays"], column_arrays):
+                f.seek(data_start + info["offset"])
+                f.write(array.tobytes())
+
+
+class Snapshot:
+    """
+    `save_snapshot` で保存したスナップショット。
+
+    列はアクセスされた時点で読み込まれます。
+    `mmap=True` の場合、配列はファイルをメモリマップしたものになります。
+    """
+
+    def __init__(self, path: str, mmap: bool = True):
+        self.path = path
+
+        with open(path, "rb") as f:
+            magic, version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a snapshot of e-Stat data.")
+            if version != _VERSION:
+                raise ValueError(f"Unsupported snapshot version: {version}")
+            header = json.loads(f.read(header_length))
+            if not mmap:
+                f.seek(0)
+                self._buffer = f.read()
+
+        self.mmap = mmap
+        self.nrows: int = header["nrows"]
+        self.meta: dict = header["meta"]
+        self._columns = {column["name"]: column for column in header["columns"]}
+        self._data_start = (
+            -(-(_PREAMBLE.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+        )
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def _array(self, info: dict) -> np.ndarray:
+        dtype = np.dtype(info["dtype"])
+        if self.nrows == 0:
+            return np.empty(0, dtype=dtype)
+        if self.mmap:
+            return np.memmap(
+                self.path,
+                dtype=dtype,
+                mode="r",
+                offset=self._data_start + info["offset"],
+                shape=(self.nrows,),
+            )
+        return np.frombuffer(
+            self._buffer,
+            dtype=dtype,
+            count=self.nrows,
+            offset=self._data_start + info["offset"],
+        )
+
+    def codes(self, name: str) -> tuple[np.ndarray, list]:
+        """Return the integer codes and the dictionary of a column."""
+        column = self._columns[name]
+        if column["kind"] != "codes":
+            raise ValueError(f"{name} is not a code column.")
+        return self._array(column["arrays"][0]), column["categories"]
+
+    def values(self, name: str = "$") -> tuple[np.ndarray, np.ndarray, list]:
+        """Return the floats, the special character mask and the special characters."""
+        column = self._columns[name]
+        if column["kind"] != "values":
+            raise ValueError(f"{name} is not a value column.")
+        values_info, mask_info = column["arrays"]
+        return self._array(values_info), self._array(mask_info), column["special"]
+
+    def value_strings(self, name: str = "$") -> np.ndarray:
+        """Restore the value strings as in the original JSON."""
+        values, mask, special = self.values(name)
+        strings = np.empty(self.nrows, dtype=object)
+        numeric = mask == 0
+        strings[numeric] = _format_values(np.asarray(values)[numeric])
+        for k, char in enumerate(special, start=1):
+            strings[mask == k] = char
+        strings[mask == -1] = None
+        for i, string in self._columns[name]["exceptions"].items():
+            strings[int(i)] = string
+        return strings
+
+    def _take(self, name: str, mapper: dict | None = None) -> np.ndarray:
+        """Broadcast (mapped) categories to rows."""
+        codes, categories = self.codes(name)
+        if mapper is not None:
+            categories = [mapper.get(c, np.nan) for c in categories]
+        # the last item is for missing codes (-1)
+        labels = np.array(categories + [np.nan], dtype=object)
+        return labels[codes]
+
+    def get_raw_df(self, numeric: bool = False) -> pd.DataFrame:
+        data = {}
+        for name, column in self._columns.items():
+            if column["kind"] == "values":
+                values = np.array(self.values(name)[0])
+                data[name] = values if numeric else self.value_strings(name)
+            else:
+                data[name] = self._take(name)
+        return pd.DataFrame(data, index=pd.RangeIndex(self.nrows))
+
+    def to_df(self, add_level: bool = True, numeric: bool = False) -> pd.DataFrame:
+        """
+        データフレームに変換します。
+
+        `numeric=False` の場合、`StatisticalData.to_df` と同じデータフレームを返します。
+        `numeric=True` の場合、値の列は浮動小数点数になり、特殊文字はNaNになります。
+        """
+        stats_data = StatisticalData(self.meta)
+        if not stats_data._metainfo_exists():
+            return self.get_raw_df(numeric=numeric)
+
+        value_mappers = stats_data.get_value_mappers()
+        level_mappers = stats_data.get_level_mappers()
+
+        data = {}
+        for name, column in self._columns.items():
+            if column["kind"] == "values":
+                values = np.array(self.values(name)[0])
+                data[name] = values if numeric else self.value_strings(name)
+                continue
+            data[name] = self._take(name, value_mappers.get(name))
+            if add_level and name in level_mappers:
+                data[name + "_level"] = self._take(name, level_mappers[name])
+
+        df = pd.DataFrame(data, index=pd.RangeIndex(self.nrows))
+        return df.rename(columns=stats_data.get_column_mapper())
+
+    def to_statistical_data(self) -> StatisticalData:
+        """Restore the original `StatisticalData`. This is slow for large tables."""
+        df = self.get_raw_df()
+        records = [
+            {k: v for k, v in record.items() if not pd.isna(v)}
+            for record in df.to_dict(orient="records")
+        ]
+        json_data = {**self.meta}
+        json_data["DATA_INF"] = {**self.meta["DATA_INF"], "VALUE": records}
+        return StatisticalData(json_data)
+
+
+def load_snapshot(path: str, mmap: bool = True) -> Snapshot:
+    """
+    `save_snapshot` で保存したスナップショットを読み込みます。
+
+    JSONの解析は行わず、列は必要になった時点でファイルから読み込まれます。
+
+    Parameters
+    ----------
+    `path` : str
+        スナップショットのパス。
+
+    `mmap` : bool, default True
+        配列をメモリマップするか否か。`False` の場合はファイル全体を読み込みます。
+    """
+    return Snapshot(path, mmap=mmap)
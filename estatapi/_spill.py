@@ -0,0 +1,176 @@
+import os
+import shutil
+import sys
+import tempfile
+import weakref
+from typing import Iterator
+
+import pandas as pd
+
+from estatapi import _instrument, _pagination
+from estatapi._pandas import StatisticalData
+from estatapi._snapshot import Snapshot, load_snapshot, save_snapshot
+
+# records sampled to estimate the memory held by a decoded page
+_SAMPLE_SIZE = 100
+
+
+def _values(stats_data: dict) -> list:
+    values = stats_data.get("DATA_INF", {}).get("VALUE", [])
+    return [values] if isinstance(values, dict) else values
+
+
+def _estimate_bytes(stats_data: dict) -> int:
+    """Estimate the memory held by the decoded records from a sample of them."""
+    values = _values(stats_data)
+    if not values:
+        return 0
+    sample = values[:_SAMPLE_SIZE]
+    sample_bytes = sum(
+        sys.getsizeof(record) + sum(sys.getsizeof(v) for v in record.values())
+        for record in sample
+    )
+    return sample_bytes * len(values) // len(sample)
+
+
+class ChunkedStatsData:
+    """
+    `fetch_stats_data` が返す、チャンクに分かれた統計データ。
+
+    メモリの上限を超えたチャンクは一時ディレクトリにスナップショット形式で書き出され、
+    メモリマップされたまま必要な時に読み込まれます。
+    `iter_dfs` はチャンクごとにデータフレームを返すため、全体をメモリに載せずに処理できます。
+    一時ファイルは `close` またはオブジェクトの破棄時に削除されます。
+    """
+
+    def __init__(self, chunks: list, directory: str | None = None):
+        self.chunks: list[StatisticalData | Snapshot] = chunks
+        self.directory = directory
+        self._finalizer = (
+            weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+            if directory is not None
+            else None
+        )
+
+    @property
+    def spilled(self) -> bool:
+        """一時ファイルに書き出されたか否か。"""
+        return self.directory is not None
+
+    @property
+    def nrows(self) -> int:
+        return sum(
+            chunk.nrows
+            if isinstance(chunk, Snapshot)
+            else len(_values(chunk.json_data))
+            for chunk in self.chunks
+        )
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def iter_dfs(self, add_level: bool = True) -> Iterator[pd.DataFrame]:
+        """チャンクごとのデータフレームを順に返します。"""
+        for chunk in self.chunks:
+            yield chunk.to_df(add_level=add_level)
+
+    def to_df(self, add_level: bool = True) -> pd.DataFrame:
+        """全てのチャンクを一つのデータフレームにまとめます。結果は全てメモリに載ります。"""
+        return pd.concat(list(self.iter_dfs(add_level=add_level)), ignore_index=True)
+
+    def to_csv(self, path: str, add_level: bool = True, **kwargs):
+        """チャンクごとにCSVファイルに書き出します。`kwargs` は `DataFrame.to_csv` の引数です。"""
+        header = True
+        with open(path, "w", encoding=kwargs.pop("encoding", "utf-8"), newline="") as f:
+            for df in self.iter_dfs(add_level=add_level):
+                df.to_csv(f, header=header, index=False, **kwargs)
+                header = False
+
+    def close(self):
+        """一時ファイルを削除します。"""
+        self.chunks = []
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def fetch_stats_data(
+    memory_budget: int | None = None,
+    spill_dir: str | None = None,
+    **kwargs,
+) -> ChunkedStatsData:
+    """
+    統計データの全てのページを、メモリの上限を守りながら取得します。
+
+    デコード済みのページが `memory_budget` を超える場合、それまでのページをまとめて
+    一時ファイル（`save_snapshot` の形式）に書き出してメモリから解放します。
+    結果はメモリマップされたチャンクの集まりとして返され、
+    `ChunkedStatsData.iter_dfs` や `ChunkedStatsData.to_csv` で全体をメモリに載せずに変換できます。
+
+    Parameters
+    ----------
+    `memory_budget` : int, optional
+        メモリに保持するページの大きさの上限（バイト）。デコード済みのJSONの大きさを見積もって判定します。
+        省略時は全てのページをメモリに保持します。
+
+    `spill_dir` : str, optional
+        一時ディレクトリを作成する場所。省略時はシステムの一時ディレクトリです。
+
+    `kwargs`
+        `get_stats_data` の引数。2ページ目以降は `metaGetFlg='N'` で取得し、1ページ目のメタ情報を使います。
+
+    Returns
+    -------
+    stats_data : ChunkedStatsData
+
+    Examples
+    --------
+    >>> with estatapi.fetch_stats_data(memory_budget=256 * 2**20, statsDataId="0003433219") as data:
+    ...     data.to_csv("0003433219.csv")
+    """
+    if memory_budget is not None and memory_budget <= 0:
+        raise ValueError("memory_budget must be positive.")
+
+    pending = []
+    pending_bytes = 0
+    chunks = []
+    directory = None
+
+    def spill():
+        nonlocal directory, pending, pending_bytes
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="estatapi-", dir=spill_dir)
+        merged = _pagination.merge_stats_data_pages(pending)
+        path = os.path.join(directory, f"{len(chunks):06d}.snap")
+        with _instrument.stage("spill", bytes=pending_bytes) as attrs:
+            save_snapshot(merged, path)
+            attrs["rows"] = len(_values(merged["GET_STATS_DATA"]["STATISTICAL_DATA"]))
+        chunks.append(load_snapshot(path))
+        pending = []
+        pending_bytes = 0
+
+    try:
+        # every page carries the metadata, so each chunk can be converted on its own
+        pages = _pagination.iter_stats_data(reuse_metadata=True, **kwargs)
+        for page in pages:
+            pending.append(page)
+            pending_bytes += _estimate_bytes(_pagination._statistical_data(page))
+            if memory_budget is not None and pending_bytes > memory_budget:
+                spill()
+
+        if directory is not None and pending:
+            spill()
+    except BaseException:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    if pending:
+        merged = _pagination.merge_stats_data_pages(pending)
+        chunks.append(StatisticalData(merged["GET_STATS_DATA"]["STATISTICAL_DATA"]))
+    return ChunkedStatsData(chunks, directory)
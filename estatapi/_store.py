@@ -0,0 +1,139 @@
+import os
+
+from estatapi import _instrument, _pagination, _util
+from estatapi._snapshot import Snapshot, load_snapshot, save_snapshot
+
+_SUFFIX = ".snap"
+
+
+def _query_params(kwargs: dict) -> dict:
+    # all pages are stored, so the page size does not change the table
+    return {k: v for k, v in kwargs.items() if v is not None and k != "limit"}
+
+
+class TableStore:
+    """
+    取得した統計データをスナップショット形式で保存するローカルストア。
+
+    統計表はディレクトリ `root` に統計表IDとクエリ（引数）ごとに保存されます。
+    開いた統計表はメモリマップされ、列は必要になった時点で読み込まれるため、
+    同じホストの複数のプロセスで同じページキャッシュを共有できます。
+
+    Parameters
+    ----------
+    `root` : str
+        保存先のディレクトリ。
+
+    Examples
+    --------
+    >>> store = estatapi.TableStore("tables")
+    >>> snapshot = store.open(statsDataId="0003433219", cdArea="13000")
+    >>> df = snapshot.to_df()
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, statsDataId: str, **kwargs) -> str:
+        """統計表とクエリに対応するファイルのパス。"""
+        params = _query_params({"statsDataId": statsDataId, **kwargs})
+        fingerprint = _pagination._fingerprint(params)
+        return os.path.join(self.root, statsDataId, fingerprint + _SUFFIX)
+
+    def get(self, statsDataId: str, **kwargs) -> Snapshot | None:
+        """保存済みの統計表を開きます。保存されていない場合は `None` を返します。"""
+        path = self.path(statsDataId, **kwargs)
+        exists = os.path.exists(path)
+        _instrument.emit("cache", hit=exists, name="table_store")
+        return load_snapshot(path) if exists else None
+
+    def put(self, stats_data_json: dict, statsDataId: str, **kwargs) -> Snapshot:
+        """取得済みの統計データを保存します。"""
+        path = self.path(statsDataId, **kwargs)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # readers never see a partially written file, and the files already
+        # mapped by other processes stay valid after the replacement
+        with _util._atomic_path(path) as tmp_path:
+            save_snapshot(stats_data_json, tmp_path)
+        return load_snapshot(path)
+
+    def _is_updated(self, snapshot: Snapshot, statsDataId: str, **kwargs) -> bool:
+        _, updated_date = _pagination._count(statsDataId=statsDataId, **kwargs)
+        return updated_date != snapshot.meta.get("TABLE_INF", {}).get("UPDATED_DATE")
+
+    def open(
+        self,
+        statsDataId: str,
+        refresh: bool = False,
+        check_updated: bool = False,
+        **kwargs,
+    ) -> Snapshot:
+        """
+        統計表を開きます。保存されていない場合は全てのページを取得して保存します。
+
+        Parameters
+        ----------
+        `statsDataId` : str
+            統計表ID。
+
+        `refresh` : bool, default False
+            保存済みの統計表があっても取得し直すか否か。
+
+        `check_updated` : bool, default False
+            件数のみのリクエスト（`cntGetFlg='Y'`）で統計表の更新日（UPDATED_DATE）を確認し、
+            保存済みの統計表と異なる場合に取得し直すか否か。
+
+        `kwargs`
+            `get_stats_data` の引数。
+
+        Returns
+        -------
+        snapshot : Snapshot
+        """
+        if not refresh:
+            snapshot = self.get(statsDataId, **kwargs)
+            if snapshot is not None and not (
+                check_updated and self._is_updated(snapshot, statsDataId, **kwargs)
+            ):
+                return snapshot
+
+        pages = _pagination.iter_stats_data(statsDataId=statsDataId, **kwargs)
+        return self.put(
+            _pagination.merge_stats_data_pages(pages), statsDataId, **kwargs
+        )
+
+    def remove(self, statsDataId: str, **kwargs) -> bool:
+        """保存済みの統計表を削除します。削除した場合は `True` を返します。"""
+        path = self.path(statsDataId, **kwargs)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def entries(self) -> list[dict]:
+        """保存済みの統計表の一覧。"""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for stats_data_id in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, stats_data_id)
+            if not os.path.isdir(directory):
+                continue
+            for file_name in sorted(os.listdir(directory)):
+                if not file_name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(directory, file_name)
+                snapshot = load_snapshot(path)
+                entries.append(
+                    {
+                        "statsDataId": stats_data_id,
+                        "fingerprint": file_name[: -len(_SUFFIX)],
+                        "path": path,
+                        "rows": snapshot.nrows,
+                        "bytes": os.path.getsize(path),
+                        "updated_date": snapshot.meta.get("TABLE_INF", {}).get(
+                            "UPDATED_DATE"
+                        ),
+                    }
+                )
+        return entries
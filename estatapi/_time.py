@@ -0,0 +1,109 @@
+import re
+from typing import Iterable, Literal
+
+import numpy as np
+import pandas as pd
+
+# "2020年", "2020年度", "2020年10月", "2020年1～3月期"
+_LABEL_PATTERN = re.compile(
+    r"^(?P<year>\d{4})年(?:(?P<fiscal>度)"
+    r"|(?P<start>\d{1,2})月"
+    r"|(?P<start_q>\d{1,2})[～~〜－-](?P<end_q>\d{1,2})月期?)?$"
+)
+
+
+def _period(year: int, fiscal: bool, start: int, end: int) -> pd.Period:
+    if start == 0 and end == 0:
+        # a fiscal year is named after the year it starts in and ends in March
+        return (
+            pd.Period(year=year + 1, freq="Y-MAR")
+            if fiscal
+            else pd.Period(year=year, freq="Y")
+        )
+    if start == end and 1 <= start <= 12:
+        return pd.Period(year=year, month=start, freq="M")
+    if end - start == 2 and start in (1, 4, 7, 10):
+        return pd.Period(year=year, quarter=(start - 1) // 3 + 1, freq="Q")
+    return pd.NaT
+
+
+def _parse_time_code(value) -> pd.Period:
+    """
+    Parse a time code (yyyy kk ss ee) or its label into a period.
+
+    kk is 00 for a calendar year and 10 for a fiscal year,
+    ss and ee are the first and the last month (00 for a whole year).
+    """
+    if not isinstance(value, str):
+        return pd.NaT
+    if len(value) == 10 and value.isdigit():
+        kind = value[4:6]
+        if kind not in ("00", "10"):
+            return pd.NaT
+        return _period(int(value[:4]), kind == "10", int(value[6:8]), int(value[8:10]))
+
+    match = _LABEL_PATTERN.match(value)
+    if match is None:
+        return pd.NaT
+    year = int(match["year"])
+    if match["start"]:
+        return _period(year, False, int(match["start"]), int(match["start"]))
+    if match["start_q"]:
+        return _period(year, False, int(match["start_q"]), int(match["end_q"]))
+    return _period(year, bool(match["fiscal"]), 0, 0)
+
+
+def parse_time_codes(
+    codes: Iterable[str] | pd.Series,
+    how: Literal["period", "start", "end"] = "period",
+) -> pd.PeriodIndex | pd.DatetimeIndex | pd.Series:
+    """
+    時間軸のコード（例: '2020000000'）または名称（例: '2020年'）を期間・日時に変換します。
+
+    重複するコードは一度だけ解釈され、結果が各行に展開されます。
+    年（'2020000000'）・年度（'2020100000'）・月（'2020001010'）・四半期（'2020000103'）に対応し、
+    解釈できないコードは `NaT` になります。
+
+    Parameters
+    ----------
+    `codes` : iterable of str or pandas.Series
+        時間軸のコードまたは名称。
+
+    `how` : Literal['period', 'start', 'end'], default 'period'
+        - 'period': `PeriodIndex` を返します。年と月のように周期の異なるコードが混在する場合はエラーになります。
+        - 'start': 期間の開始日時の `DatetimeIndex` を返します。
+        - 'end': 期間の終了日時の `DatetimeIndex` を返します。
+
+    Returns
+    -------
+    index : pandas.PeriodIndex or pandas.DatetimeIndex
+        `codes` がシリーズの場合は、同じインデックスを持つシリーズを返します。
+    """
+    if how not in ("period", "start", "end"):
+        raise ValueError(f"Unknown how: {how}")
+
+    series = codes if isinstance(codes, pd.Series) else None
+    positions, uniques = pd.factorize(np.asarray(codes, dtype=object))
+    periods = [_parse_time_code(value) for value in uniques]
+
+    if how == "period":
+        freqs = {p.freqstr for p in periods if p is not pd.NaT}
+        if len(freqs) > 1:
+            raise ValueError(
+                f"Time codes have different frequencies: {sorted(freqs)}."
+                " Use how='start' or how='end'."
+            )
+        # the last item is for missing codes (position -1)
+        parsed = pd.PeriodIndex(periods + [pd.NaT], freq=freqs.pop() if freqs else "Y")
+    else:
+        parsed = pd.DatetimeIndex(
+            [
+                pd.NaT if p is pd.NaT else getattr(p, how + "_time")
+                for p in periods + [pd.NaT]
+            ]
+        )
+
+    result = parsed[positions]
+    if series is not None:
+        return pd.Series(result, index=series.index, name=series.name)
+    return result
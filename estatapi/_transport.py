@@ -0,0 +1,445 @@
+import abc
+import collections
+import concurrent.futures
+import copy
+import datetime
+import json
+import math
+import random
+import threading
+import time
+import urllib.parse
+import zipfile
+from typing import Literal
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from estatapi import _instrument
+
+
+class Transport(abc.ABC):
+    """Base class of the layer which sends requests to the e-Stat API."""
+
+    @abc.abstractmethod
+    def get(self, url: str, params: dict) -> requests.Response:
+        """Send a GET request and return the response."""
+
+
+class RequestsTransport(Transport):
+    """Send requests with `requests`. This is the default transport."""
+
+    def __init__(
+        self, session: requests.Session | None = None, timeout: float | None = None
+    ):
+        self.session = session
+        self.timeout = timeout
+
+    def get(self, url: str, params: dict) -> requests.Response:
+        sender = requests if self.session is None else self.session
+        return sender.get(url=url, params=params, timeout=self.timeout)
+
+
+_TRANSPORT: Transport = RequestsTransport()
+
+
+def set_transport(transport: Transport | None = None):
+    """
+    リクエスト関数が使用するトランスポートを設定します。
+
+    `None` を指定すると、既定のトランスポート（`requests`）に戻ります。
+    """
+    global _TRANSPORT
+    _TRANSPORT = RequestsTransport() if transport is None else transport
+
+
+def get_transport() -> Transport:
+    return _TRANSPORT
+
+
+def _request_key(url: str, params: dict) -> str:
+    """Build the key identifying a request. appId is excluded."""
+    items = sorted(
+        (k, str(v)) for k, v in params.items() if v is not None and k != "appId"
+    )
+    return url + "?" + urllib.parse.urlencode(items)
+
+
+def _build_response(
+    url: str,
+    params: dict,
+    status_code: int,
+    content: bytes,
+    headers: dict,
+    encoding: str | None,
+    elapsed: float,
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = encoding
+    response.url = requests.Request("GET", url, params=params).prepare().url
+    response.elapsed = datetime.timedelta(seconds=elapsed)
+    return response
+
+
+class RecordTransport(Transport):
+    """
+    実際のAPIのレスポンスを記録するトランスポート。
+
+    レスポンスの本文・ステータス・所要時間をzip形式のアーカイブに保存します。
+    アーカイブは `close` を呼び出した時点（またはwithブロックを抜けた時点）で書き出されます。
+
+    Parameters
+    ----------
+    `path` : str
+        アーカイブの保存先。
+
+    `transport` : Transport, optional
+        実際にリクエストを送信するトランスポート。省略時は `requests` を使用します。
+    """
+
+    def __init__(self, path: str, transport: Transport | None = None):
+        self.path = path
+        self.transport = RequestsTransport() if transport is None else transport
+        self._entries = []
+        self._bodies = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict) -> requests.Response:
+        start = time.perf_counter()
+        response = self.transport.get(url=url, params=params)
+        elapsed = time.perf_counter() - start
+
+        entry = {
+            "key": _request_key(url, params),
+            "url": url,
+            "params": {
+                k: v for k, v in params.items() if v is not None and k != "appId"
+            },
+            "status_code": response.status_code,
+            "headers": {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() in ("content-type", "last-modified")
+            },
+            "encoding": response.encoding,
+            "elapsed": elapsed,
+        }
+        with self._lock:
+            entry["body"] = f"bodies/{len(self._entries):06d}"
+            self._entries.append(entry)
+            self._bodies.append(response.content)
+
+        return response
+
+    def close(self):
+        with self._lock:
+            with zipfile.ZipFile(
+                self.path, mode="w", compression=zipfile.ZIP_DEFLATED
+            ) as archive:
+                archive.writestr("index.json", json.dumps(self._entries))
+                for entry, body in zip(self._entries, self._bodies):
+                    archive.writestr(entry["body"], body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayTransport(Transport):
+    """
+    `RecordTransport` で記録したレスポンスをローカルで返すトランスポート。
+
+    Parameters
+    ----------
+    `path` : str
+        `RecordTransport` で保存したアーカイブ。
+
+    `latency` : float or 'recorded', optional
+        レスポンスを返すまでの待ち時間（秒）。
+        - 'recorded': 記録時の所要時間を再現する
+        - 省略時: 待たずに返す
+
+    `jitter` : float, default 0.0
+        待ち時間の揺らぎ。待ち時間に対する割合で指定します。(0.1 なら ±10%)
+
+    `paginate` : bool, default True
+        統計データ取得で `startPosition` / `limit` の組み合わせが記録されていない場合に、
+        同じ条件で記録された全件のレスポンスを分割してページングを再現します。
+
+    `seed` : int, optional
+        揺らぎの乱数シード。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency: float | Literal["recorded"] | None = None,
+        jitter: float = 0.0,
+        paginate: bool = True,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.paginate = paginate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._entries = {}
+
+        with zipfile.ZipFile(path) as archive:
+            for entry in json.loads(archive.read("index.json")):
+                entry["content"] = archive.read(entry["body"])
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    def _next_entry(self, key: str) -> dict | None:
+        """Return recorded entries of the key in turn."""
+        entries = self._entries.get(key)
+        if entries is None:
+            return None
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return entries[count % len(entries)]
+
+    def _sleep(self, recorded: float):
+        if self.latency is None:
+            return
+        latency = recorded if self.latency == "recorded" else self.latency
+        with self._lock:
+            factor = 1 + self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(latency * factor, 0.0))
+
+    def get(self, url: str, params: dict) -> requests.Response:
+        entry = self._next_entry(_request_key(url, params))
+        content = None
+
+        if entry is None and self.paginate:
+            whole = {
+                k: v for k, v in params.items() if k not in ("startPosition", "limit")
+            }
+            entry = self._next_entry(_request_key(url, whole))
+            if entry is not None:
+                content = _slice_stats_data(
+                    entry["content"],
+                    start_position=params.get("startPosition") or 1,
+                    limit=params.get("limit"),
+                )
+                if content is None:
+                    entry = None
+
+        if entry is None:
+            raise LookupError(
+                "No recorded response for this request." "\n" f"{url}, {params}"
+            )
+
+        self._sleep(entry["elapsed"])
+
+        return _build_response(
+            url=url,
+            params=params,
+            status_code=entry["status_code"],
+            content=entry["content"] if content is None else content,
+            headers=entry["headers"],
+            encoding=entry["encoding"],
+            elapsed=entry["elapsed"],
+        )
+
+
+def _slice_stats_data(
+    content: bytes, start_position: int, limit: int | None
+) -> bytes | None:
+    """
+    Cut one page out of a whole getStatsData response.
+    Return None if the content is not a getStatsData response with values.
+    """
+    json_data = json.loads(content)
+    try:
+        stats_data = json_data["GET_STATS_DATA"]["STATISTICAL_DATA"]
+        values = stats_data["DATA_INF"]["VALUE"]
+    except (KeyError, TypeError):
+        return None
+
+    if isinstance(values, dict):
+        values = [values]
+
+    total = len(values)
+    stop = total if limit is None else min(start_position - 1 + limit, total)
+
+    json_data = copy.copy(json_data)
+    stats_data = json_data["GET_STATS_DATA"]["STATISTICAL_DATA"] = copy.copy(stats_data)
+    stats_data["DATA_INF"] = {
+        **stats_data["DATA_INF"],
+        "VALUE": values[start_position - 1 : stop],
+    }
+    result_inf = {
+        "TOTAL_NUMBER": total,
+        "FROM_NUMBER": start_position,
+        "TO_NUMBER": stop,
+    }
+    if stop < total:
+        result_inf["NEXT_KEY"] = stop + 1
+    stats_data["RESULT_INF"] = result_inf
+
+    return json.dumps(json_data, ensure_ascii=False).encode("utf-8")
+
+
+class _LatencyWindow:
+    """Latencies of the recent requests to an endpoint."""
+
+    def __init__(self, size: int):
+        self.latencies = collections.deque(maxlen=size)
+
+    def add(self, latency: float):
+        self.latencies.append(latency)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        # nearest-rank percentile
+        rank = max(math.ceil(q / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+
+class HedgedTransport(Transport):
+    """
+    遅いリクエストを重複して送信し、テールレイテンシを抑えるトランスポート。
+
+    エンドポイントごとに直近のレスポンスの所要時間を記録し、
+    その `percentile` パーセンタイルを超えてもレスポンスが返らない場合に同じリクエストをもう一度送信します。
+    先に返ったレスポンスを使い、もう一方は未送信であれば取り消し、送信済みであれば結果を破棄します。
+    重複して送信する数は、リクエスト数の `max_ratio` の割合までに制限されます。
+
+    Parameters
+    ----------
+    `transport` : Transport, optional
+        実際にリクエストを送信するトランスポート。省略時は `requests` を使用します。
+
+    `percentile` : float, default 95.0
+        重複して送信するまでの待ち時間とする、所要時間のパーセンタイル。
+
+    `min_samples` : int, default 20
+        重複して送信を始めるまでに必要な、エンドポイントごとの記録の数。
+
+    `window` : int, default 200
+        パーセンタイルの計算に使う直近の記録の数。
+
+    `max_ratio` : float, default 0.05
+        リクエスト数に対する、重複して送信するリクエスト数の上限の割合。
+
+    `max_workers` : int, default 32
+        リクエストを送信するスレッドの数。
+
+    Examples
+    --------
+    >>> estatapi.set_transport(estatapi.HedgedTransport(percentile=95, max_ratio=0.05))
+    """
+
+    def __init__(
+        self,
+        transport: Transport | None = None,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_ratio: float = 0.05,
+        max_workers: int = 32,
+    ):
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be in (0, 100].")
+        if min_samples < 1:
+            raise ValueError("min_samples must be positive.")
+        self.transport = RequestsTransport() if transport is None else transport
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.max_ratio = max_ratio
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: dict[str, _LatencyWindow] = {}
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="estatapi-hedge"
+        )
+
+    def delay(self, url: str) -> float | None:
+        """重複して送信するまでの待ち時間（秒）。記録が足りない場合は `None`。"""
+        with self._lock:
+            latencies = self._latencies.get(url)
+            if latencies is None or len(latencies.latencies) < self.min_samples:
+                return None
+            return latencies.percentile(self.percentile)
+
+    def _send(self, url: str, params: dict) -> requests.Response:
+        start = time.perf_counter()
+        response = self.transport.get(url=url, params=params)
+        latency = time.perf_counter() - start
+        with self._lock:
+            latencies = self._latencies.get(url)
+            if latencies is None:
+                latencies = self._latencies[url] = _LatencyWindow(self.window)
+            latencies.add(latency)
+        return response
+
+    def _acquire_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def get(self, url: str, params: dict) -> requests.Response:
+        with self._lock:
+            self.requests += 1
+        delay = self.delay(url)
+        if delay is None:
+            return self._send(url, params)
+
+        primary = self._executor.submit(self._send, url, dict(params))
+        done, _ = concurrent.futures.wait([primary], timeout=delay)
+        if done or not self._acquire_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(self._send, url, dict(params))
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                # the loser is not sent if it is still queued
+                for loser in pending:
+                    if not loser.cancel():
+                        loser.add_done_callback(_close_response)
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                _instrument.emit("hedge", won=future is hedge, url=url)
+                return future.result()
+        raise error
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _close_response(future: concurrent.futures.Future):
+    """Release the connection of a discarded response."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    response = future.result()
+    # responses built from recorded content have no connection
+    if response.raw is not None:
+        response.close()
@@ -0,0 +1,60 @@
+import contextlib
+import os
+import threading
+from typing import Iterator
+
+import requests
+
+
+def _check_http_status(response: requests.Response):
+    """Raise for HTTP errors, whose body is not a response of e-Stat."""
+    if response.status_code >= 400:
+        # the URL is not shown as it contains the application ID
+        raise ValueError(f"e-Stat API returned HTTP {response.status_code}.")
+
+
+def _check_status(root: dict, key: str):
+    """Return `root[key]` of a response of e-Stat or raise the error in RESULT."""
+    if key not in root:
+        result = root.get("RESULT", {})
+        message = (
+            "e-Stat API returned an error."
+            "\n"
+            f"STATUS={result.get('STATUS')}, ERROR_MSG={result.get('ERROR_MSG')}"
+        )
+        raise ValueError(message)
+    return root[key]
+
+
+def _fsync(path: str):
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def _atomic_path(path: str, suffix: str = ".tmp") -> Iterator[str]:
+    """
+    Yield a temporary path which replaces `path` when the block succeeds.
+
+    The file is synced to disk before the replacement, so `path` is either
+    the old or the complete new file even after a crash. The temporary file
+    is removed when the block fails. Its name is unique to the thread,
+    so concurrent writers of the same path do not collide.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{suffix}"
+    try:
+        yield tmp_path
+        _fsync(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_atomic(path: str, content: bytes):
+    with _atomic_path(path) as tmp_path:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
@@ -0,0 +1,184 @@
+import copy
+import itertools
+import json
+
+import pytest
+
+from estatapi import _appid, _metadata, _transport
+
+CLASS_OBJ = [
+    {
+        "@id": "tab",
+        "@name": "表章項目",
+        "CLASS": {"@code": "020", "@name": "人口", "@level": "", "@unit": "人"},
+    },
+    {
+        "@id": "cat01",
+        "@name": "男女",
+        "CLASS": [
+            {"@code": "000", "@name": "総数", "@level": "1"},
+            {"@code": "001", "@name": "男", "@level": "2", "@parentCode": "000"},
+            {"@code": "002", "@name": "女", "@level": "2", "@parentCode": "000"},
+        ],
+    },
+    {
+        "@id": "area",
+        "@name": "地域",
+        "CLASS": [
+            {"@code": "00000", "@name": "全国", "@level": "1"},
+            {"@code": "13000", "@name": "東京都", "@level": "2"},
+            {"@code": "27000", "@name": "大阪府", "@level": "2"},
+        ],
+    },
+    {
+        "@id": "time",
+        "@name": "時間軸（年次）",
+        "CLASS": [
+            {"@code": "2015000000", "@name": "2015年", "@level": "1"},
+            {"@code": "2020000000", "@name": "2020年", "@level": "1"},
+        ],
+    },
+]
+
+
+def _values():
+    values = []
+    for i, (cat01, area, time) in enumerate(
+        itertools.product(
+            ["000", "001", "002"],
+            ["00000", "13000", "27000"],
+            ["2015000000", "2020000000"],
+        )
+    ):
+        values.append(
+            {
+                "@tab": "020",
+                "@cat01": cat01,
+                "@area": area,
+                "@time": time,
+                "@unit": "人",
+                "$": str(1000 + i),
+            }
+        )
+    values[-1]["$"] = "-"
+    return values
+
+
+STATS_DATA_JSON = {
+    "GET_STATS_DATA": {
+        "RESULT": {
+            "STATUS": 0,
+            "ERROR_MSG": "正常に終了しました。",
+            "DATE": "2024-04-14T09:01:57.299+09:00",
+        },
+        "PARAMETER": {"LANG": "J", "STATS_DATA_ID": "0000000000"},
+        "STATISTICAL_DATA": {
+            "RESULT_INF": {"TOTAL_NUMBER": 18, "FROM_NUMBER": 1, "TO_NUMBER": 18},
+            "TABLE_INF": {
+                "@id": "0000000000",
+                "STAT_NAME": {"@code": "00200521", "$": "国勢調査"},
+                "TITLE": {"@no": "001", "$": "男女別人口"},
+                "UPDATED_DATE": "2024-01-01",
+            },
+            "CLASS_INF": {"CLASS_OBJ": CLASS_OBJ},
+            "DATA_INF": {
+                "NOTE": {"@char": "-", "$": "該当数値なし"},
+                "VALUE": _values(),
+            },
+        },
+    }
+}
+
+
+@pytest.fixture
+def stats_data_json():
+    return copy.deepcopy(STATS_DATA_JSON)
+
+
+@pytest.fixture
+def set_appid():
+    # set appid
+    _appid.set_appid("sampleappid")
+    yield
+    # reset appid
+    _appid.set_appid()
+
+
+@pytest.fixture(autouse=True)
+def clear_metadata_cache():
+    yield
+    _metadata.clear_metadata_cache()
+
+
+@pytest.fixture
+def register_meta_info(requests_mock):
+    return requests_mock.register_uri(
+        "GET",
+        "https://api.e-stat.go.jp/rest/3.0/app/json/getMetaInfo",
+        json={
+            "GET_META_INFO": {
+                "RESULT": {"STATUS": 0},
+                "METADATA_INF": {
+                    "TABLE_INF": STATS_DATA_JSON["GET_STATS_DATA"]["STATISTICAL_DATA"][
+                        "TABLE_INF"
+                    ],
+                    "CLASS_INF": {"CLASS_OBJ": CLASS_OBJ},
+                },
+            }
+        },
+    )
+
+
+@pytest.fixture
+def register_stats_data(requests_mock, stats_data_json):
+    """
+    Serve `stats_data_json` like getStatsData: filters by cdArea(From/To),
+    pages by startPosition/limit, and follows metaGetFlg and cntGetFlg.
+    A request without matching rows returns STATUS 1 and no DATA_INF.
+    `state` changes UPDATED_DATE, fails a start position with HTTP 500
+    or makes the request of a statsDataId an API error.
+    """
+    state = {"updated_date": "2024-01-01", "fail_at": None, "error_ids": set()}
+
+    def callback(request, context):
+        qs = request.qs
+        start = int(qs.get("startposition", ["1"])[0])
+        if start == state["fail_at"]:
+            context.status_code = 500
+            return {}
+        if qs["statsdataid"][0] in state["error_ids"]:
+            return {"GET_STATS_DATA": {"RESULT": {"STATUS": 100, "ERROR_MSG": "NG"}}}
+
+        data = copy.deepcopy(stats_data_json)
+        stats_data = data["GET_STATS_DATA"]["STATISTICAL_DATA"]
+        stats_data["TABLE_INF"]["UPDATED_DATE"] = state["updated_date"]
+        values = stats_data["DATA_INF"]["VALUE"]
+        if "cdarea" in qs:
+            areas = qs["cdarea"][0].split(",")
+            values = [v for v in values if v["@area"] in areas]
+        low = qs.get("cdareafrom", [""])[0]
+        high = qs.get("cdareato", ["99999"])[0]
+        values = [v for v in values if low <= v["@area"] <= high]
+        stats_data["DATA_INF"]["VALUE"] = values
+        if qs.get("metagetflg") == ["n"]:
+            del stats_data["CLASS_INF"]
+        if qs.get("cntgetflg") == ["y"] or not values:
+            # STATUS 1: no data
+            del stats_data["DATA_INF"]
+            stats_data["RESULT_INF"] = {"TOTAL_NUMBER": len(values)}
+            if not values:
+                data["GET_STATS_DATA"]["RESULT"]["STATUS"] = 1
+            return data
+        return json.loads(
+            _transport._slice_stats_data(
+                json.dumps(data).encode(),
+                start_position=start,
+                limit=int(qs["limit"][0]) if "limit" in qs else None,
+            )
+        )
+
+    matcher = requests_mock.register_uri(
+        "GET", "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData", json=callback
+    )
+    matcher.state = state
+    return matcher
@@ -1,6 +1,7 @@
 import pytest
 
 from estatapi import _appid
+from estatapi._functions import get_meta_info
 
 test_data = (
     ["appid", "expected"],
@@ -44,3 +45,64 @@ def test_check_appid_raise(reset_appid):
 def test_check_appid_success(reset_appid):
     _appid.set_appid("aiueo")
     _appid._check_appid()
+
+
+@pytest.fixture
+def reset_pool():
+    _appid.set_appid_pool()
+    yield
+    _appid.set_appid_pool()
+
+
+def test_pool_round_robin():
+    pool = _appid.AppIdPool(["a", "b", "c"])
+    appids = [pool.acquire() for _ in range(6)]
+    assert appids == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_pool_least_loaded():
+    pool = _appid.AppIdPool(["a", "b"], strategy="least_loaded")
+    assert pool.acquire() == "a"
+    assert pool.acquire() == "b"
+    pool.release("b")
+    assert pool.acquire() == "b"
+
+
+def test_pool_rate_limit(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(_appid.time, "sleep", sleeps.append)
+    pool = _appid.AppIdPool(["a", "b"], rate_limit=1.0)
+    assert [pool.acquire() for _ in range(4)] == ["a", "b", "a", "b"]
+    assert sleeps and all(0 < s <= 1.0 for s in sleeps)
+
+
+def test_result_status():
+    assert _appid._result_status(b'{"GET_STATS_DATA":{"RESULT":{"STATUS":100,') == 100
+    assert _appid._result_status(b'{"GET_STATS_DATA":{"RESULT":{"STATUS":"0",') == 0
+    assert _appid._result_status(b"{}") is None
+
+
+def test_pool_quarantine(requests_mock, reset_pool):
+    def callback(request, context):
+        status = 100 if request.qs["appid"] == ["bad"] else 0
+        return {"GET_META_INFO": {"RESULT": {"STATUS": status}}}
+
+    matcher = requests_mock.register_uri(
+        "GET",
+        "https://api.e-stat.go.jp/rest/3.0/app/json/getMetaInfo",
+        json=callback,
+    )
+    _appid.set_appid_pool(["bad", "good"])
+    pool = _appid.get_appid_pool()
+
+    response = get_meta_info(statsDataId="0000000000")
+    assert response.json()["GET_META_INFO"]["RESULT"]["STATUS"] == 0
+    assert [r.qs["appid"] for r in matcher.request_history] == [["bad"], ["good"]]
+    assert pool.available() == ["good"]
+
+    get_meta_info(statsDataId="0000000000")
+    assert matcher.request_history[-1].qs["appid"] == ["good"]
+
+    pool.quarantine("good")
+    with pytest.raises(ValueError, match="quarantined"):
+        get_meta_info(statsDataId="0000000000")
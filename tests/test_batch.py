@@ -0,0 +1,45 @@
+import json
+
+import pandas as pd
+import pytest
+
+from estatapi import _batch, _pandas
+
+
+@pytest.fixture
+def payloads(stats_data_json):
+    data_inf = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]
+    values = data_inf["VALUE"]
+    items = []
+    for i in range(4):
+        data_inf["VALUE"] = values[: i + 1]
+        items.append(json.dumps(stats_data_json, ensure_ascii=False).encode())
+    data_inf["VALUE"] = values
+    return items
+
+
+@pytest.mark.parametrize(
+    "transfer",
+    [
+        "pickle",
+        pytest.param(
+            "arrow",
+            marks=pytest.mark.skipif(
+                not _batch._has_pyarrow(), reason="pyarrow is not installed"
+            ),
+        ),
+    ],
+)
+def test_batch_preserves_order(payloads, transfer):
+    dfs = _batch.stats_data_to_pandas_batch(payloads, max_workers=2, transfer=transfer)
+    assert [len(df) for df in dfs] == [1, 2, 3, 4]
+    for payload, df in zip(payloads, dfs):
+        expected = _pandas.stats_data_to_pandas(json.loads(payload))
+        pd.testing.assert_frame_equal(df, expected)
+
+
+def test_batch_in_process(payloads, stats_data_json):
+    dfs = _batch.stats_data_to_pandas_batch(
+        [payloads[0], stats_data_json], max_workers=1
+    )
+    assert [len(df) for df in dfs] == [1, 18]
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from estatapi import _catalog
+
+FILE_URL = "https://www.e-stat.go.jp/stat-search/file-download"
+
+CATALOG_JSON = {
+    "GET_DATA_CATALOG": {
+        "DATA_CATALOG_LIST_INF": {
+            "NUMBER": 1,
+            "DATA_CATALOG_INF": {
+                "@id": "000001",
+                "RESOURCES": {
+                    "RESOURCE": [
+                        {
+                            "@id": "000001-1",
+                            "URL": FILE_URL + "?statInfId=1&fileKind=1",
+                            "FORMAT": "CSV",
+                            "LAST_MODIFIED_DATE": "2024-01-01",
+                        },
+                        {
+                            "@id": "000001-2",
+                            "URL": FILE_URL + "?statInfId=2&fileKind=0",
+                            "FORMAT": "XLS",
+                            "LAST_MODIFIED_DATE": "2024-01-01",
+                        },
+                    ]
+                },
+            },
+        }
+    }
+}
+
+
+@pytest.fixture
+def register_uri(requests_mock):
+    requests_mock.register_uri(
+        "GET", FILE_URL + "?statInfId=1&fileKind=1", content=b"a,b\n1,2\n"
+    )
+    requests_mock.register_uri(
+        "GET", FILE_URL + "?statInfId=2&fileKind=0", content=b"x" * 100
+    )
+    requests_mock.register_uri("HEAD", FILE_URL, headers={"Content-Length": "100"})
+    return requests_mock
+
+
+def test_iter_catalog_resources():
+    resources = list(_catalog.iter_catalog_resources(CATALOG_JSON))
+    assert [r["@id"] for r in resources] == ["000001-1", "000001-2"]
+    assert resources[0]["CATALOG_ID"] == "000001"
+
+
+def test_download(tmp_path, register_uri):
+    results = _catalog.download_catalog_files(CATALOG_JSON, str(tmp_path))
+    assert [r.status for r in results] == ["downloaded", "downloaded"]
+    assert (tmp_path / "000001-1.csv").read_bytes() == b"a,b\n1,2\n"
+    assert results[1].bytes == 100
+
+    # already downloaded
+    results = _catalog.download_catalog_files(
+        CATALOG_JSON, str(tmp_path), verify="sha256"
+    )
+    assert [r.status for r in results] == ["skipped", "skipped"]
+
+    # a corrupted file is downloaded again
+    (tmp_path / "000001-1.csv").write_bytes(b"a,b\n")
+    results = _catalog.download_catalog_files(CATALOG_JSON, str(tmp_path))
+    assert [r.status for r in results] == ["downloaded", "skipped"]
+
+
+def test_skip_without_manifest(tmp_path, register_uri):
+    (tmp_path / "000001-2.xls").write_bytes(b"x" * 100)
+    results = _catalog.download_catalog_files(CATALOG_JSON, str(tmp_path))
+    assert [r.status for r in results] == ["downloaded", "skipped"]
+
+
+def test_failed(tmp_path, requests_mock):
+    requests_mock.register_uri("GET", FILE_URL, status_code=500)
+    results = _catalog.download_catalog_files(CATALOG_JSON, str(tmp_path))
+    assert [r.status for r in results] == ["failed", "failed"]
+    assert not any(p.name.endswith(".part") for p in tmp_path.iterdir())
+
+
+class _BrokenStream(io.RawIOBase):
+    """A body which fails after the first chunk, as a dropped connection."""
+
+    def __init__(self):
+        self.sent = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.sent:
+            raise ConnectionResetError("connection reset")
+        self.sent = True
+        buffer[:3] = b"a,b"
+        return 3
+
+
+def test_failed_while_streaming(tmp_path, requests_mock):
+    requests_mock.register_uri("GET", FILE_URL, body=_BrokenStream())
+    resources = list(_catalog.iter_catalog_resources(CATALOG_JSON))[:1]
+    results = _catalog.download_catalog_files(resources, str(tmp_path), chunk_size=3)
+    assert [r.status for r in results] == ["failed"]
+    assert not any(p.name.endswith(".part") for p in tmp_path.iterdir())
@@ -0,0 +1,143 @@
+import json
+
+import pandas as pd
+import pytest
+
+from estatapi import _appid, _cli, _pandas
+
+
+@pytest.fixture(autouse=True)
+def reset_appid():
+    yield
+    _appid.set_appid()
+
+
+def _manifest(tmp_path, entries, jsonl=False):
+    path = tmp_path / ("manifest.jsonl" if jsonl else "manifest.json")
+    if jsonl:
+        path.write_text("\n".join(json.dumps(e) for e in entries), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(entries), encoding="utf-8")
+    return str(path)
+
+
+def test_load_manifest(tmp_path):
+    entries = [
+        "0000000000",
+        {"statsDataId": "0000000000", "cdArea": "13000"},
+        {"name": "tokyo", "statsDataId": "0000000000", "cdArea": "13000"},
+    ]
+    jobs = _cli._load_manifest(_manifest(tmp_path, entries, jsonl=True))
+    assert [job.name for job in jobs][0] == "0000000000"
+    assert jobs[1].name.startswith("0000000000-")
+    assert jobs[2].name == "tokyo"
+    assert jobs[2].params == {"statsDataId": "0000000000", "cdArea": "13000"}
+
+    with pytest.raises(ValueError, match="Duplicated"):
+        _cli._load_manifest(_manifest(tmp_path, ["0000000000", "0000000000"]))
+
+
+@pytest.mark.parametrize("name", ["../tokyo", "out/tokyo", "out\\tokyo", ""])
+def test_load_manifest_invalid_name(tmp_path, name):
+    entries = [{"name": name, "statsDataId": "0000000000"}]
+    with pytest.raises(ValueError, match="Invalid job name"):
+        _cli._load_manifest(_manifest(tmp_path, entries))
+
+
+def test_extract(tmp_path, register_stats_data, stats_data_json, capsys):
+    manifest = _manifest(tmp_path, ["0000000000"])
+    output = tmp_path / "out"
+    code = _cli.main(
+        ["extract", manifest, "-o", str(output), "--appid", "a", "--limit", "5"]
+    )
+    assert code == _cli.EXIT_OK
+    assert register_stats_data.call_count == 4
+    # the metadata is requested only in the first page
+    flags = [r.qs.get("metagetflg") for r in register_stats_data.request_history]
+    assert flags == [["y"]] + [["n"]] * 3
+
+    df = pd.read_csv(output / "0000000000.csv", dtype=str)
+    expected = _pandas.stats_data_to_pandas(stats_data_json)
+    assert list(df.columns) == list(expected.columns)
+    assert len(df) == 18
+
+    err = capsys.readouterr().err
+    assert "[1/1] 0000000000: 18 rows" in err
+    assert "1/1 succeeded, 18 rows, 4 requests" in err
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_extract_formats(tmp_path, register_stats_data, output_format):
+    pytest.importorskip("pyarrow")
+    manifest = _manifest(tmp_path, ["0000000000"])
+    code = _cli.main(
+        ["extract", manifest, "-o", str(tmp_path), "-f", output_format, "-q"]
+        + ["--appid", "a"]
+    )
+    assert code == _cli.EXIT_OK
+    path = tmp_path / f"0000000000.{output_format}"
+    df = pd.read_parquet(path) if output_format == "parquet" else pd.read_feather(path)
+    assert len(df) == 18
+
+
+def test_extract_store(tmp_path, register_stats_data):
+    manifest = _manifest(tmp_path, ["0000000000"])
+    args = ["extract", manifest, "-o", str(tmp_path), "-q", "--appid", "a"]
+    args += ["--store", str(tmp_path / "store")]
+    assert _cli.main(args) == _cli.EXIT_OK
+    assert _cli.main(args) == _cli.EXIT_OK
+    assert register_stats_data.call_count == 1
+
+
+def test_extract_metadata_cache(
+    tmp_path, register_stats_data, register_meta_info, stats_data_json
+):
+    entries = [
+        {"name": "tokyo", "statsDataId": "0000000000", "cdArea": "13000"},
+        {"name": "osaka", "statsDataId": "0000000000", "cdArea": "27000"},
+    ]
+    manifest = _manifest(tmp_path, entries)
+    args = ["extract", manifest, "-o", str(tmp_path), "-q", "--appid", "a"]
+    args += ["--metadata-cache", str(tmp_path / "metadata.sqlite")]
+    assert _cli.main(args) == _cli.EXIT_OK
+
+    # the metadata is fetched once and the pages are requested without it
+    assert register_meta_info.call_count == 1
+    assert all(r.qs["metagetflg"] == ["n"] for r in register_stats_data.request_history)
+    expected = _pandas.stats_data_to_pandas(stats_data_json)
+    df = pd.read_csv(tmp_path / "tokyo.csv", dtype=str)
+    assert list(df.columns) == list(expected.columns)
+    assert set(df["地域"]) == {"東京都"}
+
+
+def test_extract_store_and_checkpoint(tmp_path):
+    manifest = _manifest(tmp_path, ["0000000000"])
+    with pytest.raises(SystemExit) as e:
+        _cli.main(
+            ["extract", manifest, "--store", "store", "--checkpoint", "checkpoint"]
+        )
+    assert e.value.code == _cli.EXIT_USAGE
+
+
+def test_extract_failed(tmp_path, register_stats_data, capsys):
+    register_stats_data.state["error_ids"].add("9999999999")
+    manifest = _manifest(tmp_path, ["0000000000", "9999999999"])
+    code = _cli.main(["extract", manifest, "-o", str(tmp_path), "--appid", "a"])
+    assert code == _cli.EXIT_FAILED
+    assert (tmp_path / "0000000000.csv").exists()
+    assert not (tmp_path / "9999999999.csv").exists()
+    assert (
+        "9999999999: failed: e-Stat API returned an error." in capsys.readouterr().err
+    )
+
+
+def test_extract_usage(tmp_path, monkeypatch):
+    monkeypatch.delenv("ESTAT_APPID", raising=False)
+    manifest = _manifest(tmp_path, ["0000000000"])
+    assert _cli.main(["extract", manifest]) == _cli.EXIT_USAGE
+
+    monkeypatch.setenv("ESTAT_APPID", "a")
+    assert _cli.main(["extract", str(tmp_path / "missing.json")]) == _cli.EXIT_USAGE
+    with pytest.raises(SystemExit) as e:
+        _cli.main(["extract"])
+    assert e.value.code == _cli.EXIT_USAGE
@@ -0,0 +1,65 @@
+import pytest
+
+from estatapi import _crawl
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsList"
+
+CATALOG = {
+    "02": [{"@id": f"02{i:08d}", "UPDATED_DATE": "2024-01-01"} for i in range(7)],
+    "03": [{"@id": f"03{i:08d}", "UPDATED_DATE": "2024-01-01"} for i in range(3)],
+}
+
+
+@pytest.fixture
+def register_uri(requests_mock):
+    failures = set()
+
+    def callback(request, context):
+        qs = request.qs
+        field = qs["statsfield"][0]
+        start = int(qs.get("startposition", ["1"])[0])
+        limit = int(qs["limit"][0])
+        if (field, start) in failures:
+            context.status_code = 500
+            return {"GET_STATS_LIST": {"RESULT": {"STATUS": 999}}}
+        tables = CATALOG.get(field, [])
+        return {
+            "GET_STATS_LIST": {
+                "RESULT": {"STATUS": 0 if tables else 1},
+                "DATALIST_INF": {
+                    "NUMBER": len(tables),
+                    "TABLE_INF": tables[start - 1 : start - 1 + limit],
+                },
+            }
+        }
+
+    matcher = requests_mock.register_uri("GET", URL, json=callback)
+    matcher.failures = failures
+    return matcher
+
+
+def test_crawl(tmp_path, register_uri, set_appid):
+    path = str(tmp_path / "catalog.sqlite")
+    with _crawl.crawl_stats_list(path, window=3) as store:
+        assert len(store) == 10
+        assert store.get("0200000006") == CATALOG["02"][6]
+        assert len(store.to_df()) == 10
+
+    # 17 counts + 3 windows of 02 + 1 window of 03
+    assert register_uri.call_count == 17 + 4
+
+
+def test_crawl_resume(tmp_path, register_uri, set_appid):
+    path = str(tmp_path / "catalog.sqlite")
+    partitions = [{"statsField": "02"}, {"statsField": "03"}]
+
+    register_uri.failures.add(("02", 4))
+    with pytest.raises(ValueError):
+        _crawl.crawl_stats_list(path, partitions=partitions, window=3)
+    assert register_uri.call_count == 2 + 4
+
+    register_uri.failures.clear()
+    with _crawl.crawl_stats_list(path, partitions=partitions, window=3) as store:
+        assert len(store) == 10
+    # only the failed window is fetched again
+    assert register_uri.call_count == 2 + 4 + 1
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from estatapi import _cube, _pandas
+
+
+@pytest.fixture(params=[False, True], ids=["dense", "sparse"])
+def cube(request, stats_data_json):
+    return _cube.to_cube(stats_data_json, sparse=request.param)
+
+
+def test_to_cube(cube):
+    assert cube.dims == ["tab", "cat01", "area", "time"]
+    assert cube.shape == (1, 3, 3, 2)
+    assert cube.nnz == 17
+    data = cube.to_numpy()
+    assert data[0, 0, 0, 0] == 1000
+    assert data[0, 1, 2, 1] == 1011
+    assert np.isnan(data[0, 2, 2, 1])
+
+
+def test_auto_sparse(stats_data_json):
+    assert not _cube.to_cube(stats_data_json).is_sparse
+    assert _cube.to_cube(stats_data_json, density=0.99).is_sparse
+
+
+def test_sel(cube):
+    selected = cube.sel(area=["大阪府", "13000"], time="2020年").squeeze()
+    assert selected.dims == ["cat01", "area"]
+    assert list(selected.axes[1].labels) == ["大阪府", "東京都"]
+    np.testing.assert_array_equal(
+        selected.to_numpy(), [[1005, 1003], [1011, 1009], [np.nan, 1015]]
+    )
+
+
+def test_sel_unknown(cube):
+    with pytest.raises(ValueError):
+        cube.sel(area="北海道")
+    with pytest.raises(ValueError):
+        cube.sel(cat02="000")
+
+
+def test_sum(cube, stats_data_json):
+    df = _pandas.stats_data_to_pandas(stats_data_json, add_level=False)
+    values = df["値"].map(lambda v: float(v) if v != "-" else np.nan)
+    expected = values.groupby(df["時間軸（年次）"]).sum()
+
+    by_time = cube.sum(["tab", "cat01", "area"])
+    assert by_time.dims == ["time"]
+    np.testing.assert_array_equal(by_time.to_numpy(), expected.to_numpy())
+    assert cube.sum() == pytest.approx(values.sum())
+
+
+def test_sum_missing(cube):
+    summed = cube.sel(cat01="女", area="大阪府", time="2020年").sum()
+    assert np.isnan(summed)
+
+
+def test_to_series(cube):
+    series = cube.squeeze().to_series()
+    assert len(series) == 17
+    assert series.index.names == ["男女", "地域", "時間軸（年次）"]
+    assert series.loc[("男", "大阪府", "2020年")] == 1011
+    assert cube.to_series(labels=False).index.names == ["tab", "cat01", "area", "time"]
+
+
+def test_requires_metadata(stats_data_json):
+    del stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]["CLASS_INF"]
+    with pytest.raises(ValueError, match="metadata"):
+        _cube.to_cube(stats_data_json)
@@ -0,0 +1,99 @@
+import pytest
+
+from estatapi import _download, _pagination, _pandas
+
+
+def _start_positions(matcher):
+    return [
+        int(r.qs.get("startposition", ["1"])[0])
+        for r in matcher.request_history
+        if "cntgetflg" not in r.qs or r.qs["cntgetflg"] == ["n"]
+    ]
+
+
+def test_merge_pages(register_stats_data, set_appid, stats_data_json):
+    pages = _pagination.iter_stats_data(statsDataId="0000000000", limit=5)
+    merged = _pagination.merge_stats_data_pages(pages)
+    stats_data = merged["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    assert "NEXT_KEY" not in stats_data["RESULT_INF"]
+    assert stats_data["RESULT_INF"]["TO_NUMBER"] == 18
+    assert _pandas.stats_data_to_pandas(merged).equals(
+        _pandas.stats_data_to_pandas(stats_data_json)
+    )
+
+
+def test_iter_reuse_metadata(register_stats_data, set_appid):
+    pages = list(
+        _pagination.iter_stats_data(
+            reuse_metadata=True, statsDataId="0000000000", limit=5
+        )
+    )
+    flags = [r.qs["metagetflg"] for r in register_stats_data.request_history]
+    assert flags == [["y"]] + [["n"]] * 3
+    class_infs = [p["GET_STATS_DATA"]["STATISTICAL_DATA"]["CLASS_INF"] for p in pages]
+    assert all(c == class_infs[0] for c in class_infs)
+
+
+def test_iter_end_position(register_stats_data, set_appid):
+    pages = list(
+        _pagination.iter_stats_data(
+            end_position=12, statsDataId="0000000000", startPosition=2, limit=5
+        )
+    )
+    values = [
+        p["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]["VALUE"] for p in pages
+    ]
+    assert [len(v) for v in values] == [5, 5, 1]
+    assert register_stats_data.last_request.qs["limit"] == ["1"]
+
+
+def test_count(register_stats_data, set_appid):
+    total, updated_date = _pagination._count(
+        statsDataId="0000000000", startPosition=6, limit=5, metaGetFlg="Y"
+    )
+    assert (total, updated_date) == (18, "2024-01-01")
+    qs = register_stats_data.last_request.qs
+    assert qs["cntgetflg"] == ["y"]
+    assert qs["metagetflg"] == ["n"]
+    assert "startposition" not in qs and "limit" not in qs
+
+
+def test_download_resume(tmp_path, register_stats_data, set_appid, stats_data_json):
+    register_stats_data.state["fail_at"] = 11
+    with pytest.raises(ValueError, match="HTTP 500"):
+        _download.download_stats_data(str(tmp_path), statsDataId="0000000000", limit=5)
+    assert _start_positions(register_stats_data) == [1, 6, 11]
+
+    register_stats_data.state["fail_at"] = None
+    merged = _download.download_stats_data(
+        str(tmp_path), statsDataId="0000000000", limit=5
+    )
+    # resumed from page 11 after checking UPDATED_DATE
+    assert _start_positions(register_stats_data) == [1, 6, 11, 11, 16]
+    assert register_stats_data.request_history[3].qs["cntgetflg"] == ["y"]
+
+    values = merged["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]["VALUE"]
+    expected = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]
+    assert values == expected["VALUE"]
+
+
+def test_download_stale(tmp_path, register_stats_data, set_appid):
+    register_stats_data.state["fail_at"] = 11
+    with pytest.raises(ValueError, match="HTTP 500"):
+        _download.download_stats_data(str(tmp_path), statsDataId="0000000000", limit=5)
+
+    register_stats_data.state.update(fail_at=None, updated_date="2024-02-01")
+    _download.download_stats_data(str(tmp_path), statsDataId="0000000000", limit=5)
+    # the table was updated, so it is downloaded from the beginning
+    assert _start_positions(register_stats_data) == [1, 6, 11, 1, 6, 11, 16]
+
+
+def test_not_stats_data_response():
+    with pytest.raises(ValueError, match="not a response of getStatsData"):
+        _pagination._statistical_data({})
+
+
+def test_download_different_query(tmp_path, register_stats_data, set_appid):
+    _download.download_stats_data(str(tmp_path), statsDataId="0000000000", limit=5)
+    _download.download_stats_data(str(tmp_path), statsDataId="0000000000", limit=10)
+    assert len(list(tmp_path.iterdir())) == 2
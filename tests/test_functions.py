@@ -21,6 +21,16 @@ def register_uri(requests_mock):
         "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData",
         json={"GET_STATS_DATA": None},
     )
+    requests_mock.register_uri(
+        "GET",
+        "https://api.e-stat.go.jp/rest/3.0/app/json/getDataCatalog",
+        json={"GET_DATA_CATALOG": None},
+    )
+    requests_mock.register_uri(
+        "GET",
+        "https://api.e-stat.go.jp/rest/3.0/app/json/refDataset",
+        json={"REF_DATASET": None},
+    )
 
 
 @pytest.fixture
@@ -280,3 +290,110 @@ class TestGetStatsData:
             ) or ("Names of arguments are invalid" in str(e))
         else:
             pytest.fail("This parameter should be rejected, but is accepted.")
+
+
+class TestGetDataCatalog:
+    params_to_be_accepted = [
+        {"lang": "J"},
+        {"lang": "E"},
+        {"surveyYears": "202304-202404"},
+        {"openYears": "2024"},
+        {"statsField": "02"},
+        {"statsCode": "00200521"},
+        {"searchWord": "人口"},
+        {"collectArea": "2"},
+        {"explanationGetFlg": "N"},
+        {"dataType": "CSV"},
+        {"dataType": "XLS,CSV,XLS_REP"},
+        {"catalogId": "000001234567"},
+        {"resourceId": "000001234567"},
+        {"startPosition": 1},
+        {"limit": 1},
+        {"updatedDate": "20241231"},
+    ]
+
+    params_to_be_rejected = [
+        {"lang": "invalid_value"},
+        {"surveyYears": "2024-04"},
+        {"statsField": "111"},
+        {"collectArea": "4"},
+        {"explanationGetFlg": "Yes"},
+        {"dataType": "TXT"},
+        {"dataType": "CSV,"},
+        {"startPosition": 0},
+        {"limit": 0},
+        {"updatedDate": "20249999"},
+    ]
+
+    def test_root_key(self, register_uri, set_appid):
+        """Root key must be 'GET_DATA_CATALOG'"""
+        output = _functions.get_data_catalog()
+        output = output.json()
+        assert list(output.keys()) == ["GET_DATA_CATALOG"]
+
+    @pytest.mark.parametrize(
+        "params", params_to_be_accepted, ids=[str(p) for p in params_to_be_accepted]
+    )
+    def test_validate_accepted(self, params, register_uri, set_appid):
+        """This parameters should be accepted."""
+        try:
+            _functions.get_data_catalog(**params)
+        except ValidationError:
+            pytest.fail("This parameter should be accepted, but is rejected.")
+
+    @pytest.mark.parametrize(
+        "params", params_to_be_rejected, ids=[str(p) for p in params_to_be_rejected]
+    )
+    def test_validate_rejected(self, params, register_uri, set_appid):
+        """This parameters should be rejected."""
+        try:
+            _functions.get_data_catalog(**params)
+        except ValidationError:
+            assert True
+        else:
+            pytest.fail("This parameter should be rejected, but is accepted.")
+
+
+class TestRefDataset:
+    params_to_be_accepted = [
+        {},
+        {"dataSetId": "0000000000"},
+        {"dataSetId": "0000000000", "lang": "E"},
+        {"collectArea": "1"},
+        {"explanationGetFlg": "N"},
+    ]
+
+    params_to_be_rejected = [
+        {"dataSetId": 1},
+        {"lang": "invalid_value"},
+        {"collectArea": "4"},
+        {"explanationGetFlg": 1},
+    ]
+
+    def test_root_key(self, register_uri, set_appid):
+        """Root key must be 'REF_DATASET'"""
+        output = _functions.ref_dataset()
+        output = output.json()
+        assert list(output.keys()) == ["REF_DATASET"]
+
+    @pytest.mark.parametrize(
+        "params", params_to_be_accepted, ids=[str(p) for p in params_to_be_accepted]
+    )
+    def test_validate_accepted(self, params, register_uri, set_appid):
+        """This parameters should be accepted."""
+        try:
+            _functions.ref_dataset(**params)
+        except ValidationError:
+            pytest.fail("This parameter should be accepted, but is rejected.")
+
+    @pytest.mark.parametrize(
+        "params", params_to_be_rejected, ids=[str(p) for p in params_to_be_rejected]
+    )
+    def test_validate_rejected(self, params, register_uri, set_appid):
+        """This parameters should be rejected."""
+        try:
+            _functions.ref_dataset(**params)
+        except ValidationError:
+            assert True
+        else:
+            pytest.fail("This parameter should be rejected, but is accepted.")
@@ -0,0 +1,58 @@
+import pytest
+
+from estatapi import _functions, _instrument, _pandas
+
+
+@pytest.fixture
+def register_uri(requests_mock, stats_data_json):
+    requests_mock.register_uri(
+        "GET",
+        "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData",
+        json=stats_data_json,
+    )
+
+
+def test_no_hooks_no_measurement():
+    with _instrument.stage("request") as attrs:
+        pass
+    assert attrs == {}
+
+
+def test_hook_receives_events():
+    events = []
+    _instrument.add_hook(events.append)
+    try:
+        with _instrument.stage("decode", bytes=10):
+            pass
+    finally:
+        _instrument.remove_hook(events.append)
+
+    assert len(events) == 1
+    assert events[0].stage == "decode"
+    assert events[0].attrs == {"bytes": 10}
+    assert events[0].duration >= 0
+
+
+def test_collector(register_uri, set_appid):
+    with _instrument.Collector(keep_requests=5) as collector:
+        response = _functions.get_stats_data(statsDataId="0000000000")
+        df = _pandas.stats_data_to_pandas(response.json())
+        _instrument.emit("cache", hit=True)
+        _instrument.emit("cache", hit=False)
+
+    summary = collector.summary()
+    stages = summary["stages"]
+    assert set(stages) >= {"validate", "request", "normalize", "relabel", "cache"}
+    assert stages["request"]["count"] == 1
+    assert stages["request"]["bytes"] == len(response.content)
+    assert stages["normalize"]["rows"] == len(df)
+    assert summary["cache_hits"] == 1
+    assert summary["cache_misses"] == 1
+    assert collector.requests[0]["api_type"] == "getStatsData"
+    assert collector.requests[0]["status_code"] == 200
+
+    # the collector is removed after the block
+    assert collector not in _instrument._HOOKS
+
+    collector.reset()
+    assert collector.summary()["stages"] == {}
@@ -0,0 +1,94 @@
+import copy
+
+import numpy as np
+import pytest
+
+from estatapi import _join
+
+
+@pytest.fixture
+def tables(stats_data_json):
+    population = copy.deepcopy(stats_data_json)
+    households = copy.deepcopy(stats_data_json)
+    stats_data = households["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    stats_data["TABLE_INF"]["@id"] = "0000000001"
+    # only 総数 and without 大阪府
+    stats_data["DATA_INF"]["VALUE"] = [
+        {**v, "$": str(int(v["$"]) // 2)}
+        for v in stats_data["DATA_INF"]["VALUE"]
+        if v["@cat01"] == "000" and v["@area"] != "27000"
+    ]
+    return population, households
+
+
+def _filter_cat01(table, cat01):
+    table = copy.deepcopy(table)
+    data_inf = table["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]
+    data_inf["VALUE"] = [v for v in data_inf["VALUE"] if v["@cat01"] == cat01]
+    return table
+
+
+def test_join_inner(tables):
+    population, households = tables
+    df = _join.join_stats_data([_filter_cat01(population, "000"), households])
+
+    assert df.index.names == ["地域", "時間軸（年次）"]
+    assert list(df.index) == [
+        ("全国", "2015年"),
+        ("全国", "2020年"),
+        ("東京都", "2015年"),
+        ("東京都", "2020年"),
+    ]
+    assert list(df.columns.get_level_values(0).unique()) == [
+        "0000000000",
+        "0000000001",
+    ]
+    assert (df[("0000000000", "男女")] == "総数").all()
+    assert list(df[("0000000000", "値")]) == ["1000", "1001", "1002", "1003"]
+    assert list(df[("0000000001", "値")]) == ["500", "500", "501", "501"]
+
+
+def test_join_outer(tables):
+    population, households = tables
+    df = _join.join_stats_data(
+        [_filter_cat01(population, "000"), households], how="outer", labels=False
+    )
+    assert len(df) == 6
+    assert df.index.names == ["@area", "@time"]
+    missing = df.loc[("27000", "2015000000"), ("0000000001", "$")]
+    assert missing is np.nan or missing != missing
+
+
+def test_join_fast_path(tables, monkeypatch):
+    population, _ = tables
+
+    def fail(*args, **kwargs):
+        raise AssertionError("merge should not be called")
+
+    monkeypatch.setattr(_join.pd.DataFrame, "merge", fail)
+    table = _filter_cat01(population, "001")
+    df = _join.join_stats_data([table, table], names=["a", "b"])
+    assert len(df) == 6
+    assert (df[("a", "値")] == df[("b", "値")]).all()
+
+
+def test_join_many_to_many(tables):
+    population, households = tables
+    df = _join.join_stats_data([population, households], on=["@area", "@time"])
+    # 3 categories of 男女 for each of 4 keys
+    assert len(df) == 12
+
+
+def test_names_length(tables):
+    with pytest.raises(ValueError):
+        _join.join_stats_data(tables, names=["a"])
+
+
+def test_get_joined_stats_data(register_stats_data, set_appid, stats_data_json):
+    df = _join.get_joined_stats_data(["0000000000", "0000000001"], limit=5)
+    expected = _join.join_stats_data(
+        [stats_data_json, stats_data_json], names=["0000000000", "0000000001"]
+    )
+    assert df.equals(expected)
+    # 18 records in 4 pages for each table
+    assert register_stats_data.call_count == 8
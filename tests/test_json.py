@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from estatapi import _instrument, _json, _pagination
+
+CONTENT = json.dumps({"値": "1"}, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def reset_decoder():
+    _json.set_decoder()
+    yield
+    _json.set_decoder()
+
+
+def test_stdlib():
+    _json.set_decoder("json")
+    assert _json.get_decoder() is _json._stdlib_loads
+    assert _json.loads(CONTENT) == {"値": "1"}
+    assert _json.loads(CONTENT.decode("utf-8")) == {"値": "1"}
+
+
+def test_orjson():
+    pytest.importorskip("orjson")
+    _json.set_decoder("orjson")
+    assert _json.loads(CONTENT) == {"値": "1"}
+
+
+def test_fallback(monkeypatch):
+    def missing():
+        raise ImportError
+
+    monkeypatch.setattr(_json, "_orjson_loads", missing)
+    assert _json.get_decoder() is _json._stdlib_loads
+    with pytest.raises(ImportError, match="orjson"):
+        _json.set_decoder("orjson")
+
+
+def test_decode_stage():
+    with _instrument.Collector() as collector:
+        _json.loads(CONTENT)
+    assert collector.stages["decode"].count == 1
+
+
+def test_custom_decoder(requests_mock, set_appid, stats_data_json):
+    requests_mock.register_uri(
+        "GET",
+        "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData",
+        json=stats_data_json,
+    )
+    decoded = []
+
+    def decoder(content):
+        decoded.append(type(content))
+        return json.loads(content)
+
+    _json.set_decoder(decoder)
+    pages = list(_pagination.iter_stats_data(statsDataId="0000000000"))
+    assert pages == [stats_data_json]
+    assert decoded == [bytes]
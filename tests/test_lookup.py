@@ -0,0 +1,62 @@
+import pytest
+
+from estatapi import _lookup, _metadata, _query
+
+
+@pytest.fixture
+def index(stats_data_json):
+    class_inf = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]["CLASS_INF"]
+    return _lookup.LookupIndex(_metadata.normalize_class_objs(class_inf))
+
+
+def test_normalize_label():
+    assert _lookup.normalize_label("２０２０年") == "2020年"
+    assert _lookup.normalize_label(" 東京　都 ") == "東京都"
+    assert _lookup.normalize_label("ﾃｽﾄ ABC") == "テストabc"
+
+
+def test_lookup(index):
+    assert index.lookup("area", "東京都") == ["13000"]
+    assert index.lookup("@area", "東京都", match="exact") == ["13000"]
+    assert index.lookup("area", "東京 都", match="exact") == []
+    assert index.lookup("area", "東京 都", match="normalized") == ["13000"]
+    assert index.lookup("time", "２０２０年") == ["2020000000"]
+    assert index.lookup("time", "20", match="prefix") == ["2015000000", "2020000000"]
+    assert index.lookup("area", "27000") == ["27000"]
+    assert index.lookup("tab", "人口") == ["020"]
+    with pytest.raises(ValueError):
+        index.lookup("area", "東京都", match="fuzzy")
+    with pytest.raises(ValueError):
+        index.lookup("cat02", "男")
+
+
+def test_lookup_level(index):
+    assert index.lookup("cat01", "総数", level=1) == ["000"]
+    assert index.lookup("cat01", "総数", level=2) == []
+    assert index.lookup("area", "", match="prefix", level=2) == ["13000", "27000"]
+    assert index.lookup("area", "", match="prefix", level=[1, 2]) == [
+        "00000",
+        "13000",
+        "27000",
+    ]
+
+
+def test_resolve(index):
+    assert index.resolve("cat01", "男") == "001"
+    with pytest.raises(ValueError):
+        index.resolve("cat01", "不明")
+
+
+def test_lookup_index(register_meta_info, set_appid):
+    index = _lookup.lookup_index("0000000000")
+    assert _lookup.lookup_index("0000000000") is index
+    assert register_meta_info.call_count == 1
+
+    # rebuilt when the metadata cache is cleared
+    _metadata.clear_metadata_cache()
+    assert _lookup.lookup_index("0000000000") is not index
+
+
+def test_query_resolves_normalized_labels(register_meta_info, set_appid):
+    query = _query.query("0000000000").isin("area", ["東京　都"])
+    assert query.params()["cdArea"] == "13000"
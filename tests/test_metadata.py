@@ -0,0 +1,78 @@
+import concurrent.futures
+
+import pytest
+
+from estatapi import _instrument, _metadata
+
+TABLE = {"@id": "0000000000", "UPDATED_DATE": "2024-01-01"}
+
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    path = str(tmp_path / "metadata.sqlite")
+    _metadata.set_metadata_cache(path)
+    yield path
+    _metadata.set_metadata_cache()
+
+
+def _new_process(path):
+    """Simulate another process: a new connection and an empty in-process cache."""
+    _metadata.clear_metadata_cache()
+    _metadata.set_metadata_cache(path)
+
+
+def test_shared(shared_cache, register_meta_info, set_appid):
+    metadata = _metadata.get_metadata("0000000000")
+    _new_process(shared_cache)
+    with _instrument.Collector() as collector:
+        assert _metadata.get_metadata("0000000000") == metadata
+    assert register_meta_info.call_count == 1
+    assert collector.cache_hits == 1
+
+    # other languages are other entries
+    _metadata.get_metadata("0000000000", lang="E")
+    assert register_meta_info.call_count == 2
+
+
+def test_concurrent(shared_cache, register_meta_info, set_appid):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda _: _metadata.get_metadata("0000000000"), range(32))
+        )
+    assert all(r == results[0] for r in results)
+
+
+def test_invalidate(shared_cache, register_meta_info, set_appid):
+    _metadata.get_metadata("0000000000")
+
+    assert _metadata.invalidate_metadata([TABLE]) == 0
+    assert _metadata.invalidate_metadata([{"@id": "9999999999"}]) == 0
+
+    stats_list_json = {
+        "GET_STATS_LIST": {
+            "DATALIST_INF": {"TABLE_INF": {**TABLE, "UPDATED_DATE": "2024-06-01"}}
+        }
+    }
+    assert _metadata.invalidate_metadata(stats_list_json) == 1
+    _metadata.get_metadata("0000000000")
+    assert register_meta_info.call_count == 2
+
+
+def test_invalidate_other_process(shared_cache, register_meta_info, set_appid):
+    _metadata.get_metadata("0000000000")
+    other = _metadata._SharedCache(shared_cache)
+    try:
+        assert other.invalidate({"0000000000": "2024-06-01"}) == 1
+    finally:
+        other.close()
+
+    # the in-process cache is dropped as the shared one was invalidated
+    _metadata.get_metadata("0000000000")
+    assert register_meta_info.call_count == 2
+
+
+def test_invalidate_in_process(register_meta_info, set_appid):
+    _metadata.get_metadata("0000000000")
+    assert _metadata.invalidate_metadata([{**TABLE, "UPDATED_DATE": "2024-06-01"}]) == 1
+    _metadata.get_metadata("0000000000")
+    assert register_meta_info.call_count == 2
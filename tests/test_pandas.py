@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from estatapi import _pandas
+
+TABLE_INF = [
+    {
+        "@id": "0003433219",
+        "STAT_NAME": {"@code": "00200521", "$": "国勢調査"},
+        "GOV_ORG": {"@code": "00200", "$": "総務省"},
+        "STATISTICS_NAME": "平成27年国勢調査 人口等基本集計",
+        "TITLE": {"@no": "001", "$": "男女別人口"},
+        "CYCLE": "-",
+        "SURVEY_DATE": 201510,
+        "OPEN_DATE": "2016-10-26",
+        "SMALL_AREA": 0,
+        "COLLECT_AREA": "該当なし",
+        "MAIN_CATEGORY": {"@code": "02", "$": "人口・世帯"},
+        "SUB_CATEGORY": {"@code": "01", "$": "人口"},
+        "OVERALL_TOTAL_NUMBER": 18,
+        "UPDATED_DATE": "2016-10-26",
+        "STATISTICS_NAME_SPEC": {
+            "TABULATION_CATEGORY": "平成27年国勢調査",
+            "TABULATION_SUB_CATEGORY1": "人口等基本集計",
+        },
+        "DESCRIPTION": "",
+        "TITLE_SPEC": {"TABLE_NAME": "男女別人口"},
+    },
+    {
+        "@id": "0003433220",
+        "STAT_NAME": {"@code": "00200521", "$": "国勢調査"},
+        "TITLE": "年齢別人口",
+        "SURVEY_DATE": "201501-201512",
+        "OVERALL_TOTAL_NUMBER": 1200,
+        "DESCRIPTION": {"TABULATION_CATEGORY_EXPLANATION": "説明"},
+        "NEW_FIELD": {"@code": "1", "$": "新しい項目"},
+    },
+]
+
+
+def _stats_list_json(tables):
+    return {"GET_STATS_LIST": {"DATALIST_INF": {"TABLE_INF": tables}}}
+
+
+def test_flatten_table_inf():
+    df = _pandas.flatten_table_inf(TABLE_INF)
+    assert list(df["TITLE.$"]) == ["男女別人口", "年齢別人口"]
+    assert list(df["TITLE.@no"]) == ["001", None]
+    assert list(df["SURVEY_DATE"]) == ["201510", "201501-201512"]
+    assert df["OVERALL_TOTAL_NUMBER"].dtype == "Int64"
+    assert pd.isna(df["SMALL_AREA"].iloc[1])
+    assert df["DESCRIPTION.TABULATION_CATEGORY_EXPLANATION"].iloc[1] == "説明"
+    assert list(df["NEW_FIELD.$"]) == [None, "新しい項目"]
+    assert df.columns[-2:].tolist() == ["NEW_FIELD.@code", "NEW_FIELD.$"]
+
+
+def test_stable_columns():
+    columns = _pandas.flatten_table_inf(TABLE_INF[:1]).columns
+    assert columns.equals(_pandas.flatten_table_inf([{"@id": "1"}]).columns)
+    assert columns.equals(_pandas.flatten_table_inf([]).columns)
+
+
+def test_compatible_with_json_normalize():
+    """Columns of nested records keep the names json_normalize gives."""
+    df = _pandas.flatten_table_inf(TABLE_INF[:1])
+    expected = pd.json_normalize(TABLE_INF[:1])
+    expected = expected.drop(columns=["DESCRIPTION"])
+    for column in expected.columns:
+        assert column in df.columns
+        assert str(df[column].iloc[0]) == str(expected[column].iloc[0])
+
+
+@pytest.mark.parametrize("tables", [TABLE_INF[0], TABLE_INF])
+def test_stats_list_to_pandas(tables):
+    df = _pandas.stats_list_to_pandas(_stats_list_json(tables))
+    assert len(df) == (1 if isinstance(tables, dict) else 2)
+
+
+def test_stats_list_to_pandas_stats_names():
+    list_inf = [
+        {
+            "@id": "00200521",
+            "STAT_NAME": {"@code": "00200521", "$": "国勢調査"},
+            "GOV_ORG": {"@code": "00200", "$": "総務省"},
+        },
+        {
+            "@id": "00200522",
+            "STAT_NAME": {"@code": "00200522", "$": "住宅・土地統計調査"},
+            "GOV_ORG": {"@code": "00200", "$": "総務省"},
+        },
+    ]
+    pages = [{"GET_STATS_LIST": {"DATALIST_INF": {"LIST_INF": r}}} for r in list_inf]
+    df = _pandas.stats_list_to_pandas(iter(pages))
+    assert df.columns.tolist() == _pandas._LIST_INF_COLUMNS
+    assert list(df["STAT_NAME.$"]) == ["国勢調査", "住宅・土地統計調査"]
+    assert list(df["GOV_ORG.@code"]) == ["00200", "00200"]
+
+
+def test_stats_list_to_pandas_pages():
+    pages = (_stats_list_json([table]) for table in TABLE_INF)
+    df = _pandas.stats_list_to_pandas(pages)
+    assert list(df["@id"]) == ["0003433219", "0003433220"]
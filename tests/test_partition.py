@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from estatapi import _pandas, _partition
+
+
+def _round_trip(partitions):
+    """Partitions are sent to workers as JSON."""
+    return [json.loads(json.dumps(p.to_dict())) for p in partitions]
+
+
+def test_position(register_stats_data, set_appid, stats_data_json):
+    partitions = _partition.partition_stats_data(partitions=4, statsDataId="0000000000")
+    assert [p.rows for p in partitions] == [4, 5, 4, 5]
+    assert [p.params["startPosition"] for p in partitions] == [1, 5, 10, 14]
+    assert [p.params.get("metaGetFlg") for p in partitions] == [None, "N", "N", "N"]
+
+    outputs = [_partition.run_partition(p) for p in _round_trip(partitions)]
+    merged = _partition.merge_partitions(reversed(outputs))
+    assert _pandas.stats_data_to_pandas(merged).equals(
+        _pandas.stats_data_to_pandas(stats_data_json)
+    )
+    result_inf = merged["GET_STATS_DATA"]["STATISTICAL_DATA"]["RESULT_INF"]
+    assert result_inf["TOTAL_NUMBER"] == 18
+
+
+def test_code(
+    register_stats_data, register_meta_info, set_appid, stats_data_json, tmp_path
+):
+    partitions = _partition.partition_stats_data(
+        rows=6, by="area", statsDataId="0000000000"
+    )
+    assert [(p.params["cdAreaFrom"], p.params["cdAreaTo"]) for p in partitions] == [
+        ("00000", "00000"),
+        ("13000", "13000"),
+        ("27000", "27000"),
+    ]
+    assert [p.rows for p in partitions] == [6, 6, 6]
+
+    paths = []
+    for i, partition in enumerate(_round_trip(partitions)):
+        paths.append(str(tmp_path / f"part-{i}.json"))
+        _partition.run_partition(partition, path=paths[-1])
+    merged = _partition.merge_partitions(paths[::-1])
+    df = _pandas.stats_data_to_pandas(merged)
+    expected = _pandas.stats_data_to_pandas(stats_data_json)
+    assert len(df) == 18
+    assert (
+        df.sort_values(list(df.columns))
+        .reset_index(drop=True)
+        .equals(expected.sort_values(list(df.columns)).reset_index(drop=True))
+    )
+
+
+def test_code_filtered(register_stats_data, set_appid):
+    with pytest.raises(ValueError, match="already filtered"):
+        _partition.partition_stats_data(
+            partitions=2, by="area", statsDataId="0000000000", cdArea="13000"
+        )
+
+
+def test_merge_errors(register_stats_data, set_appid):
+    partitions = _partition.partition_stats_data(partitions=2, statsDataId="0000000000")
+    first = _partition.run_partition(partitions[0])
+    with pytest.raises(ValueError, match="missing"):
+        _partition.merge_partitions([first])
+    with pytest.raises(ValueError, match="missing"):
+        _partition.merge_partitions([first, first])
+
+    register_stats_data.state["updated_date"] = "2024-06-01"
+    second = _partition.run_partition(partitions[1])
+    with pytest.raises(ValueError, match="updated"):
+        _partition.merge_partitions([first, second])
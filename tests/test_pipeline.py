@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from estatapi import _pagination, _pandas, _pipeline
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData"
+
+
+def test_peek_next_key():
+    content = json.dumps(
+        {
+            "GET_STATS_DATA": {
+                "STATISTICAL_DATA": {
+                    "RESULT_INF": {"TOTAL_NUMBER": 18, "NEXT_KEY": "6"},
+                    "DATA_INF": {"VALUE": [{"NEXT_KEY": 1}]},
+                }
+            }
+        }
+    ).encode()
+    assert _pagination._peek_next_key(content) == 6
+    last_page = content.replace(b', "NEXT_KEY": "6"', b"")
+    assert _pagination._peek_next_key(last_page) is None
+
+
+@pytest.mark.parametrize("queue_size", [1, 2])
+def test_pipeline(register_stats_data, set_appid, stats_data_json, queue_size):
+    pipeline = _pipeline.pipeline_stats_data(
+        statsDataId="0000000000", limit=5, queue_size=queue_size
+    )
+    df = pipeline.to_pandas()
+
+    assert df.equals(_pandas.stats_data_to_pandas(stats_data_json))
+    assert register_stats_data.call_count == 4
+    # the metadata is requested only in the first page
+    flags = [r.qs.get("metagetflg") for r in register_stats_data.request_history]
+    assert flags == [["y"]] + [["n"]] * 3
+
+    summary = pipeline.summary()
+    assert [summary[stage]["items"] for stage in pipeline.STAGES] == [4, 4, 4]
+    assert summary["fetch"]["bytes"] == summary["decode"]["bytes"] > 0
+    assert summary["convert"]["rows"] == len(df)
+
+
+def test_pipeline_iterated_once(register_stats_data, set_appid):
+    pipeline = _pipeline.pipeline_stats_data(statsDataId="0000000000")
+    assert len(list(pipeline)) == 1
+    with pytest.raises(RuntimeError):
+        list(pipeline)
+
+
+def test_pipeline_error(requests_mock, set_appid):
+    requests_mock.get(
+        URL,
+        json={"GET_STATS_DATA": {"RESULT": {"STATUS": 100, "ERROR_MSG": "error"}}},
+    )
+    pipeline = _pipeline.pipeline_stats_data(statsDataId="0000000000")
+    with pytest.raises(ValueError, match="STATUS=100"):
+        pipeline.to_pandas()
+    assert all(not thread.is_alive() for thread in pipeline._threads)
+    # the error is raised in the fetch stage, not passed downstream as a page
+    assert pipeline.stats["fetch"].items == 0
+    assert pipeline.stats["decode"].items == 0
+
+
+def test_pipeline_close(register_stats_data, set_appid):
+    pipeline = _pipeline.pipeline_stats_data(
+        statsDataId="0000000000", limit=1, queue_size=1
+    )
+    iterator = iter(pipeline)
+    next(iterator)
+    iterator.close()
+    assert all(not thread.is_alive() for thread in pipeline._threads)
+    assert register_stats_data.call_count < 18
@@ -0,0 +1,58 @@
+import dataclasses
+import json
+
+import pytest
+
+from estatapi import _plan
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData"
+
+
+@pytest.fixture
+def register_count(requests_mock):
+    return requests_mock.register_uri(
+        "GET",
+        URL,
+        json={
+            "GET_STATS_DATA": {
+                "RESULT": {"STATUS": 0},
+                "STATISTICAL_DATA": {"RESULT_INF": {"TOTAL_NUMBER": 250001}},
+            }
+        },
+    )
+
+
+def test_plan(register_count, register_meta_info, set_appid):
+    plan = _plan.plan_stats_data(statsDataId="0000000000", concurrency=2)
+    assert register_count.call_count == 1
+    assert register_count.last_request.qs["cntgetflg"] == ["y"]
+    assert plan.rows == 250001
+    assert plan.pages == 3
+    assert plan.meta_bytes > 0
+    assert plan.estimated_bytes > plan.rows * plan.bytes_per_row
+    assert "pages: 3 (limit=100,000)" in plan.explain()
+
+    replanned = dataclasses.replace(plan, limit=50000, concurrency=1)
+    assert replanned.pages == 6
+    assert replanned.estimated_seconds > plan.estimated_seconds
+
+
+def test_plan_start_position(register_count, register_meta_info, set_appid):
+    plan = _plan.plan_stats_data(
+        statsDataId="0000000000", startPosition=200001, metaGetFlg="N", limit=1000
+    )
+    assert "startposition" not in register_count.last_request.qs
+    assert plan.rows == 50001
+    assert plan.pages == 51
+    assert plan.meta_bytes == 0
+
+
+def test_bytes_per_row(stats_data_json, register_count, register_meta_info, set_appid):
+    """The estimate is close to the actual size of the VALUE records."""
+    values = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]["VALUE"]
+    actual = len(json.dumps(values, ensure_ascii=False).encode("utf-8")) / len(values)
+    plan = _plan.plan_stats_data(
+        statsDataId="0000000000",
+        concurrency=1,
+    )
+    assert plan.bytes_per_row == pytest.approx(actual, rel=0.3)
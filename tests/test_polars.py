@@ -0,0 +1,116 @@
+import pytest
+
+from estatapi import _pagination, _polars
+
+pl = pytest.importorskip("polars")
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/"
+
+
+def test_iter_stats_data(register_stats_data, set_appid):
+    pages = list(_pagination.iter_stats_data(statsDataId="0000000000", limit=5))
+    assert len(pages) == 4
+    assert [
+        len(p["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]["VALUE"]) for p in pages
+    ] == [5, 5, 5, 3]
+
+
+def test_iter_stats_data_error(requests_mock, set_appid):
+    requests_mock.register_uri(
+        "GET",
+        URL + "getStatsData",
+        json={"GET_STATS_DATA": {"RESULT": {"STATUS": 100, "ERROR_MSG": "error"}}},
+    )
+    with pytest.raises(ValueError, match="STATUS=100"):
+        list(_pagination.iter_stats_data(statsDataId="0000000000"))
+
+
+def test_to_polars(stats_data_json):
+    df = _polars.to_polars(stats_data_json)
+    assert len(df) == 18
+    assert df.schema["value"] == pl.Float64
+    assert df["value"][-1] is None
+    assert df.row(0, named=True)["area_name"] == "全国"
+    assert df.row(0, named=True)["cat01_level"] == 1
+
+
+def test_scan_pushdown(register_stats_data, register_meta_info, set_appid):
+    lf = _polars.scan_stats_data("0000000000", limit=4)
+    df = (
+        lf.filter(pl.col("area_name") == "東京都", pl.col("cat01_level") == 2)
+        .select("cat01", "time", "value")
+        .collect()
+    )
+    assert df.columns == ["cat01", "time", "value"]
+    assert len(df) == 4
+    # the area filter is sent to the API
+    last = register_stats_data.last_request.qs
+    assert last["cdarea"] == ["13000"]
+    assert last["lvcat01"] == ["2"]
+    # the mocked API applies only cdArea: 6 rows of 東京都 in 2 pages
+    assert register_stats_data.call_count == 2
+
+
+def test_pushdown_params_many_codes():
+    # more than 100 codes, in descending order in the metadata
+    codes = [f"{i:03d}" for i in range(300, 0, -1)]
+    class_objs = [{"@id": "area", "CLASS": [{"@code": c, "@name": c} for c in codes]}]
+    even = [c for c in codes if int(c) % 2 == 0]
+    params = _polars._pushdown_params(pl.col("area").is_in(even), class_objs)
+    assert params == {"cdAreaFrom": "002", "cdAreaTo": "300"}
+
+    params = _polars._pushdown_params(pl.col("area") == "150", class_objs)
+    assert params == {"cdArea": "150"}
+
+
+def test_scan_pushdown_with_kwargs(register_stats_data, register_meta_info, set_appid):
+    lf = _polars.scan_stats_data("0000000000", cdArea="13000,27000", metaGetFlg="Y")
+    df = lf.filter(pl.col("area_name").is_in(["東京都", "全国"])).collect()
+    # 全国 is excluded by the caller's cdArea
+    assert set(df["area"]) == {"13000"}
+    assert len(df) == 6
+    assert register_stats_data.last_request.qs["cdarea"] == ["13000"]
+    assert register_stats_data.last_request.qs["metagetflg"] == ["n"]
+
+    lf = _polars.scan_stats_data("0000000000", lvArea="2")
+    assert len(lf.filter(pl.col("area_name") == "全国").collect()) == 0
+    assert register_stats_data.call_count == 1
+
+
+def test_allowed_codes():
+    classes = [
+        {"@code": "00000", "@level": "1"},
+        {"@code": "13000", "@level": "2"},
+        {"@code": "13101", "@level": "3"},
+    ]
+    assert _polars._allowed_codes(classes, {"lvArea": "2-"}) == {"13000", "13101"}
+    assert _polars._allowed_codes(classes, {"lvArea": "-2"}) == {"00000", "13000"}
+    assert _polars._allowed_codes(
+        classes, {"cdAreaFrom": "13000", "cdArea": "00000,13101"}
+    ) == {"13101"}
+
+
+def test_pushdown_unknown_expression(monkeypatch):
+    def fail(self, *args, **kwargs):
+        raise ValueError("unknown format")
+
+    monkeypatch.setattr(type(pl.col("a").meta), "serialize", fail)
+    class_objs = [{"@id": "area", "CLASS": [{"@code": "1"}, {"@code": "2"}]}]
+    params = _polars._pushdown_params(pl.col("area") == "1", class_objs, {"limit": 5})
+    assert params == {"limit": 5}
+
+
+def test_scan_without_filter(register_stats_data, register_meta_info, set_appid):
+    df = _polars.scan_stats_data("0000000000", limit=5).collect()
+    assert len(df) == 18
+    assert register_stats_data.call_count == 4
+
+
+def test_scan_no_match(register_stats_data, register_meta_info, set_appid):
+    df = (
+        _polars.scan_stats_data("0000000000")
+        .filter(pl.col("area") == "99999")
+        .collect()
+    )
+    assert len(df) == 0
+    assert register_stats_data.call_count == 0
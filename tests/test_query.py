@@ -0,0 +1,96 @@
+import pytest
+
+from estatapi import _instrument, _metadata, _query
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData"
+
+
+@pytest.fixture
+def query(register_meta_info, set_appid):
+    return _query.query("0000000000")
+
+
+def test_metadata_cached(register_meta_info, set_appid):
+    with _instrument.Collector() as collector:
+        _metadata.get_metadata("0000000000")
+        _metadata.get_metadata("0000000000")
+    assert register_meta_info.call_count == 1
+    assert collector.cache_hits == 1
+    assert collector.cache_misses == 1
+
+
+@pytest.mark.parametrize(
+    ["build", "expected"],
+    [
+        (lambda q: q.isin("area", ["東京都"]), {"cdArea": "13000"}),
+        (lambda q: q.isin("area", ["東京都", "27000"]), {"lvArea": "2"}),
+        (lambda q: q.eq("@area", "00000"), {"lvArea": "1"}),
+        (lambda q: q.level("cat01", le=2), {}),
+        (lambda q: q.level("cat01", ge=2), {"lvCat01": "2"}),
+        (lambda q: q.between("time", "2020年"), {"cdTime": "2020000000"}),
+        (
+            lambda q: q.between("area", "全国", "東京都"),
+            {"cdAreaFrom": "00000", "cdAreaTo": "13000"},
+        ),
+        (
+            lambda q: q.isin("cat01", ["総数", "女"]),
+            {"cdCat01": "000,002"},
+        ),
+        (
+            lambda q: q.level("cat01", ge=2).isin("cat01", ["男", "総数"]),
+            {"cdCat01": "001"},
+        ),
+    ],
+)
+def test_params(query, build, expected):
+    assert build(query).params() == {
+        "statsDataId": "0000000000",
+        "lang": "J",
+        **expected,
+    }
+
+
+def test_invalid(query):
+    with pytest.raises(ValueError):
+        query.isin("area", ["北海道"])
+    with pytest.raises(ValueError):
+        query.isin("cat99", ["男"])
+    with pytest.raises(ValueError):
+        query.level("cat01", below=2)
+    with pytest.raises(ValueError):
+        query.eq("cat01", "男").eq("cat01", "女").params()
+
+
+def test_duplicate_names(monkeypatch):
+    metadata = {
+        "CLASS_OBJ": [
+            {
+                "@id": "cat01",
+                "CLASS": [
+                    {"@code": "100", "@name": "農業", "@level": "1"},
+                    {"@code": "110", "@name": "その他", "@level": "2"},
+                    {"@code": "200", "@name": "工業", "@level": "1"},
+                    {"@code": "210", "@name": "その他", "@level": "2"},
+                    {"@code": "220", "@name": "機械", "@level": "2"},
+                ],
+            }
+        ]
+    }
+    monkeypatch.setattr(_metadata, "get_metadata", lambda *args, **kwargs: metadata)
+    query = _query.query("0000000001")
+    assert query.eq("cat01", "その他").params()["cdCat01"] == "110,210"
+
+
+def test_post_filter():
+    classes = [{"@code": f"{i:03d}", "@level": "1"} for i in range(300)]
+    selected = {f"{i:03d}" for i in range(0, 300, 2)}
+    params, post_filter = _query._compile_dim("cat02", classes, selected)
+    assert params == {"cdCat02From": "000", "cdCat02To": "298"}
+    assert post_filter
+
+
+def test_to_pandas(query, requests_mock, stats_data_json):
+    matcher = requests_mock.register_uri("GET", URL, json=stats_data_json)
+    df = query.isin("area", ["東京都"]).to_pandas()
+    assert matcher.last_request.qs["cdarea"] == ["13000"]
+    assert len(df) == 18
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+import requests
+
+from estatapi import _instrument, _retry, _transport
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData"
+
+
+def build_response(status=0, status_code=200, headers=None):
+    content = json.dumps({"GET_STATS_DATA": {"RESULT": {"STATUS": status}}}).encode()
+    return _transport._build_response(
+        URL, {}, status_code, content, headers or {}, "utf-8", 0.0
+    )
+
+
+class SequenceTransport(_transport.Transport):
+    """Return the given responses in turn, or raise them if exceptions."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params):
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.mark.parametrize(
+    "status, status_code, kind",
+    [
+        (0, 200, "success"),
+        (1, 200, "success"),
+        (2, 200, "success"),
+        (100, 200, "permanent"),
+        (101, 200, "permanent"),
+        (900, 200, "transient"),
+        (0, 503, "transient"),
+        (0, 429, "transient"),
+        (0, 404, "permanent"),
+    ],
+)
+def test_classify_response(status, status_code, kind):
+    assert _retry.classify_response(build_response(status, status_code)) == kind
+
+
+def test_classify_exception():
+    assert _retry.classify_exception(requests.ConnectionError()) == "transient"
+    assert _retry.classify_exception(requests.Timeout()) == "transient"
+    assert _retry.classify_exception(ValueError()) == "permanent"
+
+
+def test_policy_delay():
+    policy = _retry.RetryPolicy(backoff=1.0, max_backoff=4.0)
+    for attempt in range(5):
+        assert 0 <= policy.delay(attempt) <= min(4.0, 2**attempt)
+    response = build_response(status_code=429, headers={"Retry-After": "3"})
+    assert policy.delay(0, response) == 3.0
+
+
+def test_retry():
+    inner = SequenceTransport(
+        [build_response(900), requests.ConnectionError(), build_response(0)]
+    )
+    sleeps = []
+    transport = _retry.RetryTransport(inner, sleep=sleeps.append)
+    with _instrument.Collector() as collector:
+        response = transport.get(URL, {})
+    assert _retry.classify_response(response) == "success"
+    assert inner.calls == 3
+    assert len(sleeps) == 2
+    assert collector.stages["retry"].count == 2
+    assert transport.breaker.state == "closed"
+
+
+def test_no_retry_of_permanent_error():
+    inner = SequenceTransport([build_response(100)])
+    transport = _retry.RetryTransport(inner, sleep=lambda s: None)
+    assert _retry.classify_response(transport.get(URL, {})) == "permanent"
+    assert inner.calls == 1
+    assert transport.breaker.failures == 0
+
+
+def test_retries_exhausted():
+    inner = SequenceTransport([build_response(0, 503)])
+    transport = _retry.RetryTransport(
+        inner, policy=_retry.RetryPolicy(max_retries=2), sleep=lambda s: None
+    )
+    assert transport.get(URL, {}).status_code == 503
+    assert inner.calls == 3
+
+    inner = SequenceTransport([requests.Timeout()])
+    transport = _retry.RetryTransport(inner, sleep=lambda s: None)
+    with pytest.raises(requests.Timeout):
+        transport.get(URL, {})
+
+
+def test_circuit_breaker(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(_retry.time, "monotonic", lambda: now[0])
+    breaker = _retry.CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    inner = SequenceTransport([build_response(0, 503)])
+    transport = _retry.RetryTransport(
+        inner,
+        policy=_retry.RetryPolicy(max_retries=5),
+        breaker=breaker,
+        sleep=lambda s: None,
+    )
+
+    # stop retrying once the breaker opens, then fail fast
+    assert transport.get(URL, {}).status_code == 503
+    assert inner.calls == 2
+    assert breaker.state == "open"
+    with pytest.raises(_retry.CircuitOpenError):
+        transport.get(URL, {})
+    assert inner.calls == 2
+
+    # a failed probe opens the breaker again
+    now[0] = 10.0
+    assert breaker.state == "half_open"
+    assert transport.get(URL, {}).status_code == 503
+    assert inner.calls == 3
+    assert breaker.state == "open"
+
+    # a successful probe closes the breaker
+    now[0] = 20.0
+    inner.responses = [build_response(0)]
+    assert transport.get(URL, {}).status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_one_probe(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(_retry.time, "monotonic", lambda: now[0])
+    breaker = _retry.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
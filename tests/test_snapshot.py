@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from estatapi import _pandas, _snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, stats_data_json):
+    # values which are not restored by formatting
+    values = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]["VALUE"]
+    values[0]["$"] = "1.50"
+    values[1]["$"] = "0.5"
+    del values[2]["@unit"]
+
+    path = str(tmp_path / "table.snapshot")
+    _snapshot.save_snapshot(stats_data_json, path)
+    return path
+
+
+def test_code_dtype():
+    assert _snapshot._code_dtype(3) == np.dtype("<i1")
+    assert _snapshot._code_dtype(1000) == np.dtype("<i2")
+    assert _snapshot._code_dtype(100000) == np.dtype("<i4")
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_to_df_same_as_statistical_data(snapshot_path, stats_data_json, mmap):
+    snapshot = _snapshot.load_snapshot(snapshot_path, mmap=mmap)
+    expected = _pandas.stats_data_to_pandas(stats_data_json)
+    pd.testing.assert_frame_equal(snapshot.to_df(), expected)
+    pd.testing.assert_frame_equal(
+        snapshot.to_df(add_level=False),
+        _pandas.stats_data_to_pandas(stats_data_json, add_level=False),
+    )
+
+
+def test_arrays(snapshot_path):
+    snapshot = _snapshot.load_snapshot(snapshot_path)
+    assert isinstance(snapshot.codes("@area")[0], np.memmap)
+
+    codes, categories = snapshot.codes("@cat01")
+    assert codes.dtype == np.int8
+    assert categories == ["000", "001", "002"]
+
+    values, mask, special = snapshot.values()
+    assert values.dtype == np.float64
+    assert special == ["-"]
+    assert mask[-1] == 1 and np.isnan(values[-1])
+    assert values[0] == 1.5
+
+
+def test_numeric(snapshot_path):
+    df = _snapshot.load_snapshot(snapshot_path).to_df(numeric=True)
+    assert df["値"].dtype == np.float64
+    assert np.isnan(df["値"].iloc[-1])
+
+
+def test_to_statistical_data(snapshot_path, stats_data_json):
+    restored = _snapshot.load_snapshot(snapshot_path).to_statistical_data()
+    original = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    assert restored.json_data["DATA_INF"] == original["DATA_INF"]
+    assert restored.json_data["CLASS_INF"] == original["CLASS_INF"]
+
+
+def test_no_data(tmp_path, stats_data_json):
+    stats_data = stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    del stats_data["DATA_INF"]
+    path = str(tmp_path / "empty.snapshot")
+    _snapshot.save_snapshot(stats_data_json, path)
+
+    snapshot = _snapshot.load_snapshot(path)
+    assert snapshot.nrows == 0
+    assert snapshot.meta["CLASS_INF"] == stats_data["CLASS_INF"]
+    assert len(snapshot.to_df()) == 0
+    assert snapshot.to_statistical_data().json_data["DATA_INF"] == {"VALUE": []}
+
+
+def test_not_snapshot(tmp_path):
+    path = tmp_path / "invalid"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError):
+        _snapshot.load_snapshot(str(path))
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from estatapi import _instrument, _pandas, _snapshot, _spill
+
+URL = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData"
+
+
+def test_in_memory(register_stats_data, set_appid, stats_data_json):
+    data = _spill.fetch_stats_data(statsDataId="0000000000", limit=5)
+    assert register_stats_data.call_count == 4
+    assert not data.spilled
+    assert len(data.chunks) == 1
+    assert len(data) == 18
+    assert data.to_df().equals(_pandas.stats_data_to_pandas(stats_data_json))
+
+
+def test_spill(register_stats_data, set_appid, stats_data_json, tmp_path):
+    page_bytes = (
+        _spill._estimate_bytes(stats_data_json["GET_STATS_DATA"]["STATISTICAL_DATA"])
+        * 5
+        // 18
+    )
+    with _instrument.Collector() as collector:
+        data = _spill.fetch_stats_data(
+            memory_budget=page_bytes * 1.5,
+            spill_dir=str(tmp_path),
+            statsDataId="0000000000",
+            limit=5,
+        )
+    assert data.spilled
+    # every two pages are written together
+    assert len(data.chunks) == 2
+    assert all(isinstance(chunk, _snapshot.Snapshot) for chunk in data.chunks)
+    assert collector.stages["spill"].count == 2
+    assert collector.stages["spill"].rows == 18
+
+    expected = _pandas.stats_data_to_pandas(stats_data_json)
+    assert data.to_df().equals(expected)
+    assert sum(len(df) for df in data.iter_dfs()) == 18
+
+    with data:
+        path = tmp_path / "out.csv"
+        data.to_csv(str(path))
+        assert path.read_text().count("\n") == 19
+    assert not os.path.exists(data.directory)
+
+
+def test_spill_error(requests_mock, set_appid, tmp_path):
+    requests_mock.get(
+        URL,
+        json={"GET_STATS_DATA": {"RESULT": {"STATUS": 100, "ERROR_MSG": "error"}}},
+    )
+    with pytest.raises(ValueError):
+        _spill.fetch_stats_data(memory_budget=1, spill_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,67 @@
+import pytest
+
+from estatapi import _instrument, _pandas, _store
+
+
+@pytest.fixture
+def store(tmp_path):
+    return _store.TableStore(str(tmp_path))
+
+
+def test_open(store, register_stats_data, set_appid, stats_data_json):
+    with _instrument.Collector() as collector:
+        snapshot = store.open("0000000000", limit=5)
+        assert register_stats_data.call_count == 4
+        assert snapshot.mmap
+        assert snapshot.to_df().equals(_pandas.stats_data_to_pandas(stats_data_json))
+
+        # the page size does not change the key
+        again = store.open("0000000000", limit=10)
+        assert register_stats_data.call_count == 4
+        assert again.path == snapshot.path
+    assert collector.cache_misses == 1
+    assert collector.cache_hits == 1
+
+
+def test_query_key(store):
+    assert store.path("0000000000") != store.path("0000000000", cdArea="13000")
+    assert store.path("0000000000", cdArea=None) == store.path("0000000000")
+
+
+def test_refresh(store, register_stats_data, set_appid):
+    store.open("0000000000")
+    store.open("0000000000", refresh=True)
+    assert register_stats_data.call_count == 2
+
+
+def test_check_updated(store, register_stats_data, set_appid):
+    store.open("0000000000")
+    store.open("0000000000", check_updated=True)
+    assert register_stats_data.call_count == 2
+    assert register_stats_data.last_request.qs["cntgetflg"] == ["y"]
+
+    register_stats_data.state["updated_date"] = "2024-06-01"
+    snapshot = store.open("0000000000", check_updated=True)
+    assert register_stats_data.call_count == 4
+    assert snapshot.meta["TABLE_INF"]["UPDATED_DATE"] == "2024-06-01"
+
+
+def test_open_no_data(store, register_stats_data, set_appid):
+    snapshot = store.open("0000000000", cdArea="99999")
+    assert snapshot.nrows == 0
+    assert len(snapshot.to_df()) == 0
+
+
+def test_put_entries_remove(store, stats_data_json):
+    assert store.get("0000000000") is None
+    store.put(stats_data_json, "0000000000", cdArea="13000")
+    assert store.get("0000000000", cdArea="13000").nrows == 18
+
+    [entry] = store.entries()
+    assert entry["statsDataId"] == "0000000000"
+    assert entry["rows"] == 18
+    assert entry["updated_date"] == "2024-01-01"
+
+    assert store.remove("0000000000", cdArea="13000")
+    assert not store.remove("0000000000", cdArea="13000")
+    assert store.entries() == []
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from estatapi import _pandas, _time
+
+
+@pytest.mark.parametrize(
+    ["code", "expected"],
+    [
+        ("2020000000", pd.Period("2020", freq="Y")),
+        ("2020100000", pd.Period("2021", freq="Y-MAR")),
+        ("2020001010", pd.Period("2020-10", freq="M")),
+        ("2020000101", pd.Period("2020-01", freq="M")),
+        ("2020000709", pd.Period("2020Q3", freq="Q")),
+        ("2020年", pd.Period("2020", freq="Y")),
+        ("2020年度", pd.Period("2021", freq="Y-MAR")),
+        ("2020年10月", pd.Period("2020-10", freq="M")),
+        ("2020年1～3月期", pd.Period("2020Q1", freq="Q")),
+        ("2020000203", pd.NaT),
+        ("2020990000", pd.NaT),
+        ("平成27年", pd.NaT),
+        (None, pd.NaT),
+    ],
+)
+def test_parse_time_code(code, expected):
+    parsed = _time._parse_time_code(code)
+    if expected is pd.NaT:
+        assert parsed is pd.NaT
+    else:
+        assert parsed == expected
+
+
+def test_parse_time_codes():
+    parsed = _time.parse_time_codes(["2020000000", "2015000000", "2020000000", None])
+    assert isinstance(parsed, pd.PeriodIndex)
+    assert list(parsed.astype(str)) == ["2020", "2015", "2020", "NaT"]
+
+
+def test_parse_time_codes_datetime():
+    codes = ["2020000000", "2020100000", "2020001010"]
+    with pytest.raises(ValueError, match="different frequencies"):
+        _time.parse_time_codes(codes)
+    assert list(_time.parse_time_codes(codes, how="start")) == [
+        pd.Timestamp("2020-01-01"),
+        pd.Timestamp("2020-04-01"),
+        pd.Timestamp("2020-10-01"),
+    ]
+    assert (
+        _time.parse_time_codes(codes, how="end")[1].date()
+        == pd.Timestamp("2021-03-31").date()
+    )
+
+
+def test_parse_time_codes_series(stats_data_json):
+    df = _pandas.stats_data_to_pandas(stats_data_json)
+    parsed = _time.parse_time_codes(df["時間軸（年次）"])
+    assert isinstance(parsed, pd.Series)
+    assert parsed.index.equals(df.index)
+    assert parsed.iloc[0] == pd.Period("2015", freq="Y")
+    assert parsed.iloc[1] == pd.Period("2020", freq="Y")
+
+
+def test_parse_only_unique(monkeypatch):
+    calls = []
+    parse = _time._parse_time_code
+    monkeypatch.setattr(
+        _time, "_parse_time_code", lambda v: calls.append(v) or parse(v)
+    )
+    _time.parse_time_codes(["2020000000", "2015000000"] * 1000)
+    assert calls == ["2020000000", "2015000000"]
@@ -0,0 +1,164 @@
+import time
+
+import pytest
+
+from estatapi import _functions, _transport
+
+URL_STATS_DATA = "https://api.e-stat.go.jp/rest/3.0/app/json/getStatsData"
+
+stats_data_json = {
+    "GET_STATS_DATA": {
+        "RESULT": {"STATUS": 0},
+        "STATISTICAL_DATA": {
+            "RESULT_INF": {"TOTAL_NUMBER": 5, "FROM_NUMBER": 1, "TO_NUMBER": 5},
+            "DATA_INF": {
+                "VALUE": [{"@area": f"0{i}000", "$": str(i)} for i in range(5)]
+            },
+        },
+    }
+}
+
+
+@pytest.fixture
+def reset_transport():
+    yield
+    _transport.set_transport()
+
+
+@pytest.fixture
+def archive(tmp_path, requests_mock, set_appid, reset_transport):
+    requests_mock.register_uri("GET", URL_STATS_DATA, json=stats_data_json)
+    path = tmp_path / "archive.zip"
+    with _transport.RecordTransport(str(path)) as recorder:
+        _transport.set_transport(recorder)
+        _functions.get_stats_data(statsDataId="0000000000")
+    _transport.set_transport()
+    return str(path)
+
+
+def test_default_transport():
+    assert isinstance(_transport.get_transport(), _transport.RequestsTransport)
+
+
+def test_incomplete_transport():
+    class IncompleteTransport(_transport.Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteTransport()
+
+
+def test_request_key_ignores_appid_and_none():
+    key1 = _transport._request_key("u", {"a": "1", "b": None, "appId": "x"})
+    key2 = _transport._request_key("u", {"a": "1", "appId": "y"})
+    assert key1 == key2
+
+
+def test_record_does_not_store_appid(archive):
+    import zipfile
+
+    with zipfile.ZipFile(archive) as zf:
+        index = zf.read("index.json").decode()
+    assert "sampleappid" not in index
+
+
+def test_replay(archive, requests_mock, set_appid, reset_transport):
+    _transport.set_transport(_transport.ReplayTransport(archive))
+    response = _functions.get_stats_data(statsDataId="0000000000")
+    assert response.status_code == 200
+    assert response.json() == stats_data_json
+    # replay never reaches the (mocked) network
+    assert requests_mock.call_count == 1
+
+
+def test_replay_pagination(archive, set_appid, reset_transport):
+    _transport.set_transport(_transport.ReplayTransport(archive))
+    response = _functions.get_stats_data(
+        statsDataId="0000000000", startPosition=3, limit=2
+    )
+    stats_data = response.json()["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    assert [v["$"] for v in stats_data["DATA_INF"]["VALUE"]] == ["2", "3"]
+    assert stats_data["RESULT_INF"]["NEXT_KEY"] == 5
+
+    response = _functions.get_stats_data(
+        statsDataId="0000000000", startPosition=5, limit=2
+    )
+    stats_data = response.json()["GET_STATS_DATA"]["STATISTICAL_DATA"]
+    assert [v["$"] for v in stats_data["DATA_INF"]["VALUE"]] == ["4"]
+    assert "NEXT_KEY" not in stats_data["RESULT_INF"]
+
+
+def test_replay_not_recorded(archive, set_appid, reset_transport):
+    _transport.set_transport(_transport.ReplayTransport(archive, paginate=False))
+    with pytest.raises(LookupError):
+        _functions.get_stats_data(statsDataId="0000000000", limit=2)
+
+
+def test_replay_latency(archive, set_appid, reset_transport):
+    _transport.set_transport(
+        _transport.ReplayTransport(archive, latency=0.05, jitter=0.5, seed=0)
+    )
+    start = time.perf_counter()
+    _functions.get_stats_data(statsDataId="0000000000")
+    assert time.perf_counter() - start >= 0.025
+
+
+class SleepTransport(_transport.Transport):
+    """Respond after the given delays in turn, or raise them if exceptions."""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+
+    def get(self, url, params):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        if isinstance(delay, Exception):
+            raise delay
+        time.sleep(delay)
+        return _transport._build_response(
+            url, params, 200, str(delay).encode(), {}, "utf-8", delay
+        )
+
+
+def test_latency_window():
+    window = _transport._LatencyWindow(size=100)
+    for latency in range(1, 101):
+        window.add(latency / 100)
+    assert window.percentile(50) == 0.5
+    assert window.percentile(95) == 0.95
+    assert window.percentile(100) == 1.0
+
+
+def test_hedged_transport():
+    inner = SleepTransport([0.0] * 20 + [1.0, 0.0])
+    with _transport.HedgedTransport(inner, min_samples=20, max_ratio=1.0) as hedged:
+        for _ in range(20):
+            hedged.get(URL_STATS_DATA, {})
+        assert hedged.hedges == 0
+
+        start = time.perf_counter()
+        response = hedged.get(URL_STATS_DATA, {})
+        assert time.perf_counter() - start < 0.5
+        assert response.content == b"0.0"
+        assert hedged.hedges == hedged.hedge_wins == 1
+        assert inner.calls == 22
+
+
+def test_hedged_transport_max_ratio():
+    inner = SleepTransport([0.0] * 5 + [0.05])
+    with _transport.HedgedTransport(inner, min_samples=5, max_ratio=0.0) as hedged:
+        for _ in range(6):
+            hedged.get(URL_STATS_DATA, {})
+        assert hedged.hedges == 0
+        assert inner.calls == 6
+
+
+def test_hedged_transport_error():
+    inner = SleepTransport([0.0] * 5 + [0.1, ValueError("failed")])
+    with _transport.HedgedTransport(inner, min_samples=5, max_ratio=1.0) as hedged:
+        for _ in range(5):
+            hedged.get(URL_STATS_DATA, {})
+        # the error of one request is ignored when the other succeeds
+        assert hedged.get(URL_STATS_DATA, {}).content == b"0.1"
+        assert hedged.hedge_wins == 0
@@ -0,0 +1,32 @@
+import pytest
+
+from estatapi import _util
+
+
+def test_check_status():
+    root = {"RESULT": {"STATUS": 0}, "METADATA_INF": {"CLASS_INF": {}}}
+    assert _util._check_status(root, "METADATA_INF") == {"CLASS_INF": {}}
+
+    root = {"RESULT": {"STATUS": 100, "ERROR_MSG": "error"}}
+    with pytest.raises(ValueError, match="STATUS=100, ERROR_MSG=error"):
+        _util._check_status(root, "METADATA_INF")
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / "data.json"
+    _util._write_atomic(str(path), b"{}")
+    assert path.read_bytes() == b"{}"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_atomic_path_failed(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes(b"old")
+    with pytest.raises(RuntimeError):
+        with _util._atomic_path(str(path)) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"new")
+            raise RuntimeError
+    # the old file is kept and the temporary file is removed
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]